@@ -4,108 +4,373 @@ Configuration, logging, and helper functions for the Solana Trading Bot
 """
 import os
 import logging
+import logging.handlers
+import queue
+import atexit
 import json
 import time
 import re
-from datetime import datetime
-from dotenv import load_dotenv
-import signal
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from enum import IntEnum
 import threading
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("trading_bot.log"),
-        logging.StreamHandler()
-    ]
-)
+# Records are only enqueued on the calling thread; a listener thread
+# formats them and does the file/console I/O
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated log file with a large write buffer that is flushed periodically"""
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=1 << 20,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def flush(self):
+        # Skip the per-record flush; flush_buffer() and close() write the buffer out
+        pass
+    
+    def flush_buffer(self):
+        """Write buffered records to disk"""
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.flush()
+        finally:
+            self.release()
+
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_file_handler = BufferedRotatingFileHandler("trading_bot.log", maxBytes=64 << 20, backupCount=4)
+_log_handlers = [
+    _log_file_handler,
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+def _flush_log_file():
+    """Flush the log file buffer every couple of seconds"""
+    while True:
+        time.sleep(2)
+        _log_file_handler.flush_buffer()
+
+threading.Thread(target=_flush_log_file, name="log-flusher", daemon=True).start()
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
-load_dotenv()
+def _load_env():
+    """Load .env into the environment unless a parent process already did"""
+    if os.environ.get("TRADING_BOT_ENV_LOADED") == "1":
+        return
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ["TRADING_BOT_ENV_LOADED"] = "1"
+
+_load_env()
 
 # Global stop event for graceful shutdown
 stop_event = threading.Event()
 
+class _StopFlag:
+    """Plain attribute mirror of stop_event for tight polling loops"""
+    __slots__ = ('v',)
+    
+    def __init__(self):
+        self.v = False
+
+stop_flag = _StopFlag()
+
+def request_stop():
+    """Signal all loops to stop"""
+    stop_flag.v = True
+    stop_event.set()
+
+# Fixed pool of locks shared by token address hash (power of two)
+_SELL_LOCK_SHARDS = 256
+_sell_locks = [threading.Lock() for _ in range(_SELL_LOCK_SHARDS)]
+
+def lock_for(address):
+    """Return the shard lock guarding a token address"""
+    return _sell_locks[hash(address) & (_SELL_LOCK_SHARDS - 1)]
+
+# Solana address pattern (base58, 32-44 chars), compiled once at import
+_SOLANA_ADDR_PATTERN = r'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b'
+_SOLANA_ADDR_RE = re.compile(_SOLANA_ADDR_PATTERN)
+
+# Byte table mapping every non-base58 byte to 0, for the cheap prefilter
+_B58_ALPHABET = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_B58_TABLE = bytes(c if c in _B58_ALPHABET else 0 for c in range(256))
+
+# Hyperscan DFA scanner for the same pattern, used when the library is installed
+_solana_addr_db = None
+_scratch_local = threading.local()
+
+if hyperscan is not None:
+    try:
+        _solana_addr_db = hyperscan.Database()
+        _solana_addr_db.compile(
+            expressions=[_SOLANA_ADDR_PATTERN.encode('ascii')],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+        )
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable, falling back to re for address scanning: {e}")
+        _solana_addr_db = None
+
 # ================ CONFIGURATION ================
-class Config:
+# .env formatters and value converters, dispatched on the exact setting type
+_TYPE_FMT = {
+    bool: lambda v: 'true' if v else 'false',
+    int: str,
+    float: str,
+    str: lambda v: v,
+}
+
+_COERCE = {
+    bool: lambda v: v.lower() == 'true' if isinstance(v, str) else v,
+    int: int,
+    float: float,
+}
+
+def _fmt(value):
+    """Format a setting value the way it is stored in .env"""
+    return _TYPE_FMT.get(type(value), str)(value)
+
+def _coerce(current, value):
+    """Convert value to the type of a setting's current value"""
+    convert = _COERCE.get(type(current))
+    return convert(value) if convert is not None else value
+
+# Settings loaded from and saved to .env (Config.load_from_env / save_to_env)
+_PERSISTED_KEYS = (
+    'RPC', 'BACKUP_RPC', 'SOL',
+    'TELEGRAM_API_ID', 'TELEGRAM_API_HASH', 'TELEGRAM_PHONE',
+    'BUY_AMOUNT', 'AUTO_TRADE', 'AUTO_SELL',
+    'PROFIT_TARGET', 'STOP_LOSS', 'TRAILING_STOP', 'MAX_HOLD_TIME',
+    'EXIT_STRATEGY',
+    'DEFAULT_SLIPPAGE', 'MAX_SWAP_RETRIES', 'PRICE_IMPACT_WARNING', 'PRICE_IMPACT_ABORT',
+    'PRIORITY_FEE_MODE', 'PRIORITY_FEE_LAMPORTS',
+    'PRICE_CHECK_INTERVAL', 'PRICE_DISPLAY_INTERVAL', 'PRICE_CHECK_DURATION',
+    'RATE_LIMIT_REQUESTS_PER_MINUTE', 'MAX_RATE_LIMIT_RETRIES',
+    'DEFAULT_COMMITMENT', 'MAX_RETRIES', 'RETRY_INTERVAL', 'PARALLEL_RPC_CHECKS', 'SHOW_RPC_DETAILS',
+    'MIN_LIQUIDITY_USD', 'MAX_POSITION_SIZE_PERCENT', 'ENABLE_PARTIAL_FILLS', 'CHECK_HONEYPOT',
+    'ENABLE_MULTI_TP', 'TP_LEVELS',
+    'ENABLE_VOLUME_MONITORING', 'VOLUME_SPIKE_MULTIPLIER', 'VOLUME_DRYUP_PERCENT',
+    'ENABLE_WEBSOCKET', 'WEBSOCKET_RPC', 'USE_UVLOOP',
+    'USE_ORDER_SPLITTING', 'SPLIT_THRESHOLD_IMPACT',
+)
+
+# .env names for settings whose attribute name differs
+_ENV_NAMES = {
+    'RPC': 'SOLANA_RPC_URL',
+    'BACKUP_RPC': 'BACKUP_RPC_URL',
+    'SOL': 'SOL_MINT_ADDRESS',
+}
+
+# Labels for boolean settings, indexed by the setting value
+_ED = ('Disabled', 'Enabled')
+
+# Matches a KEY=value line in .env
+_ENV_LINE_RE = re.compile(r'^[ \t]*([A-Z0-9_]+)[ \t]*=.*$', re.MULTILINE)
+
+def _write_atomic(path, data, mode=0o644):
+    """Write bytes to a temp file and rename it over path, so readers never see a partial file"""
+    tmp = f"{path}.tmp.{os.getpid()}"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    os.close(fd)
+    os.replace(tmp, path)
+
+class Endpoint(IntEnum):
+    """Rate-limited API endpoints, used to index Config.api_buckets"""
+    RAYDIUM_QUOTE = 0
+
+class TokenBucket:
+    """Client-side rate limiter refilling `rate` tokens per second up to `cap`"""
+    __slots__ = ('rate', 'cap', 'tokens', 'ts', 'lock')
+    
+    def __init__(self, rate, cap=1.0):
+        self.rate = rate
+        self.cap = cap
+        self.tokens = cap
+        self.ts = time.monotonic()
+        # A thread lock, not asyncio.Lock: callers run on several event loops
+        self.lock = threading.Lock()
+    
+    async def acquire(self):
+        """Take a token, sleeping until it is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.cap, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            # Reserve the token now, so concurrent callers queue up behind it
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class BatchedEnvSave(ABC):
+    """
+    Deferred .env saving shared by Config and PaperConfig.
+    Subclasses implement _write_env; save_to_env inside batch_updates only marks them dirty.
+    """
+    _defer_save = False
+    _dirty = False
+    
+    @classmethod
+    def save_to_env(cls):
+        """Save the settings to .env, or mark them for saving when inside batch_updates"""
+        if cls._defer_save:
+            # Inside batch_updates: write once when the batch ends
+            cls._dirty = True
+            return
+        cls._write_env()
+    
+    @classmethod
+    @abstractmethod
+    def _write_env(cls):
+        """Write the settings to .env now"""
+    
+    @classmethod
+    def flush_save(cls):
+        """Write pending parameter changes to .env in a single save"""
+        if cls._dirty:
+            cls._dirty = False
+            cls._write_env()
+    
+    @classmethod
+    @contextmanager
+    def batch_updates(cls):
+        """Defer .env writes from update_param and save_to_env until the block exits"""
+        previous = cls._defer_save
+        cls._defer_save = True
+        try:
+            yield cls
+        finally:
+            cls._defer_save = previous
+            if not previous:
+                cls.flush_save()
+
+class Config(BatchedEnvSave):
     """Configuration class to manage all bot settings"""
+    # Default values (overridden by .env in load_from_env)
     
     # Solana Configuration
-    RPC = os.getenv("SOLANA_RPC_URL")
-    BACKUP_RPC = os.getenv("BACKUP_RPC_URL")
-    SOL = os.getenv("SOL_MINT_ADDRESS")
+    RPC = None
+    BACKUP_RPC = None
+    SOL = None
     
     # Telegram API credentials
-    TELEGRAM_API_ID = os.getenv("TELEGRAM_API_ID")
-    TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
-    TELEGRAM_PHONE = os.getenv("TELEGRAM_PHONE")
+    TELEGRAM_API_ID = None
+    TELEGRAM_API_HASH = None
+    TELEGRAM_PHONE = None
     
     # Trading Configuration
-    BUY_AMOUNT = float(os.getenv("BUY_AMOUNT", 0.05))
-    AUTO_TRADE = os.getenv("AUTO_TRADE", "true").lower() == "true"
-    AUTO_SELL = os.getenv("AUTO_SELL", "true").lower() == "true"
+    BUY_AMOUNT = 0.05
+    AUTO_TRADE = True
+    AUTO_SELL = True
     
     # Auto-Sell Configuration
-    PROFIT_TARGET = float(os.getenv("PROFIT_TARGET", 50.0))
-    STOP_LOSS = float(os.getenv("STOP_LOSS", -20.0))
-    TRAILING_STOP = float(os.getenv("TRAILING_STOP", 15.0))
-    MAX_HOLD_TIME = int(os.getenv("MAX_HOLD_TIME", 12 * 60 * 60))
+    PROFIT_TARGET = 50.0
+    STOP_LOSS = -20.0
+    TRAILING_STOP = 15.0
+    MAX_HOLD_TIME = 12 * 60 * 60
     
     # Exit Strategy Configuration
-    EXIT_STRATEGY = os.getenv("EXIT_STRATEGY", "TRAILING_STOP")
+    EXIT_STRATEGY = "TRAILING_STOP"
     
     # Transaction Configuration
-    DEFAULT_SLIPPAGE = float(os.getenv("DEFAULT_SLIPPAGE", 1.0))
-    MAX_SWAP_RETRIES = int(os.getenv("MAX_SWAP_RETRIES", 5))  # Increased from 3
-    PRICE_IMPACT_WARNING = float(os.getenv("PRICE_IMPACT_WARNING", 5.0))
-    PRICE_IMPACT_ABORT = float(os.getenv("PRICE_IMPACT_ABORT", 10.0))
+    DEFAULT_SLIPPAGE = 1.0
+    MAX_SWAP_RETRIES = 5  # Increased from 3
+    PRICE_IMPACT_WARNING = 5.0
+    PRICE_IMPACT_ABORT = 10.0
     
     # Priority Fee Configuration
-    PRIORITY_FEE_MODE = os.getenv("PRIORITY_FEE_MODE", "auto")
-    PRIORITY_FEE_LAMPORTS = int(os.getenv("PRIORITY_FEE_LAMPORTS", 500000))  # Increased
+    PRIORITY_FEE_MODE = "auto"
+    PRIORITY_FEE_LAMPORTS = 500000  # Increased
     
     # Price Tracking Configuration
-    PRICE_CHECK_INTERVAL = float(os.getenv("PRICE_CHECK_INTERVAL", 0.1))  # Decreased
-    PRICE_DISPLAY_INTERVAL = float(os.getenv("PRICE_DISPLAY_INTERVAL", 5))
-    PRICE_CHECK_DURATION = int(os.getenv("PRICE_CHECK_DURATION", 24 * 60 * 60))
+    PRICE_CHECK_INTERVAL = 0.1  # Decreased
+    PRICE_DISPLAY_INTERVAL = 5.0
+    PRICE_CHECK_DURATION = 24 * 60 * 60
     
     # API Rate Limiting Configuration
-    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", 180))  # Increased
+    RATE_LIMIT_REQUESTS_PER_MINUTE = 180  # Increased
     RATE_LIMIT_DELAY = 60 / RATE_LIMIT_REQUESTS_PER_MINUTE + 0.1  # Add a small buffer
-    MAX_RATE_LIMIT_RETRIES = int(os.getenv("MAX_RATE_LIMIT_RETRIES", 3))
+    MAX_RATE_LIMIT_RETRIES = 3
     
     # Transaction confirmation settings
-    DEFAULT_COMMITMENT = os.getenv("DEFAULT_COMMITMENT", "processed")
-    MAX_RETRIES = int(os.getenv("MAX_RETRIES", 15))
-    RETRY_INTERVAL = float(os.getenv("RETRY_INTERVAL", 0.3))
-    PARALLEL_RPC_CHECKS = os.getenv("PARALLEL_RPC_CHECKS", "true").lower() == "true"
-    SHOW_RPC_DETAILS = os.getenv("SHOW_RPC_DETAILS", "true").lower() == "true"
+    DEFAULT_COMMITMENT = "processed"
+    MAX_RETRIES = 15
+    RETRY_INTERVAL = 0.3
+    PARALLEL_RPC_CHECKS = True
+    SHOW_RPC_DETAILS = True
     
     # NEW: Liquidity and Safety Settings
-    MIN_LIQUIDITY_USD = float(os.getenv("MIN_LIQUIDITY_USD", 1000))
-    MAX_POSITION_SIZE_PERCENT = float(os.getenv("MAX_POSITION_SIZE_PERCENT", 5))
-    ENABLE_PARTIAL_FILLS = os.getenv("ENABLE_PARTIAL_FILLS", "true").lower() == "true"
-    CHECK_HONEYPOT = os.getenv("CHECK_HONEYPOT", "true").lower() == "true"
+    MIN_LIQUIDITY_USD = 1000.0
+    MAX_POSITION_SIZE_PERCENT = 5.0
+    ENABLE_PARTIAL_FILLS = True
+    CHECK_HONEYPOT = True
     
     # NEW: Multi-Level Take Profit Settings
-    ENABLE_MULTI_TP = os.getenv("ENABLE_MULTI_TP", "true").lower() == "true"
-    TP_LEVELS = os.getenv("TP_LEVELS", "25:30,25:50,25:100,25:200")  # format: percentage:profit
+    ENABLE_MULTI_TP = True
+    TP_LEVELS = "25:30,25:50,25:100,25:200"  # format: percentage:profit
     
     # NEW: Volume Monitoring Settings
-    ENABLE_VOLUME_MONITORING = os.getenv("ENABLE_VOLUME_MONITORING", "true").lower() == "true"
-    VOLUME_SPIKE_MULTIPLIER = float(os.getenv("VOLUME_SPIKE_MULTIPLIER", 3.0))
-    VOLUME_DRYUP_PERCENT = float(os.getenv("VOLUME_DRYUP_PERCENT", 10.0))
+    ENABLE_VOLUME_MONITORING = True
+    VOLUME_SPIKE_MULTIPLIER = 3.0
+    VOLUME_DRYUP_PERCENT = 10.0
     
     # NEW: WebSocket Settings
-    ENABLE_WEBSOCKET = os.getenv("ENABLE_WEBSOCKET", "false").lower() == "true"
-    WEBSOCKET_RPC = os.getenv("WEBSOCKET_RPC", "wss://api.mainnet-beta.solana.com")
+    ENABLE_WEBSOCKET = False
+    WEBSOCKET_RPC = "wss://api.mainnet-beta.solana.com"
+    
+    # Run the bot on uvloop when it is installed (POSIX only)
+    USE_UVLOOP = True
     
     # NEW: Advanced Trading Settings
-    USE_ORDER_SPLITTING = os.getenv("USE_ORDER_SPLITTING", "true").lower() == "true"
-    SPLIT_THRESHOLD_IMPACT = float(os.getenv("SPLIT_THRESHOLD_IMPACT", 2.0))
+    USE_ORDER_SPLITTING = True
+    SPLIT_THRESHOLD_IMPACT = 2.0
+    
+    # Cached result of parse_tp_levels and the TP_LEVELS string it was parsed from
+    _tp_levels_cache = None
+    _tp_levels_src = None
     
     # Parse multi-level TP configuration
     @classmethod
@@ -114,77 +379,146 @@ class Config:
         if not cls.ENABLE_MULTI_TP:
             return []
         
-        levels = []
-        for level in cls.TP_LEVELS.split(','):
-            if ':' in level:
-                pct, profit = level.split(':')
-                levels.append((int(pct), float(profit)))
+        # Reuse the parsed levels while TP_LEVELS is unchanged
+        if cls._tp_levels_cache is not None and cls.TP_LEVELS == cls._tp_levels_src:
+            return cls._tp_levels_cache
+        
+        levels = [
+            (int(pct), float(profit))
+            for pct, profit in (level.split(':') for level in cls.TP_LEVELS.split(',') if ':' in level)
+        ]
+        cls._tp_levels_cache = levels
+        cls._tp_levels_src = cls.TP_LEVELS
         return levels
     
     # Global state variables
     processed_addresses = set()
     price_tracking = {}  # Store tracking data: {token_address: {'buy_price': x, 'current_price': y, 'timestamp': z}}
     price_tracking_tasks = {}  # Store active tracking tasks
-    auto_sell_locks = {}  # Prevent multiple sells of the same token
-    api_last_call_time = {}  # Track last call time for each API endpoint 
+    selling = set()  # Tokens with a sell in progress, guarded by lock_for()
+    api_buckets = [TokenBucket(1.0) for _ in Endpoint]  # Rate limiter per Endpoint
     api_rate_limit_counters = {}  # Count consecutive rate limit errors
     
     # NEW: Performance tracking
-    last_telegram_message_time = datetime.now()
+    last_telegram_message_time = time.monotonic()  # time.monotonic() of the last message
     rpc_health_status = {"primary": True, "backup": True}
+    rpc_failed_over = False  # RPC and BACKUP_RPC swapped by the health check for this run only
     websocket_connected = False
     
     @classmethod
-    def save_to_env(cls):
-        """Save current configuration back to .env file"""
+    def begin_sell(cls, address):
+        """Claim a token for selling, returning False if a sell is already in progress"""
+        with lock_for(address):
+            if address in cls.selling:
+                return False
+            cls.selling.add(address)
+            return True
+    
+    @classmethod
+    def end_sell(cls, address):
+        """Release a token claimed by begin_sell"""
+        cls.selling.discard(address)
+    
+    @classmethod
+    def seen(cls, address):
+        """Mark an address as processed, returning True if it had already been seen"""
+        # A single set.add probe instead of a membership test followed by an add
+        processed = cls.processed_addresses
+        count = len(processed)
+        processed.add(address)
+        return len(processed) == count
+    
+    @classmethod
+    def snapshot_state(cls, path="bot_state.json"):
+        """Write processed addresses to a JSON file so the next run skips them"""
+        state = {'processed': list(cls.processed_addresses)}
+        
+        # orjson emits bytes directly
+        if orjson is not None:
+            data = orjson.dumps(state)
+        else:
+            data = json.dumps(state).encode('utf-8')
+        
+        _write_atomic(path, data)
+        
+        logger.info(f"Bot state saved to {path}")
+    
+    @classmethod
+    def load_state(cls, path="bot_state.json"):
+        """Restore processed addresses saved by snapshot_state"""
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            cls.processed_addresses.update(state['processed'])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable bot state in {path}: {e}")
+            return
+        
+        logger.info(f"Restored {len(cls.processed_addresses)} processed addresses from {path}")
+    
+    @classmethod
+    def load_from_env(cls):
+        """Load persisted settings from the environment"""
+        for key in _PERSISTED_KEYS:
+            raw = os.getenv(_ENV_NAMES.get(key, key))
+            if raw is None:
+                continue
+            try:
+                setattr(cls, key, _coerce(getattr(cls, key), raw))
+            except ValueError:
+                logger.error(f"Invalid value for {key} in .env: {raw!r}, using {getattr(cls, key)}")
+        
+        # Recompute derived settings
+        cls.update_rate_limit()
+        cls._tp_levels_cache = None
+    
+    @classmethod
+    def update_rate_limit(cls):
+        """Recompute RATE_LIMIT_DELAY and the per-endpoint refill rates"""
+        cls.RATE_LIMIT_DELAY = 60 / cls.RATE_LIMIT_REQUESTS_PER_MINUTE + 0.1  # Add a small buffer
+        for bucket in cls.api_buckets:
+            bucket.rate = 1 / cls.RATE_LIMIT_DELAY
+    
+    @classmethod
+    def _write_env(cls):
+        """Write the settings to .env now"""
+        # Current values keyed by their .env name
+        current = {}
+        # Persist the configured RPC order, not a temporary failover swap
+        swapped = {'RPC': 'BACKUP_RPC', 'BACKUP_RPC': 'RPC'} if cls.rpc_failed_over else {}
+        for key in _PERSISTED_KEYS:
+            value = getattr(cls, swapped.get(key, key))
+            if value is not None:
+                current[_ENV_NAMES.get(key, key)] = _fmt(value)
+        
         # Read existing .env file first to preserve comments
         with open('.env', 'r') as f:
-            lines = f.readlines()
+            content = f.read()
         
-        # Dictionary to track updated keys
+        # Update existing lines in a single pass
         updated_keys = set()
         
-        # Update existing lines
-        for i, line in enumerate(lines):
-            if line.strip() and not line.strip().startswith('#'):
-                key = line.split('=')[0].strip()
-                value = getattr(cls, key, None)
-                
-                if value is not None:
-                    # Convert value to appropriate string format
-                    if isinstance(value, bool):
-                        value_str = str(value).lower()
-                    else:
-                        value_str = str(value)
-                    
-                    lines[i] = f"{key}={value_str}\n"
-                    updated_keys.add(key)
+        def replace_line(match):
+            key = match.group(1)
+            if key not in current:
+                return match.group(0)
+            updated_keys.add(key)
+            return f"{key}={current[key]}"
         
-        # Add new configuration parameters if not present
-        new_params = {
-            'MIN_LIQUIDITY_USD': str(cls.MIN_LIQUIDITY_USD),
-            'MAX_POSITION_SIZE_PERCENT': str(cls.MAX_POSITION_SIZE_PERCENT),
-            'ENABLE_PARTIAL_FILLS': str(cls.ENABLE_PARTIAL_FILLS).lower(),
-            'CHECK_HONEYPOT': str(cls.CHECK_HONEYPOT).lower(),
-            'ENABLE_MULTI_TP': str(cls.ENABLE_MULTI_TP).lower(),
-            'TP_LEVELS': cls.TP_LEVELS,
-            'ENABLE_VOLUME_MONITORING': str(cls.ENABLE_VOLUME_MONITORING).lower(),
-            'VOLUME_SPIKE_MULTIPLIER': str(cls.VOLUME_SPIKE_MULTIPLIER),
-            'VOLUME_DRYUP_PERCENT': str(cls.VOLUME_DRYUP_PERCENT),
-            'ENABLE_WEBSOCKET': str(cls.ENABLE_WEBSOCKET).lower(),
-            'WEBSOCKET_RPC': cls.WEBSOCKET_RPC,
-            'USE_ORDER_SPLITTING': str(cls.USE_ORDER_SPLITTING).lower(),
-            'SPLIT_THRESHOLD_IMPACT': str(cls.SPLIT_THRESHOLD_IMPACT)
-        }
+        out = [_ENV_LINE_RE.sub(replace_line, content)]
+        if content and not content.endswith('\n'):
+            out.append('\n')
         
-        # Add new parameters at the end if they don't exist
-        for key, value in new_params.items():
+        # Add new configuration parameters if not present
+        for key, value_str in current.items():
             if key not in updated_keys:
-                lines.append(f"{key}={value}\n")
+                out.append(f"{key}={value_str}\n")
         
-        # Write back to .env file
-        with open('.env', 'w') as f:
-            f.writelines(lines)
+        # Replace the .env file atomically
+        _write_atomic('.env', ''.join(out).encode('utf-8'), 0o600)
             
         logger.info("Configuration saved to .env file")
         
@@ -193,125 +527,180 @@ class Config:
         """Update a parameter value and save to .env"""
         if hasattr(cls, param_name):
             # Convert value to appropriate type based on current value type
-            current_value = getattr(cls, param_name)
-            
-            if isinstance(current_value, bool):
-                if isinstance(value, str):
-                    value = value.lower() == 'true'
-            elif isinstance(current_value, int):
-                value = int(value)
-            elif isinstance(current_value, float):
-                value = float(value)
+            value = _coerce(getattr(cls, param_name), value)
                 
             # Update the parameter
             setattr(cls, param_name, value)
             
-            # Save changes to .env
+            # Invalidate the parsed take profit levels
+            if param_name == 'TP_LEVELS':
+                cls._tp_levels_cache = None
+            elif param_name == 'RATE_LIMIT_REQUESTS_PER_MINUTE':
+                cls.update_rate_limit()
+            elif param_name in ('RPC', 'BACKUP_RPC'):
+                # An explicit choice replaces any failover swap
+                cls.rpc_failed_over = False
+            
+            # Save changes to .env (deferred inside batch_updates)
             cls.save_to_env()
             return True
         else:
             logger.error(f"Parameter {param_name} not found in configuration")
             return False
-            
+    
     @classmethod
     def show_current_parameters(cls):
         """Display current trading parameters"""
-        logger.info("\n" + "=" * 50)
-        logger.info("CURRENT TRADING PARAMETERS")
-        logger.info("=" * 50)
+        # Values read more than once below
+        trailing_stop = cls.TRAILING_STOP
+        exit_strategy = cls.EXIT_STRATEGY
+        fee_mode = cls.PRIORITY_FEE_MODE
+        fee_lamports = cls.PRIORITY_FEE_LAMPORTS
         
-        # Trading settings
-        logger.info("TRADING SETTINGS:")
-        logger.info(f"Buy Amount: {cls.BUY_AMOUNT} SOL")
-        logger.info(f"Auto-Trade: {'Enabled' if cls.AUTO_TRADE else 'Disabled'}")
-        logger.info(f"Auto-Sell: {'Enabled' if cls.AUTO_SELL else 'Disabled'}")
-        
-        # Exit strategy settings
-        logger.info("\nEXIT STRATEGY SETTINGS:")
-        logger.info(f"Strategy: {cls.EXIT_STRATEGY}")
-        logger.info(f"Profit Target: {cls.PROFIT_TARGET}%")
-        logger.info(f"Stop Loss: {cls.STOP_LOSS}%")
-        logger.info(f"Trailing Stop: {cls.TRAILING_STOP} percentage points below highest ROI")
-        if cls.EXIT_STRATEGY == "TRAILING_STOP":
-            logger.info(f"Example: If highest profit reaches 75% and trailing stop is {cls.TRAILING_STOP}, "
-                      f"exit will be at {75-cls.TRAILING_STOP}% profit")
-        logger.info(f"Max Hold Time: {cls.MAX_HOLD_TIME/3600} hours")
+        # Build the whole report and log it as a single record
+        lines = [
+            "",
+            "=" * 50,
+            "CURRENT TRADING PARAMETERS",
+            "=" * 50,
+            
+            # Trading settings
+            "TRADING SETTINGS:",
+            f"Buy Amount: {cls.BUY_AMOUNT} SOL",
+            f"Auto-Trade: {_ED[bool(cls.AUTO_TRADE)]}",
+            f"Auto-Sell: {_ED[bool(cls.AUTO_SELL)]}",
+            
+            # Exit strategy settings
+            "\nEXIT STRATEGY SETTINGS:",
+            f"Strategy: {exit_strategy}",
+            f"Profit Target: {cls.PROFIT_TARGET}%",
+            f"Stop Loss: {cls.STOP_LOSS}%",
+            f"Trailing Stop: {trailing_stop} percentage points below highest ROI",
+        ]
+        if exit_strategy == "TRAILING_STOP":
+            lines.append(f"Example: If highest profit reaches 75% and trailing stop is {trailing_stop}, "
+                         f"exit will be at {75-trailing_stop}% profit")
+        lines.append(f"Max Hold Time: {cls.MAX_HOLD_TIME/3600} hours")
         
         # Multi-TP settings
         if cls.ENABLE_MULTI_TP:
-            logger.info("\nMULTI-LEVEL TAKE PROFIT:")
-            for pct, profit in cls.parse_tp_levels():
-                logger.info(f"Sell {pct}% at {profit}% profit")
+            lines.append("\nMULTI-LEVEL TAKE PROFIT:")
+            lines.extend(f"Sell {pct}% at {profit}% profit" for pct, profit in cls.parse_tp_levels())
         
         # Safety settings
-        logger.info("\nSAFETY SETTINGS:")
-        logger.info(f"Min Liquidity: ${cls.MIN_LIQUIDITY_USD}")
-        logger.info(f"Max Position Size: {cls.MAX_POSITION_SIZE_PERCENT}% of liquidity")
-        logger.info(f"Check Honeypot: {'Enabled' if cls.CHECK_HONEYPOT else 'Disabled'}")
-        
-        # Transaction settings
-        logger.info("\nTRANSACTION SETTINGS:")
-        logger.info(f"Default Slippage: {cls.DEFAULT_SLIPPAGE}%")
-        logger.info(f"Price Impact Warning: {cls.PRICE_IMPACT_WARNING}%")
-        logger.info(f"Price Impact Abort: {cls.PRICE_IMPACT_ABORT}%")
-        logger.info(f"Priority Fee Mode: {cls.PRIORITY_FEE_MODE}")
-        if cls.PRIORITY_FEE_MODE == "custom":
-            logger.info(f"Priority Fee: {cls.PRIORITY_FEE_LAMPORTS} lamports ({cls.PRIORITY_FEE_LAMPORTS/1e9:.9f} SOL)")
-        
-        # Advanced settings
-        logger.info("\nADVANCED SETTINGS:")
-        logger.info(f"Order Splitting: {'Enabled' if cls.USE_ORDER_SPLITTING else 'Disabled'}")
-        logger.info(f"Volume Monitoring: {'Enabled' if cls.ENABLE_VOLUME_MONITORING else 'Disabled'}")
-        logger.info(f"WebSocket: {'Enabled' if cls.ENABLE_WEBSOCKET else 'Disabled'}")
-        
-        # Retry settings
-        logger.info("\nRETRY SETTINGS:")
-        logger.info(f"Max Swap Retries: {cls.MAX_SWAP_RETRIES}")
-        logger.info(f"Max Rate Limit Retries: {cls.MAX_RATE_LIMIT_RETRIES}")
-        logger.info(f"Transaction Confirmation Checks: {cls.MAX_RETRIES}")
-        
-        # API rate limit settings
-        logger.info("\nAPI RATE LIMIT SETTINGS:")
-        logger.info(f"Requests Per Minute: {cls.RATE_LIMIT_REQUESTS_PER_MINUTE}")
-        logger.info(f"Delay Between Calls: {cls.RATE_LIMIT_DELAY:.2f}s")
+        lines += [
+            "\nSAFETY SETTINGS:",
+            f"Min Liquidity: ${cls.MIN_LIQUIDITY_USD}",
+            f"Max Position Size: {cls.MAX_POSITION_SIZE_PERCENT}% of liquidity",
+            f"Check Honeypot: {_ED[bool(cls.CHECK_HONEYPOT)]}",
+            
+            # Transaction settings
+            "\nTRANSACTION SETTINGS:",
+            f"Default Slippage: {cls.DEFAULT_SLIPPAGE}%",
+            f"Price Impact Warning: {cls.PRICE_IMPACT_WARNING}%",
+            f"Price Impact Abort: {cls.PRICE_IMPACT_ABORT}%",
+            f"Priority Fee Mode: {fee_mode}",
+        ]
+        if fee_mode == "custom":
+            lines.append(f"Priority Fee: {fee_lamports} lamports ({fee_lamports/1e9:.9f} SOL)")
         
-        # Price monitoring settings
-        logger.info("\nPRICE MONITORING SETTINGS:")
-        logger.info(f"Check Interval: {cls.PRICE_CHECK_INTERVAL}s")
-        logger.info(f"Display Interval: {cls.PRICE_DISPLAY_INTERVAL}s")
+        lines += [
+            # Advanced settings
+            "\nADVANCED SETTINGS:",
+            f"Order Splitting: {_ED[bool(cls.USE_ORDER_SPLITTING)]}",
+            f"Volume Monitoring: {_ED[bool(cls.ENABLE_VOLUME_MONITORING)]}",
+            f"WebSocket: {_ED[bool(cls.ENABLE_WEBSOCKET)]}",
+            f"uvloop: {_ED[bool(cls.USE_UVLOOP)]}",
+            
+            # Retry settings
+            "\nRETRY SETTINGS:",
+            f"Max Swap Retries: {cls.MAX_SWAP_RETRIES}",
+            f"Max Rate Limit Retries: {cls.MAX_RATE_LIMIT_RETRIES}",
+            f"Transaction Confirmation Checks: {cls.MAX_RETRIES}",
+            
+            # API rate limit settings
+            "\nAPI RATE LIMIT SETTINGS:",
+            f"Requests Per Minute: {cls.RATE_LIMIT_REQUESTS_PER_MINUTE}",
+            f"Delay Between Calls: {cls.RATE_LIMIT_DELAY:.2f}s",
+            
+            # Price monitoring settings
+            "\nPRICE MONITORING SETTINGS:",
+            f"Check Interval: {cls.PRICE_CHECK_INTERVAL}s",
+            f"Display Interval: {cls.PRICE_DISPLAY_INTERVAL}s",
+            
+            "-" * 50,
+        ]
         
-        logger.info("-" * 50)
+        logger.info("\n".join(lines))
+
+Config.load_from_env()
 
 # ================ HELPER FUNCTIONS ================
+def _may_contain_address(text):
+    """Cheap check that text has a run of at least 32 base58 characters"""
+    if len(text) < 32:
+        return False
+    runs = text.encode('utf-8', 'ignore').translate(_B58_TABLE).split(b'\x00')
+    return max(map(len, runs)) >= 32
+
+def _scan_bytes(text):
+    """
+    Encode text one byte per character for Hyperscan, keeping re's word boundaries.
+    Non-ASCII letters and digits are word characters to re, so they become '_'
+    (a word byte outside base58); everything else non-ASCII becomes a space.
+    """
+    if text.isascii():
+        return text.encode('ascii')
+    return ''.join(
+        c if c.isascii() else ('_' if c.isalnum() else ' ') for c in text
+    ).encode('ascii')
+
+def _scan_solana_addresses(text):
+    """Scan text for Solana addresses with the compiled Hyperscan database"""
+    # Scratch space can't be shared between threads, so keep one per thread
+    scratch = getattr(_scratch_local, 'scratch', None)
+    if scratch is None:
+        scratch = hyperscan.Scratch(_solana_addr_db)
+        _scratch_local.scratch = scratch
+    
+    data = _scan_bytes(text)
+    matches = []
+    
+    def on_match(id, frm, to, flags, context):
+        matches.append(data[frm:to].decode('ascii'))
+    
+    _solana_addr_db.scan(data, match_event_handler=on_match, scratch=scratch)
+    return matches
+
 def extract_solana_addresses(text):
     """
     Extract Solana token addresses from text.
     Looks for strings that match Solana address pattern (base58, 32-44 chars).
     """
-    # Pattern to match potential Solana addresses
-    pattern = r'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b'
-    
-    # Find all matches
-    matches = re.findall(pattern, text)
+    # Most messages have no base58 run long enough to be an address
+    if not _may_contain_address(text):
+        return []
     
-    # Filter to valid address length range
-    filtered = []
-    for match in matches:
-        # Accept addresses of any length between 32-44 chars
-        if 32 <= len(match) <= 44:
-            filtered.append(match)
+    # The pattern already enforces the 32-44 char length range
+    if _solana_addr_db is not None:
+        matches = _scan_solana_addresses(text)
+    else:
+        matches = _SOLANA_ADDR_RE.findall(text)
     
-    # Print all accepted addresses
-    if filtered:
-        logger.info(f"Accepted {len(filtered)} valid Solana addresses: {filtered}")
+    # Only format the match list when debug logging is on
+    if matches and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Accepted {len(matches)} valid Solana addresses: {matches}")
     
-    return filtered
+    return matches
 
 def setup_signal_handlers():
     """Setup handlers for graceful shutdown on signals"""
+    # Only the main process installs handlers, so import signal here
+    import signal
+    
     def signal_handler(sig, frame):
         logger.info("Received signal to stop. Shutting down gracefully...")
-        stop_event.set()
+        request_stop()
         
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -382,30 +771,32 @@ def change_exit_strategy():
     print("3. Multi-Level Take Profit (MULTI_TP)")
     print(f"Current strategy: {Config.EXIT_STRATEGY}")
     
-    try:
-        choice = int(input("Select exit strategy (1-3): "))
-        
-        if choice == 1:
-            Config.update_param('EXIT_STRATEGY', 'FULL_TP')
-            Config.update_param('ENABLE_MULTI_TP', False)
-        elif choice == 2:
-            Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
-            Config.update_param('ENABLE_MULTI_TP', False)
-        elif choice == 3:
-            Config.update_param('EXIT_STRATEGY', 'MULTI_TP')
-            Config.update_param('ENABLE_MULTI_TP', True)
-            # Configure TP levels
-            print("Configure take profit levels (format: percentage:profit)")
-            print("Example: 25:30 means sell 25% at 30% profit")
-            tp_levels = input("Enter TP levels (comma-separated): ")
-            Config.update_param('TP_LEVELS', tp_levels)
-        else:
-            print("Invalid selection")
-            return
+    # Write .env once for all updates below
+    with Config.batch_updates():
+        try:
+            choice = int(input("Select exit strategy (1-3): "))
             
-        print(f"Exit strategy changed to: {Config.EXIT_STRATEGY}")
-    except ValueError:
-        print("Please enter a valid number")
+            if choice == 1:
+                Config.update_param('EXIT_STRATEGY', 'FULL_TP')
+                Config.update_param('ENABLE_MULTI_TP', False)
+            elif choice == 2:
+                Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
+                Config.update_param('ENABLE_MULTI_TP', False)
+            elif choice == 3:
+                Config.update_param('EXIT_STRATEGY', 'MULTI_TP')
+                Config.update_param('ENABLE_MULTI_TP', True)
+                # Configure TP levels
+                print("Configure take profit levels (format: percentage:profit)")
+                print("Example: 25:30 means sell 25% at 30% profit")
+                tp_levels = input("Enter TP levels (comma-separated): ")
+                Config.update_param('TP_LEVELS', tp_levels)
+            else:
+                print("Invalid selection")
+                return
+                
+            print(f"Exit strategy changed to: {Config.EXIT_STRATEGY}")
+        except ValueError:
+            print("Please enter a valid number")
 
 def change_priority_fee_settings():
     """Change the priority fee settings"""
@@ -416,26 +807,28 @@ def change_priority_fee_settings():
     if Config.PRIORITY_FEE_MODE == "custom":
         print(f"Current fee: {Config.PRIORITY_FEE_LAMPORTS} lamports ({Config.PRIORITY_FEE_LAMPORTS/1e9:.9f} SOL)")
     
-    try:
-        choice = int(input("Select priority fee mode (1-2): "))
-        
-        if choice == 1:
-            Config.update_param('PRIORITY_FEE_MODE', 'auto')
-            print("Priority fee mode set to auto")
-        elif choice == 2:
-            Config.update_param('PRIORITY_FEE_MODE', 'custom')
-            # Get custom fee amount
-            new_fee = int(input("Enter fee in lamports (recommended range: 100000-1000000): "))
-            if new_fee <= 0:
-                print("Fee must be greater than 0")
+    # Write .env once for all updates below
+    with Config.batch_updates():
+        try:
+            choice = int(input("Select priority fee mode (1-2): "))
+            
+            if choice == 1:
+                Config.update_param('PRIORITY_FEE_MODE', 'auto')
+                print("Priority fee mode set to auto")
+            elif choice == 2:
+                Config.update_param('PRIORITY_FEE_MODE', 'custom')
+                # Get custom fee amount
+                new_fee = int(input("Enter fee in lamports (recommended range: 100000-1000000): "))
+                if new_fee <= 0:
+                    print("Fee must be greater than 0")
+                    return
+                Config.update_param('PRIORITY_FEE_LAMPORTS', new_fee)
+                print(f"Priority fee set to {Config.PRIORITY_FEE_LAMPORTS} lamports ({Config.PRIORITY_FEE_LAMPORTS/1e9:.9f} SOL)")
+            else:
+                print("Invalid selection")
                 return
-            Config.update_param('PRIORITY_FEE_LAMPORTS', new_fee)
-            print(f"Priority fee set to {Config.PRIORITY_FEE_LAMPORTS} lamports ({Config.PRIORITY_FEE_LAMPORTS/1e9:.9f} SOL)")
-        else:
-            print("Invalid selection")
-            return
-    except ValueError:
-        print("Please enter a valid number")
+        except ValueError:
+            print("Please enter a valid number")
 
 def configure_all_parameters():
     """Configure all trading parameters in one flow"""
@@ -445,92 +838,94 @@ def configure_all_parameters():
     print("Press Enter to keep current value")
     print("-" * 50)
     
-    try:
-        # Trading settings
-        print("\nTRADING SETTINGS:")
-        new_buy_amount = input(f"Buy Amount ({Config.BUY_AMOUNT} SOL): ")
-        if new_buy_amount.strip():
-            Config.update_param('BUY_AMOUNT', float(new_buy_amount))
+    # Apply all changes in memory and write .env once at the end
+    with Config.batch_updates():
+        try:
+            # Trading settings
+            print("\nTRADING SETTINGS:")
+            new_buy_amount = input(f"Buy Amount ({Config.BUY_AMOUNT} SOL): ")
+            if new_buy_amount.strip():
+                Config.update_param('BUY_AMOUNT', float(new_buy_amount))
             
-        # Exit strategy settings
-        print("\nEXIT STRATEGY SETTINGS:")
-        print("Exit Strategy Options:")
-        print("1. Full Sell at Take Profit (FULL_TP)")
-        print("2. Trailing Stop Only (TRAILING_STOP)")
-        print("3. Multi-Level Take Profit (MULTI_TP)")
-        print(f"Current: {Config.EXIT_STRATEGY}")
-        new_strategy = input("Select exit strategy (1-3): ")
-        if new_strategy.strip():
-            if new_strategy == "1":
-                Config.update_param('EXIT_STRATEGY', 'FULL_TP')
-                Config.update_param('ENABLE_MULTI_TP', False)
-            elif new_strategy == "2":
-                Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
-                Config.update_param('ENABLE_MULTI_TP', False)
-            elif new_strategy == "3":
-                Config.update_param('EXIT_STRATEGY', 'MULTI_TP')
-                Config.update_param('ENABLE_MULTI_TP', True)
+            # Exit strategy settings
+            print("\nEXIT STRATEGY SETTINGS:")
+            print("Exit Strategy Options:")
+            print("1. Full Sell at Take Profit (FULL_TP)")
+            print("2. Trailing Stop Only (TRAILING_STOP)")
+            print("3. Multi-Level Take Profit (MULTI_TP)")
+            print(f"Current: {Config.EXIT_STRATEGY}")
+            new_strategy = input("Select exit strategy (1-3): ")
+            if new_strategy.strip():
+                if new_strategy == "1":
+                    Config.update_param('EXIT_STRATEGY', 'FULL_TP')
+                    Config.update_param('ENABLE_MULTI_TP', False)
+                elif new_strategy == "2":
+                    Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
+                    Config.update_param('ENABLE_MULTI_TP', False)
+                elif new_strategy == "3":
+                    Config.update_param('EXIT_STRATEGY', 'MULTI_TP')
+                    Config.update_param('ENABLE_MULTI_TP', True)
             
-        new_profit_target = input(f"Profit Target ({Config.PROFIT_TARGET}%): ")
-        if new_profit_target.strip():
-            Config.update_param('PROFIT_TARGET', float(new_profit_target))
+            new_profit_target = input(f"Profit Target ({Config.PROFIT_TARGET}%): ")
+            if new_profit_target.strip():
+                Config.update_param('PROFIT_TARGET', float(new_profit_target))
             
-        new_stop_loss = input(f"Stop Loss ({Config.STOP_LOSS}%): ")
-        if new_stop_loss.strip():
-            Config.update_param('STOP_LOSS', float(new_stop_loss))
+            new_stop_loss = input(f"Stop Loss ({Config.STOP_LOSS}%): ")
+            if new_stop_loss.strip():
+                Config.update_param('STOP_LOSS', float(new_stop_loss))
             
-        new_trailing_stop = input(f"Trailing Stop ({Config.TRAILING_STOP}%): ")
-        if new_trailing_stop.strip():
-            Config.update_param('TRAILING_STOP', float(new_trailing_stop))
+            new_trailing_stop = input(f"Trailing Stop ({Config.TRAILING_STOP}%): ")
+            if new_trailing_stop.strip():
+                Config.update_param('TRAILING_STOP', float(new_trailing_stop))
             
-        new_hold_hours = input(f"Max Hold Time ({Config.MAX_HOLD_TIME/3600} hours): ")
-        if new_hold_hours.strip():
-            Config.update_param('MAX_HOLD_TIME', float(new_hold_hours) * 3600)
+            new_hold_hours = input(f"Max Hold Time ({Config.MAX_HOLD_TIME/3600} hours): ")
+            if new_hold_hours.strip():
+                Config.update_param('MAX_HOLD_TIME', float(new_hold_hours) * 3600)
             
-        # Safety settings
-        print("\nSAFETY SETTINGS:")
-        new_min_liquidity = input(f"Min Liquidity USD ({Config.MIN_LIQUIDITY_USD}): ")
-        if new_min_liquidity.strip():
-            Config.update_param('MIN_LIQUIDITY_USD', float(new_min_liquidity))
+            # Safety settings
+            print("\nSAFETY SETTINGS:")
+            new_min_liquidity = input(f"Min Liquidity USD ({Config.MIN_LIQUIDITY_USD}): ")
+            if new_min_liquidity.strip():
+                Config.update_param('MIN_LIQUIDITY_USD', float(new_min_liquidity))
             
-        new_max_position = input(f"Max Position Size % ({Config.MAX_POSITION_SIZE_PERCENT}): ")
-        if new_max_position.strip():
-            Config.update_param('MAX_POSITION_SIZE_PERCENT', float(new_max_position))
+            new_max_position = input(f"Max Position Size % ({Config.MAX_POSITION_SIZE_PERCENT}): ")
+            if new_max_position.strip():
+                Config.update_param('MAX_POSITION_SIZE_PERCENT', float(new_max_position))
             
-        # Transaction settings
-        print("\nTRANSACTION SETTINGS:")
-        new_slippage = input(f"Default Slippage ({Config.DEFAULT_SLIPPAGE}%): ")
-        if new_slippage.strip():
-            Config.update_param('DEFAULT_SLIPPAGE', float(new_slippage))
+            # Transaction settings
+            print("\nTRANSACTION SETTINGS:")
+            new_slippage = input(f"Default Slippage ({Config.DEFAULT_SLIPPAGE}%): ")
+            if new_slippage.strip():
+                Config.update_param('DEFAULT_SLIPPAGE', float(new_slippage))
             
-        new_impact_warning = input(f"Price Impact Warning ({Config.PRICE_IMPACT_WARNING}%): ")
-        if new_impact_warning.strip():
-            Config.update_param('PRICE_IMPACT_WARNING', float(new_impact_warning))
+            new_impact_warning = input(f"Price Impact Warning ({Config.PRICE_IMPACT_WARNING}%): ")
+            if new_impact_warning.strip():
+                Config.update_param('PRICE_IMPACT_WARNING', float(new_impact_warning))
             
-        new_impact_abort = input(f"Price Impact Abort ({Config.PRICE_IMPACT_ABORT}%): ")
-        if new_impact_abort.strip():
-            Config.update_param('PRICE_IMPACT_ABORT', float(new_impact_abort))
+            new_impact_abort = input(f"Price Impact Abort ({Config.PRICE_IMPACT_ABORT}%): ")
+            if new_impact_abort.strip():
+                Config.update_param('PRICE_IMPACT_ABORT', float(new_impact_abort))
             
-        # Priority Fee Settings
-        print("\nPRIORITY FEE SETTINGS:")
-        print("1. Auto (Jupiter automatically adjusts)")
-        print("2. Custom (Set a fixed fee)")
-        print(f"Current: {Config.PRIORITY_FEE_MODE}")
-        new_pf_mode = input("Select priority fee mode (1-2): ")
-        if new_pf_mode.strip():
-            if new_pf_mode == "1":
-                Config.update_param('PRIORITY_FEE_MODE', 'auto')
-            elif new_pf_mode == "2":
-                Config.update_param('PRIORITY_FEE_MODE', 'custom')
-                new_pf_lamports = input(f"Priority Fee in lamports ({Config.PRIORITY_FEE_LAMPORTS}): ")
-                if new_pf_lamports.strip():
-                    Config.update_param('PRIORITY_FEE_LAMPORTS', int(new_pf_lamports))
+            # Priority Fee Settings
+            print("\nPRIORITY FEE SETTINGS:")
+            print("1. Auto (Jupiter automatically adjusts)")
+            print("2. Custom (Set a fixed fee)")
+            print(f"Current: {Config.PRIORITY_FEE_MODE}")
+            new_pf_mode = input("Select priority fee mode (1-2): ")
+            if new_pf_mode.strip():
+                if new_pf_mode == "1":
+                    Config.update_param('PRIORITY_FEE_MODE', 'auto')
+                elif new_pf_mode == "2":
+                    Config.update_param('PRIORITY_FEE_MODE', 'custom')
+                    new_pf_lamports = input(f"Priority Fee in lamports ({Config.PRIORITY_FEE_LAMPORTS}): ")
+                    if new_pf_lamports.strip():
+                        Config.update_param('PRIORITY_FEE_LAMPORTS', int(new_pf_lamports))
         
-        print("\nAll parameters updated successfully!")
+            print("\nAll parameters updated successfully!")
         
-    except ValueError as e:
-        print(f"Error: {e}")
-        print("Some parameters were not updated due to invalid input")
+        except ValueError as e:
+            print(f"Error: {e}")
+            print("Some parameters were not updated due to invalid input")
     
     # Show the updated parameters
     Config.show_current_parameters()
\ No newline at end of file
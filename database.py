@@ -3,297 +3,512 @@
 Database module for storing trade history and analytics
 """
 import sqlite3
-from datetime import datetime
 import json
+import time
+import atexit
 import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Tuple
 from config import logger
 
+# Values of trades.status
+STATUS_OPEN = 0
+STATUS_CLOSED = 1
+
+# Columns of the trades table
+_TRADES_SCHEMA = '''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    token_address TEXT NOT NULL,
+    buy_price REAL,
+    sell_price REAL,
+    buy_amount_sol REAL,
+    sell_amount_sol REAL,
+    buy_time INTEGER,  -- unix ms
+    sell_time INTEGER,  -- unix ms
+    profit_loss REAL,
+    roi_percent REAL,
+    telegram_source TEXT,
+    exit_reason TEXT,
+    max_roi_reached REAL,
+    hold_duration_seconds INTEGER,
+    price_impact_buy REAL,
+    price_impact_sell REAL,
+    status INTEGER DEFAULT 0  -- STATUS_OPEN / STATUS_CLOSED
+)'''
+
+# Trade history query, kept as one string so the connection's statement cache hits
+_TOKEN_HISTORY_COLUMNS = (
+    'id, token_address, buy_price, sell_price, buy_amount_sol, sell_amount_sol, '
+    'buy_time, sell_time, profit_loss, roi_percent, telegram_source, exit_reason, '
+    'max_roi_reached, hold_duration_seconds, price_impact_buy, price_impact_sell, status'
+)
+_TOKEN_HISTORY_SQL = f'''
+    SELECT {_TOKEN_HISTORY_COLUMNS}
+    FROM trades 
+    WHERE token_address = ?
+    ORDER BY buy_time DESC
+'''
+
+# Secondary indexes (name, DDL), dropped and rebuilt by bulk_load_mode
+_INDEXES = (
+    ('idx_trades_open_lookup', 'CREATE INDEX IF NOT EXISTS idx_trades_open_lookup ON trades(token_address, status, buy_time DESC)'),
+    ('idx_trades_status', 'CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)'),
+    ('idx_price_history_token_ts', 'CREATE INDEX IF NOT EXISTS idx_price_history_token_ts ON price_history(token_address, timestamp DESC)'),
+)
+
+_INSERT_TRADE_SQL = f'''
+    INSERT INTO trades (
+        token_address, buy_price, buy_amount_sol, buy_time, 
+        telegram_source, price_impact_buy, status
+    ) VALUES (?, ?, ?, ?, ?, ?, {STATUS_OPEN})
+'''
+
+# Closes the latest open trade of a token and derives its metrics in SQL
+_CLOSE_TRADE_SQL = f'''
+    UPDATE trades SET 
+        sell_price = ?,
+        sell_amount_sol = ?,
+        sell_time = ?,
+        profit_loss = ? - buy_amount_sol,
+        roi_percent = (? - buy_amount_sol) / buy_amount_sol * 100,
+        exit_reason = ?,
+        hold_duration_seconds = (? - buy_time) / 1000.0,
+        max_roi_reached = COALESCE(?, max_roi_reached),
+        price_impact_sell = ?,
+        status = {STATUS_CLOSED}
+    WHERE id = (
+        SELECT id FROM trades 
+        WHERE token_address = ? AND status = {STATUS_OPEN}
+        ORDER BY buy_time DESC 
+        LIMIT 1
+    )
+'''
+
+def _now_ms() -> int:
+    """Current time as integer unix milliseconds, the format of all timestamp columns"""
+    return time.time_ns() // 1_000_000
+
 class TradingDatabase:
+    # Price points are buffered and written in batches
+    PRICE_BUFFER_SIZE = 200
+    PRICE_FLUSH_INTERVAL = 1.0  # seconds
+    
+    # Retries for writes that still hit SQLITE_BUSY after busy_timeout
+    WRITE_RETRIES = 5
+    
+    # Rows of the trade_stats table
+    STATS_KEYS = ('total_closed', 'wins', 'losses', 'sum_pl', 'sum_roi', 'max_roi', 'min_roi', 'sum_hold')
+    
     def __init__(self, db_path="trading_history.db"):
         self.db_path = db_path
-        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._price_buffer = []
+        self._buffer_lock = threading.Lock()
+        self._max_roi = {}  # Highest ROI per open token, persisted by record_sell
         self.create_tables()
+        
+        # Every flagged token is loaded up front, so is_known_honeypot never queries SQLite
+        self._honeypots = {
+            row[0] for row in self.get_connection().execute(
+                'SELECT token_address FROM token_metadata WHERE is_honeypot = 1'
+            )
+        }
+        
+        # Flush buffered price points periodically and on exit
+        threading.Thread(target=self._flush_periodically, name="db-flusher", daemon=True).start()
+        atexit.register(self.flush)
+        atexit.register(self._save_max_roi)
     
     def get_connection(self):
-        """Get a new database connection"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        # Autocommit mode; writes open their own BEGIN IMMEDIATE transactions
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # Per-connection settings
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-64000')
+        self._local.conn = conn
+        return conn
+    
+    def _write(self, sql: str, params=(), many: bool = False) -> Tuple[sqlite3.Cursor, List]:
+        """Run a write statement and commit it, returning the cursor and any RETURNING rows"""
+        conn = self.get_connection()
+        for attempt in range(self.WRITE_RETRIES):
+            try:
+                # Take the write lock up front rather than upgrading a read transaction
+                conn.execute('BEGIN IMMEDIATE')
+                cursor = conn.executemany(sql, params) if many else conn.execute(sql, params)
+                rows = cursor.fetchall()
+                conn.execute('COMMIT')
+                return cursor, rows
+            except BaseException as e:
+                # Roll back on any failure, or this connection stays mid-transaction holding the write lock
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                locked = isinstance(e, sqlite3.OperationalError) and 'locked' in str(e)
+                if not locked or attempt == self.WRITE_RETRIES - 1:
+                    raise
+                time.sleep(0.01)
     
     def create_tables(self):
         """Create necessary database tables"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                # Trades table
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS trades (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        token_address TEXT NOT NULL,
-                        buy_price REAL,
-                        sell_price REAL,
-                        buy_amount_sol REAL,
-                        sell_amount_sol REAL,
-                        buy_time TIMESTAMP,
-                        sell_time TIMESTAMP,
-                        profit_loss REAL,
-                        roi_percent REAL,
-                        telegram_source TEXT,
-                        exit_reason TEXT,
-                        max_roi_reached REAL,
-                        hold_duration_seconds INTEGER,
-                        price_impact_buy REAL,
-                        price_impact_sell REAL,
-                        status TEXT DEFAULT 'open'
-                    )
-                ''')
-                
-                # Price history table
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS price_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        token_address TEXT NOT NULL,
-                        price REAL,
-                        timestamp TIMESTAMP,
-                        volume_24h REAL
-                    )
-                ''')
-                
-                # Token metadata table
-                conn.execute('''
-                    CREATE TABLE IF NOT EXISTS token_metadata (
-                        token_address TEXT PRIMARY KEY,
-                        symbol TEXT,
-                        name TEXT,
-                        decimals INTEGER,
-                        first_seen TIMESTAMP,
-                        liquidity_usd REAL,
-                        holder_count INTEGER,
-                        is_honeypot BOOLEAN DEFAULT 0
-                    )
+        conn = self.get_connection()
+        # WAL lets readers run alongside the writer; it persists in the database file
+        if self.db_path != ":memory:":
+            conn.execute('PRAGMA journal_mode=WAL')
+        
+        # All schema changes share one transaction and one sync; a failure rolls
+        # back so the write lock is not held against other threads
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._create_schema(conn)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        """Create tables, triggers and indexes and migrate old databases, inside the caller's transaction"""
+        # Trades table
+        conn.execute(f'CREATE TABLE IF NOT EXISTS trades {_TRADES_SCHEMA}')
+        
+        # Price history table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS price_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                token_address TEXT NOT NULL,
+                price REAL,
+                timestamp INTEGER,  -- unix ms
+                volume_24h REAL
+            )
+        ''')
+        
+        # Token metadata table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS token_metadata (
+                token_address TEXT PRIMARY KEY,
+                symbol TEXT,
+                name TEXT,
+                decimals INTEGER,
+                first_seen INTEGER,  -- unix ms
+                liquidity_usd REAL,
+                holder_count INTEGER,
+                is_honeypot INTEGER DEFAULT 0
+            )
+        ''')
+        
+        # Migrate databases written by earlier versions
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            # Local datetime strings to unix ms
+            for table, column in (('trades', 'buy_time'), ('trades', 'sell_time'),
+                                  ('price_history', 'timestamp'), ('token_metadata', 'first_seen')):
+                conn.execute(f'''
+                    UPDATE {table}
+                    SET {column} = CAST(ROUND((julianday({column}, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+                    WHERE typeof({column}) = 'text'
                 ''')
-                
-                # Create indexes for better performance
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_token ON trades(token_address)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status)')
-                conn.execute('CREATE INDEX IF NOT EXISTS idx_price_history_token ON price_history(token_address)')
-                
-                conn.commit()
-            finally:
-                conn.close()
+        if version < 2:
+            # Rebuild trades so status gets INTEGER affinity and 'open'/'closed' become integers.
+            # Dropping the old table also drops its indexes and stats trigger, recreated below
+            columns = _TOKEN_HISTORY_COLUMNS.replace(', status', '')
+            conn.execute(f'CREATE TABLE trades_new {_TRADES_SCHEMA}')
+            conn.execute(f'''
+                INSERT INTO trades_new ({columns}, status)
+                SELECT {columns}, CASE status WHEN 'open' THEN {STATUS_OPEN} ELSE {STATUS_CLOSED} END
+                FROM trades
+            ''')
+            conn.execute('DROP TABLE trades')
+            conn.execute('ALTER TABLE trades_new RENAME TO trades')
+            conn.execute('PRAGMA user_version = 2')
+        if version < 3:
+            # The old stats trigger turned wins/losses NULL after a close with no profit_loss;
+            # drop it with the aggregates so both are recreated and backfilled below
+            conn.execute('DROP TRIGGER IF EXISTS trg_trade_stats')
+            conn.execute('DROP TABLE IF EXISTS trade_stats')
+            conn.execute('PRAGMA user_version = 3')
+        
+        # Running aggregates over closed trades, maintained by trg_trade_stats
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS trade_stats (
+                k TEXT PRIMARY KEY,
+                v REAL
+            )
+        ''')
+        
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_trade_stats
+            AFTER UPDATE OF status ON trades
+            WHEN NEW.status = {STATUS_CLOSED} AND OLD.status != {STATUS_CLOSED}
+            BEGIN
+                UPDATE trade_stats SET v = CASE k
+                    WHEN 'total_closed' THEN v + 1
+                    WHEN 'wins' THEN v + (IFNULL(NEW.profit_loss, 0) > 0)
+                    WHEN 'losses' THEN v + (IFNULL(NEW.profit_loss, 0) < 0)
+                    WHEN 'sum_pl' THEN v + IFNULL(NEW.profit_loss, 0)
+                    WHEN 'sum_roi' THEN v + IFNULL(NEW.roi_percent, 0)
+                    WHEN 'max_roi' THEN COALESCE(MAX(v, NEW.roi_percent), v, NEW.roi_percent)
+                    WHEN 'min_roi' THEN COALESCE(MIN(v, NEW.roi_percent), v, NEW.roi_percent)
+                    WHEN 'sum_hold' THEN v + IFNULL(NEW.hold_duration_seconds, 0)
+                END;
+            END
+        ''')
+        
+        # Backfill the aggregates from existing trades on first run
+        if conn.execute('SELECT COUNT(*) FROM trade_stats').fetchone()[0] == 0:
+            totals = conn.execute(f'''
+                SELECT 
+                    COUNT(*),
+                    COUNT(CASE WHEN profit_loss > 0 THEN 1 END),
+                    COUNT(CASE WHEN profit_loss < 0 THEN 1 END),
+                    IFNULL(SUM(profit_loss), 0),
+                    IFNULL(SUM(roi_percent), 0),
+                    MAX(roi_percent),
+                    MIN(roi_percent),
+                    IFNULL(SUM(hold_duration_seconds), 0)
+                FROM trades WHERE status = {STATUS_CLOSED}
+            ''').fetchone()
+            conn.executemany(
+                'INSERT INTO trade_stats (k, v) VALUES (?, ?)',
+                zip(self.STATS_KEYS, totals)
+            )
+        
+        # Create indexes for better performance
+        for _, ddl in _INDEXES:
+            conn.execute(ddl)
+        
+        # Superseded by the composite indexes above
+        conn.execute('DROP INDEX IF EXISTS idx_trades_token')
+        conn.execute('DROP INDEX IF EXISTS idx_price_history_token')
+    
+    @contextmanager
+    def bulk_load_mode(self):
+        """
+        Speed up an initial import on this thread: secondary indexes are dropped
+        and rebuilt in one pass on exit, and commits skip fsync meanwhile
+        """
+        conn = self.get_connection()
+        for name, _ in _INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {name}')
+        conn.execute('PRAGMA synchronous=OFF')
+        
+        try:
+            yield self
+        finally:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for _, ddl in _INDEXES:
+                conn.execute(ddl)
     
     def record_buy(self, token_address: str, buy_price: float, buy_amount_sol: float, 
                    telegram_source: str, price_impact: float = 0.0) -> int:
         """Record a buy transaction"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                cursor = conn.execute('''
-                    INSERT INTO trades (
-                        token_address, buy_price, buy_amount_sol, buy_time, 
-                        telegram_source, price_impact_buy, status
-                    ) VALUES (?, ?, ?, ?, ?, ?, 'open')
-                ''', (token_address, buy_price, buy_amount_sol, datetime.now(), 
-                      telegram_source, price_impact))
-                conn.commit()
-                return cursor.lastrowid
-            finally:
-                conn.close()
+        cursor, _ = self._write(_INSERT_TRADE_SQL, (token_address, buy_price, buy_amount_sol, _now_ms(), 
+                                                    telegram_source, price_impact))
+        return cursor.lastrowid
+    
+    def record_buys(self, rows: List[Tuple]) -> List[int]:
+        """
+        Record many buys in one transaction
+        rows: (token_address, buy_price, buy_amount_sol, telegram_source, price_impact) tuples
+        Returns the new trade ids in the same order
+        """
+        if not rows:
+            return []
+        
+        now = _now_ms()
+        self._write(_INSERT_TRADE_SQL, [(token, price, amount, now, source, impact)
+                                        for token, price, amount, source, impact in rows], many=True)
+        
+        # Rowids of a single multi-row insert are consecutive, and last_insert_rowid is per connection
+        last_id = self.get_connection().execute('SELECT last_insert_rowid()').fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+    
+    def _close_params(self, token_address, sell_price, sell_amount_sol, exit_reason, price_impact, now):
+        """Parameters for _CLOSE_TRADE_SQL"""
+        return (sell_price, sell_amount_sol, now, sell_amount_sol, sell_amount_sol, exit_reason, now,
+                self._max_roi.pop(token_address, None), price_impact, token_address)
     
     def record_sell(self, token_address: str, sell_price: float, sell_amount_sol: float,
                     exit_reason: str, price_impact: float = 0.0):
         """Record a sell transaction and calculate metrics"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                # Get the open trade for this token
-                cursor = conn.execute('''
-                    SELECT id, buy_price, buy_amount_sol, buy_time
-                    FROM trades 
-                    WHERE token_address = ? AND status = 'open'
-                    ORDER BY buy_time DESC 
-                    LIMIT 1
-                ''', (token_address,))
-                
-                trade = cursor.fetchone()
-                if not trade:
-                    logger.warning(f"No open trade found for {token_address}")
-                    return
-                
-                trade_id, buy_price, buy_amount_sol, buy_time = trade
-                
-                # Calculate metrics
-                profit_loss = sell_amount_sol - buy_amount_sol
-                roi_percent = ((sell_amount_sol - buy_amount_sol) / buy_amount_sol) * 100
-                hold_duration = (datetime.now() - datetime.fromisoformat(buy_time)).total_seconds()
-                
-                # Update the trade record
-                conn.execute('''
-                    UPDATE trades SET 
-                        sell_price = ?,
-                        sell_amount_sol = ?,
-                        sell_time = ?,
-                        profit_loss = ?,
-                        roi_percent = ?,
-                        exit_reason = ?,
-                        hold_duration_seconds = ?,
-                        price_impact_sell = ?,
-                        status = 'closed'
-                    WHERE id = ?
-                ''', (sell_price, sell_amount_sol, datetime.now(), profit_loss,
-                      roi_percent, exit_reason, hold_duration, price_impact, trade_id))
-                
-                conn.commit()
-                
-                logger.info(f"Trade closed: {token_address} - ROI: {roi_percent:.2f}%")
-            finally:
-                conn.close()
+        # Close the latest open trade and derive its metrics in one statement
+        _, rows = self._write(_CLOSE_TRADE_SQL + ' RETURNING roi_percent', self._close_params(
+            token_address, sell_price, sell_amount_sol, exit_reason, price_impact, _now_ms()))
+        
+        if not rows:
+            logger.warning(f"No open trade found for {token_address}")
+            return
+        
+        logger.info(f"Trade closed: {token_address} - ROI: {rows[0][0]:.2f}%")
+    
+    def record_sells(self, rows: List[Tuple]):
+        """
+        Record many sells in one transaction
+        rows: (token_address, sell_price, sell_amount_sol, exit_reason, price_impact) tuples
+        """
+        if not rows:
+            return
+        
+        now = _now_ms()
+        cursor, _ = self._write(_CLOSE_TRADE_SQL, [self._close_params(*row, now) for row in rows], many=True)
+        logger.info(f"Closed {cursor.rowcount} of {len(rows)} trades")
     
     def update_max_roi(self, token_address: str, max_roi: float):
-        """Update the maximum ROI reached for a trade"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                conn.execute('''
-                    UPDATE trades 
-                    SET max_roi_reached = ?
-                    WHERE token_address = ? AND status = 'open'
-                ''', (max_roi, token_address))
-                conn.commit()
-            finally:
-                conn.close()
+        """Update the maximum ROI reached for a trade (kept in memory until the trade is closed)"""
+        current = self._max_roi.get(token_address)
+        if current is None or max_roi > current:
+            self._max_roi[token_address] = max_roi
+    
+    def _save_max_roi(self):
+        """Persist the max ROI of trades that are still open"""
+        if not self._max_roi:
+            return
+        
+        self._write(f'''
+            UPDATE trades 
+            SET max_roi_reached = ?
+            WHERE token_address = ? AND status = {STATUS_OPEN}
+        ''', [(roi, token) for token, roi in self._max_roi.items()], many=True)
     
     def record_price_point(self, token_address: str, price: float, volume_24h: float = 0):
-        """Record a price data point"""
-        with self.lock:
-            conn = self.get_connection()
+        """Record a price data point (buffered, see flush)"""
+        with self._buffer_lock:
+            self._price_buffer.append((token_address, price, _now_ms(), volume_24h))
+            full = len(self._price_buffer) >= self.PRICE_BUFFER_SIZE
+        
+        if full:
+            self.flush()
+    
+    def flush(self):
+        """Write all buffered price points in a single transaction"""
+        with self._buffer_lock:
+            rows, self._price_buffer = self._price_buffer, []
+        
+        if not rows:
+            return
+        
+        self._write('''
+            INSERT INTO price_history (token_address, price, timestamp, volume_24h)
+            VALUES (?, ?, ?, ?)
+        ''', rows, many=True)
+    
+    def _flush_periodically(self):
+        """Background loop flushing the price buffer"""
+        while True:
+            time.sleep(self.PRICE_FLUSH_INTERVAL)
             try:
-                conn.execute('''
-                    INSERT INTO price_history (token_address, price, timestamp, volume_24h)
-                    VALUES (?, ?, ?, ?)
-                ''', (token_address, price, datetime.now(), volume_24h))
-                conn.commit()
-            finally:
-                conn.close()
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Error flushing price history: {e}")
     
     def save_token_metadata(self, token_address: str, metadata: Dict):
-        """Save token metadata"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                conn.execute('''
-                    INSERT OR REPLACE INTO token_metadata 
-                    (token_address, symbol, name, decimals, first_seen, liquidity_usd, holder_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    token_address,
-                    metadata.get('symbol', ''),
-                    metadata.get('name', ''),
-                    metadata.get('decimals', 9),
-                    datetime.now(),
-                    metadata.get('liquidity_usd', 0),
-                    metadata.get('holder_count', 0)
-                ))
-                conn.commit()
-            finally:
-                conn.close()
+        """Save token metadata, keeping first_seen and the honeypot flag of known tokens"""
+        self._write('''
+            INSERT INTO token_metadata 
+            (token_address, symbol, name, decimals, first_seen, liquidity_usd, holder_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(token_address) DO UPDATE SET
+                symbol = excluded.symbol,
+                name = excluded.name,
+                decimals = excluded.decimals,
+                liquidity_usd = excluded.liquidity_usd,
+                holder_count = excluded.holder_count
+        ''', (
+            token_address,
+            metadata.get('symbol', ''),
+            metadata.get('name', ''),
+            metadata.get('decimals', 9),
+            _now_ms(),
+            metadata.get('liquidity_usd', 0),
+            metadata.get('holder_count', 0)
+        ))
     
     def get_trade_statistics(self) -> Dict:
         """Get overall trading statistics"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                # Overall stats
-                cursor = conn.execute('''
-                    SELECT 
-                        COUNT(*) as total_trades,
-                        COUNT(CASE WHEN status = 'closed' THEN 1 END) as closed_trades,
-                        COUNT(CASE WHEN profit_loss > 0 THEN 1 END) as winning_trades,
-                        COUNT(CASE WHEN profit_loss < 0 THEN 1 END) as losing_trades,
-                        SUM(profit_loss) as total_profit_loss,
-                        AVG(roi_percent) as avg_roi,
-                        MAX(roi_percent) as best_trade_roi,
-                        MIN(roi_percent) as worst_trade_roi,
-                        AVG(hold_duration_seconds) as avg_hold_time
-                    FROM trades WHERE status = 'closed'
-                ''')
-                
-                stats = cursor.fetchone()
-                
-                if stats[1] > 0:  # If we have closed trades
-                    win_rate = (stats[2] / stats[1]) * 100 if stats[1] > 0 else 0
-                    
-                    return {
-                        'total_trades': stats[0],
-                        'closed_trades': stats[1],
-                        'winning_trades': stats[2],
-                        'losing_trades': stats[3],
-                        'win_rate': win_rate,
-                        'total_profit_loss': stats[4] or 0,
-                        'avg_roi': stats[5] or 0,
-                        'best_trade_roi': stats[6] or 0,
-                        'worst_trade_roi': stats[7] or 0,
-                        'avg_hold_time_hours': (stats[8] or 0) / 3600
-                    }
-                else:
-                    return {
-                        'total_trades': stats[0],
-                        'closed_trades': 0,
-                        'winning_trades': 0,
-                        'losing_trades': 0,
-                        'win_rate': 0,
-                        'total_profit_loss': 0,
-                        'avg_roi': 0,
-                        'best_trade_roi': 0,
-                        'worst_trade_roi': 0,
-                        'avg_hold_time_hours': 0
-                    }
-            finally:
-                conn.close()
+        conn = self.get_connection()
+        # Overall stats, precomputed by trg_trade_stats
+        stats = dict(conn.execute('SELECT k, v FROM trade_stats').fetchall())
+        closed = int(stats['total_closed'])
+        
+        if closed > 0:  # If we have closed trades
+            wins = int(stats['wins'])
+            
+            return {
+                'total_trades': closed,
+                'closed_trades': closed,
+                'winning_trades': wins,
+                'losing_trades': int(stats['losses']),
+                'win_rate': (wins / closed) * 100,
+                'total_profit_loss': stats['sum_pl'],
+                'avg_roi': stats['sum_roi'] / closed,
+                'best_trade_roi': stats['max_roi'] or 0,
+                'worst_trade_roi': stats['min_roi'] or 0,
+                'avg_hold_time_hours': stats['sum_hold'] / closed / 3600
+            }
+        else:
+            return {
+                'total_trades': 0,
+                'closed_trades': 0,
+                'winning_trades': 0,
+                'losing_trades': 0,
+                'win_rate': 0,
+                'total_profit_loss': 0,
+                'avg_roi': 0,
+                'best_trade_roi': 0,
+                'worst_trade_roi': 0,
+                'avg_hold_time_hours': 0
+            }
     
     def get_token_history(self, token_address: str) -> List[Dict]:
         """Get all trades for a specific token"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                cursor = conn.execute('''
-                    SELECT * FROM trades 
-                    WHERE token_address = ?
-                    ORDER BY buy_time DESC
-                ''', (token_address,))
-                
-                columns = [description[0] for description in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
-            finally:
-                conn.close()
+        conn = self.get_connection()
+        return [dict(row) for row in conn.execute(_TOKEN_HISTORY_SQL, (token_address,))]
+    
+    def get_recent_trades(self, limit: int = 10) -> List[Tuple]:
+        """Get (token_address, buy_time, sell_time, roi_percent, exit_reason) for the latest trades"""
+        conn = self.get_connection()
+        cursor = conn.execute('''
+            SELECT token_address, buy_time, sell_time, roi_percent, exit_reason
+            FROM trades
+            ORDER BY buy_time DESC
+            LIMIT ?
+        ''', (limit,))
+        return cursor.fetchall()
     
     def mark_token_as_honeypot(self, token_address: str):
         """Mark a token as honeypot/scam"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                conn.execute('''
-                    UPDATE token_metadata 
-                    SET is_honeypot = 1
-                    WHERE token_address = ?
-                ''', (token_address,))
-                conn.commit()
-            finally:
-                conn.close()
+        cursor, _ = self._write('''
+            UPDATE token_metadata 
+            SET is_honeypot = 1
+            WHERE token_address = ?
+        ''', (token_address,))
+        
+        # Only tokens with a metadata row can be flagged
+        if cursor.rowcount:
+            self._honeypots.add(token_address)
     
     def is_known_honeypot(self, token_address: str) -> bool:
         """Check if token is marked as honeypot"""
-        with self.lock:
-            conn = self.get_connection()
-            try:
-                cursor = conn.execute('''
-                    SELECT is_honeypot FROM token_metadata
-                    WHERE token_address = ?
-                ''', (token_address,))
-                
-                result = cursor.fetchone()
-                return result[0] if result else False
-            finally:
-                conn.close()
+        return token_address in self._honeypots
+
+# Global database instance, created on first use
+_db = None
+_db_lock = threading.Lock()
 
-# Global database instance
-db = TradingDatabase()
\ No newline at end of file
+def get_db() -> TradingDatabase:
+    """Get the shared TradingDatabase, opening it on first call"""
+    global _db
+    if _db is None:
+        # Worker threads may race on the first call; only one may create the schema
+        with _db_lock:
+            if _db is None:
+                _db = TradingDatabase()
+    return _db
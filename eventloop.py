@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Background event loop and per-loop HTTP clients shared by the Jito and Raydium modules
+- One long-lived loop runs the coroutines behind every synchronous wrapper
+- One pooled aiohttp session per event loop, and one Solana AsyncClient per loop and RPC URL
+- run_sync() also works when called from the background loop itself
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+import weakref
+from typing import Awaitable, Callable, List
+
+import aiohttp
+from solana.rpc.async_api import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+# Long-lived loop behind the synchronous wrappers, so they share one loop and one
+# connection pool instead of building a loop per call
+bg_loop = asyncio.new_event_loop()
+_bg_thread = threading.Thread(target=bg_loop.run_forever, name="swap-loop", daemon=True)
+_bg_thread.start()
+
+# aiohttp sessions and RPC clients are bound to the loop that created them
+_sessions = weakref.WeakKeyDictionary()
+_sessions_lock = threading.Lock()
+_rpc_clients = weakref.WeakKeyDictionary()
+
+# Extra per-loop closers registered by other modules (e.g. Jito's HTTP/2 clients)
+_loop_closers: List[Callable[[], Awaitable[None]]] = []
+
+async def get_async_session() -> aiohttp.ClientSession:
+    """Get or create the pooled HTTP session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        session = _sessions.get(loop)
+        if session is None or session.closed:
+            # Keep-alive pool with cached DNS so repeat requests skip the TCP/TLS handshake
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+            session = _sessions[loop] = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=10, connect=1.5)
+            )
+    return session
+
+def get_rpc_client(url: str) -> AsyncClient:
+    """Get or create the async Solana RPC client for url on the running event loop"""
+    loop = asyncio.get_running_loop()
+    clients = _rpc_clients.get(loop)
+    if clients is None:
+        clients = _rpc_clients[loop] = {}
+    client = clients.get(url)
+    if client is None:
+        client = clients[url] = AsyncClient(url, timeout=5)
+    return client
+
+def on_loop_close(closer: Callable[[], Awaitable[None]]) -> None:
+    """Register a coroutine function that releases a module's resources for the running loop"""
+    _loop_closers.append(closer)
+
+async def close_loop_resources() -> None:
+    """Close the HTTP session, RPC clients and registered resources of the running loop"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+    for client in _rpc_clients.pop(loop, {}).values():
+        await client.close()
+    for closer in _loop_closers:
+        await closer()
+
+async def _run_isolated(coro):
+    """Run a coroutine on a private loop, closing that loop's clients afterwards"""
+    try:
+        return await coro
+    finally:
+        await close_loop_resources()
+
+def run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    if threading.current_thread() is _bg_thread:
+        # Called from a coroutine already on the background loop; waiting on it would deadlock
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, _run_isolated(coro)).result()
+    return asyncio.run_coroutine_threadsafe(coro, bg_loop).result()
+
+def shutdown() -> None:
+    """Close the background loop's clients and stop the loop"""
+    if not bg_loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_loop_resources(), bg_loop).result(timeout=5)
+    except Exception as e:
+        logger.debug(f"Background loop cleanup failed: {e}")
+    bg_loop.call_soon_threadsafe(bg_loop.stop)
+
+atexit.register(shutdown)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Fast JSON encode/decode shared by the RPC, Jito and Raydium modules
+- Uses orjson when installed, then ujson, then the standard library
+- dumps() always returns compact UTF-8 bytes, ready to send as a request body
+- loads() accepts str or bytes
+"""
+try:
+    import orjson
+
+    dumps = orjson.dumps
+    loads = orjson.loads
+    BACKEND = "orjson"
+except ImportError:
+    try:
+        import ujson
+
+        def dumps(obj) -> bytes:
+            """Serialize obj to compact JSON bytes"""
+            return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+        loads = ujson.loads
+        BACKEND = "ujson"
+    except ImportError:
+        import json
+
+        def dumps(obj) -> bytes:
+            """Serialize obj to compact JSON bytes"""
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+        loads = json.loads
+        BACKEND = "json"
@@ -7,34 +7,48 @@ Optimized Jito MEV routing implementation for faster token swaps on Solana
 - Improves error handling and retry logic
 - Now uses Raydium V4 for direct AMM swaps
 """
-import base64
+from binascii import a2b_base64, b2a_base64
 import time
-import json
 import requests
 import random
 import hashlib
 import asyncio
 import aiohttp
-from typing import Dict, Optional, Tuple, List, Any, Union
+import httpx
+import weakref
+import contextlib
+import functools
+from urllib.parse import urlsplit
+from typing import Dict, Optional, Tuple, List, Any, Union, Callable
 from datetime import datetime
 from solders.transaction import VersionedTransaction
 from solders.message import to_bytes_versioned
 from solana.rpc.types import TxOpts
 from solana.rpc.commitment import Commitment
-import concurrent.futures
 
-from config import Config, logger
-from solanaa import payer_keypair, solana_client, confirm_transaction, confirm_transaction_async
+try:
+    import h2  # Enables HTTP/2 in httpx
+    _JITO_HTTP2 = True
+except ImportError:
+    _JITO_HTTP2 = False
 
-# Import Raydium functions instead of Jupiter
-from raydium_v4 import get_quote_raydium, execute_raydium_swap
+from config import Config, Endpoint, logger
+import fastjson
+from solanaa import payer_keypair, confirm_transaction, confirm_transaction_async
+from eventloop import bg_loop, get_async_session, get_rpc_client, on_loop_close, run_sync, shutdown
 
-# Thread pool for concurrent operations
-_thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+# Import Raydium functions instead of Jupiter
+from raydium_v4 import RAYDIUM_API_BASE, get_quote_raydium, execute_raydium_swap
 
 # ================ JITO ROUTING CONFIGURATION ================
 # Jito RPC endpoints - Consider upgrading to a paid tier for higher rate limits
 JITO_RPC_URL = "https://mainnet.block-engine.jito.wtf/api/v1/mainnet/broadcast-transaction"
+# Regional block engines, raced against each other on submission
+JITO_REGIONS = ["mainnet", "amsterdam", "frankfurt", "ny", "tokyo", "slc"]
+JITO_RPC_URLS = [
+    JITO_RPC_URL if region == "mainnet" else JITO_RPC_URL.replace("https://", f"https://{region}.")
+    for region in JITO_REGIONS
+]
 JITO_AUTH_HEADER = None  # Set this if you're using authenticated API access
 JITO_TIP_ACCOUNT = "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5"  # Jito fee recipient address
 
@@ -46,192 +60,399 @@ TIP_LEVELS = {
     "extreme": 5000000    # 0.005 SOL
 }
 
-# Cache for network congestion level (updated every minute)
-network_status = {
-    "level": "medium",
-    "last_update": 0,
-    "update_interval": 60  # Update every 60 seconds
+# Landed-tip percentiles published by Jito (values in SOL)
+JITO_TIP_FLOOR_URL = "https://bundles.jito.wtf/api/v1/bundles/tip_floor"
+
+# Multiplier applied to the 75th-percentile landed tip at each congestion level
+TIP_URGENCY = {
+    "low": 1.0,
+    "medium": 1.0,
+    "high": 1.5,
+    "extreme": 2.0
+}
+
+# Congestion estimate: EWMAs of transactions per slot and Jito submission latency
+CONGESTION_EWMA_ALPHA = 0.2
+CONGESTION_REFRESH_SECONDS = 30
+TX_PER_SLOT_THRESHOLDS = (1000, 3000, 5000)   # low / medium / high / extreme boundaries
+LATENCY_THRESHOLDS = (0.25, 0.5, 1.0)         # seconds, same boundaries
+LATENCY_HALF_LIFE_SECONDS = 120               # latency estimate halves for every 2 minutes without a submission
+TIP_FLOOR_REFRESH_SECONDS = 10
+TIP_FLOOR_MAX_AGE_SECONDS = 60   # fall back to TIP_LEVELS if the floor hasn't refreshed for this long
+congestion_estimate = {
+    "tx_per_slot": None,
+    "latency": None,
+    "latency_at": float('-inf'),
+    "last_sample_slot": -1,
+    "sampled_at": float('-inf'),
+    "tip_floor": None,
+    "tip_floor_at": float('-inf')
 }
 
 # HTTP session for connection pooling
 _session = requests.Session()
 _session.headers.update({"Content-Type": "application/json"})
 
-# Async HTTP session
-_async_session = None
+# HTTP/2 clients for the Jito block engine, one per event loop. Concurrent
+# submissions multiplex over one connection instead of queuing for HTTP/1.1 sockets
+_jito_clients = weakref.WeakKeyDictionary()
 
-async def get_async_session():
-    """Get or create the async HTTP session"""
-    global _async_session
-    if _async_session is None or _async_session.closed:
-        _async_session = aiohttp.ClientSession(
-            headers={"Content-Type": "application/json"}
+def get_jito_client() -> httpx.AsyncClient:
+    """Get or create the Jito HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _jito_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _jito_clients[loop] = httpx.AsyncClient(
+            http2=_JITO_HTTP2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=75),
+            timeout=httpx.Timeout(5.0, connect=1.0)
         )
-    return _async_session
+    return client
 
-# ================ HELPER FUNCTIONS ================
-async def get_network_congestion_async() -> str:
+async def _close_jito_client():
+    """Close the running loop's Jito HTTP client"""
+    client = _jito_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+on_loop_close(_close_jito_client)
+
+# ================ ADAPTIVE CONCURRENCY LIMIT ================
+class VegasLimiter:
     """
-    Determine current network congestion level to adjust tip amount
-    Uses a cached value to avoid too many API calls
+    TCP-Vegas style cap on concurrent outbound requests: the limit shrinks when
+    latency climbs above the best RTT seen or the server throttles us, and grows
+    while requests complete close to that baseline
     """
-    global network_status
-    current_time = time.time()
+    __slots__ = ('limit', 'min_limit', 'max_limit', 'inflight', 'min_rtt', 'cond')
     
-    # If we've checked recently, use cached value
-    if current_time - network_status["last_update"] < network_status["update_interval"]:
-        return network_status["level"]
+    def __init__(self, limit: int = 8, min_limit: int = 2, max_limit: int = 64):
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.inflight = 0
+        self.min_rtt = float('inf')
+        self.cond = asyncio.Condition()
     
+    @contextlib.asynccontextmanager
+    async def use(self):
+        """Hold a concurrency slot for one request; set call['throttled'] on a 429"""
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.inflight < self.limit)
+            self.inflight += 1
+        
+        call = {"throttled": False}
+        start = time.monotonic()
+        failed = True
+        try:
+            yield call
+            failed = False
+        finally:
+            rtt = time.monotonic() - start
+            async with self.cond:
+                # Back off on throttling, errors or queueing delay; probe upward when at the cap and fast
+                if failed or call["throttled"] or rtt > self.min_rtt * 1.5:
+                    self.limit = max(self.min_limit, self.limit - 1)
+                elif self.inflight >= self.limit and rtt < self.min_rtt * 1.1:
+                    self.limit = min(self.max_limit, self.limit + 1)
+                if not failed and not call["throttled"]:
+                    self.min_rtt = min(self.min_rtt, rtt)
+                self.inflight -= 1
+                self.cond.notify_all()
+
+# asyncio.Condition is bound to its loop, so each event loop gets its own limiters.
+# They are also kept per host: one baseline RTT across nearby and far-away endpoints
+# would read every far region as congested and collapse the limit
+_limiters = weakref.WeakKeyDictionary()
+
+@functools.lru_cache(maxsize=64)
+def _host(url: str) -> str:
+    """Host part of a URL, the key for its limiter"""
+    return urlsplit(url).netloc
+
+def get_limiter(url: str) -> VegasLimiter:
+    """Get or create the outbound request limiter for url's host on the running event loop"""
+    loop = asyncio.get_running_loop()
+    limiters = _limiters.get(loop)
+    if limiters is None:
+        limiters = _limiters[loop] = {}
+    host = _host(url)
+    limiter = limiters.get(host)
+    if limiter is None:
+        limiter = limiters[host] = VegasLimiter()
+    return limiter
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Jito request headers, with the auth header if provided
+_JITO_HEADERS = {**_JSON_HEADERS, **({"Authorization": JITO_AUTH_HEADER} if JITO_AUTH_HEADER else {})}
+
+def _json_body(payload: Dict) -> bytes:
+    """Serialize a request payload to compact JSON bytes"""
+    return fastjson.dumps(payload)
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Parse a JSON response body"""
+    return fastjson.loads(await response.read())
+
+# Submission and RPC requests give up sooner than the shared session's default
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=1, sock_read=4)
+
+async def _warm_up_connection(url: str):
+    try:
+        await get_jito_client().head(url, timeout=2.0)
+    except httpx.HTTPError as e:
+        logger.debug(f"Jito connection warm-up failed for {url}: {e}")
+
+async def _warm_up_connections():
+    """
+    Open pooled connections to every Jito region ahead of the first submission,
+    so the DNS, TCP and TLS setup is not paid by the first swap
+    """
+    await asyncio.gather(*(_warm_up_connection(url) for url in JITO_RPC_URLS))
+
+# ================ HELPER FUNCTIONS ================
+_TTL_CACHE_MAX_ENTRIES = 1024
+
+def ttl_cache(seconds: float, key: Optional[Callable] = None):
+    """
+    Cache the non-empty results of an async function for `seconds`.
+    `key` maps the call arguments to the cache key (defaults to the arguments themselves)
+    """
+    def decorator(func):
+        cache = {}
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            hit = cache.get(cache_key)
+            if hit is not None and time.monotonic() - hit[0] < seconds:
+                return hit[1]
+            
+            value = await func(*args, **kwargs)
+            if value:
+                now = time.monotonic()
+                if len(cache) >= _TTL_CACHE_MAX_ENTRIES:
+                    for stale in [k for k, (ts, _) in list(cache.items()) if now - ts >= seconds]:
+                        cache.pop(stale, None)
+                cache[cache_key] = (now, value)
+            return value
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+async def _sample_tx_per_slot() -> None:
+    """Fold the latest performance samples into the transactions-per-slot EWMA"""
     try:
         # Get recent performance samples from Solana
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            _thread_pool,
-            lambda: solana_client.get_recent_performance_samples(limit=5)
-        )
+        response = await get_rpc_client(Config.RPC).get_recent_performance_samples(limit=5)
         
         if response and hasattr(response, 'value') and response.value:
-            # Average the number of transactions per slot across samples
-            total_tx = 0
-            slots = 0
-            for sample in response.value:
-                total_tx += sample.num_transactions
-                slots += 1
-            
-            avg_tx_per_slot = total_tx / slots if slots > 0 else 0
-            
-            # Determine congestion level based on transactions per slot
-            if avg_tx_per_slot < 1000:
-                level = "low"
-            elif avg_tx_per_slot < 3000:
-                level = "medium"
-            elif avg_tx_per_slot < 5000:
-                level = "high"
-            else:
-                level = "extreme"
-                
-            # Update cache
-            network_status["level"] = level
-            network_status["last_update"] = current_time
-            
-            logger.info(f"Network congestion level: {level} ({avg_tx_per_slot:.0f} tx/slot)")
-            return level
+            # Samples come newest first and overlap the previous poll; fold in only
+            # the ones not seen yet, oldest first
+            last_slot = congestion_estimate["last_sample_slot"]
+            for sample in reversed(response.value):
+                if sample.slot > last_slot and sample.num_slots:
+                    _update_ewma("tx_per_slot", sample.num_transactions / sample.num_slots)
+            congestion_estimate["last_sample_slot"] = max(last_slot, response.value[0].slot)
+            congestion_estimate["sampled_at"] = time.monotonic()
     except Exception as e:
         logger.warning(f"Error getting network congestion: {e}, using default level")
-    
+
+def record_submission_latency(latency: float) -> None:
+    """Feed an accepted submission's round trip (seconds) into the latency EWMA"""
+    now = time.monotonic()
+    congestion_estimate["latency"] = _decayed_latency(now)
+    _update_ewma("latency", latency)
+    congestion_estimate["latency_at"] = now
+
+def _decayed_latency(now: float) -> Optional[float]:
+    """
+    Latency EWMA decayed toward zero by the time since the last submission,
+    so one slow reply does not hold the congestion level up until the next trade
+    """
+    latency = congestion_estimate["latency"]
+    if latency is None:
+        return None
+    return latency * 0.5 ** ((now - congestion_estimate["latency_at"]) / LATENCY_HALF_LIFE_SECONDS)
+
+def _update_ewma(field: str, sample: float) -> None:
+    previous = congestion_estimate[field]
+    congestion_estimate[field] = sample if previous is None else previous + CONGESTION_EWMA_ALPHA * (sample - previous)
+
+async def get_network_congestion_async() -> str:
+    """
+    Determine current network congestion level to adjust tip amount
+    Reads the EWMAs kept warm by the background refresher; never waits on the RPC
+    """
+    return _congestion_level()
+
+def _congestion_level() -> str:
+    """Map the current EWMAs to a congestion level (no I/O)"""
     # Default to medium if we can't determine
-    return "medium"
+    levels = list(TIP_LEVELS)
+    level = levels.index("medium")
+    tx_per_slot = congestion_estimate["tx_per_slot"]
+    if tx_per_slot is not None:
+        level = sum(tx_per_slot >= threshold for threshold in TX_PER_SLOT_THRESHOLDS)
+    
+    # Slow submissions mean the leaders are saturated even if throughput looks calm
+    latency = _decayed_latency(time.monotonic())
+    if latency is not None:
+        level = max(level, sum(latency >= threshold for threshold in LATENCY_THRESHOLDS))
+    
+    return levels[level]
 
 def get_network_congestion() -> str:
-    """Synchronous wrapper for async network congestion function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(get_network_congestion_async())
-    finally:
-        loop.close()
+    """Current network congestion level (reads the cached estimate directly)"""
+    return _congestion_level()
 
-def calculate_tip_amount() -> int:
+async def _fetch_tip_floor() -> None:
     """
-    Calculate the appropriate tip amount based on network congestion and settings
+    Refresh the 75th percentile of recently landed Jito tips, in lamports
+    Paying the median lands only about half the time, so price off the 75th percentile
     """
-    # If user has a custom priority fee set, use that
-    if Config.PRIORITY_FEE_MODE == "custom":
-        return Config.PRIORITY_FEE_LAMPORTS
+    try:
+        session = await get_async_session()
+        async with session.get(JITO_TIP_FLOOR_URL, timeout=_HTTP_TIMEOUT) as response:
+            if response.status != 200:
+                logger.warning(f"Jito tip floor request failed: {response.status}")
+                return
+            result = await _read_json(response)
         
-    # Otherwise determine based on network congestion
-    congestion = get_network_congestion()
-    return TIP_LEVELS.get(congestion, TIP_LEVELS["medium"])
+        p75 = result[0]["landed_tips_75th_percentile"]
+        congestion_estimate["tip_floor"] = int(p75 * 1e9)
+        congestion_estimate["tip_floor_at"] = time.monotonic()
+    except Exception as e:
+        logger.warning(f"Error getting Jito tip floor: {e}")
 
-async def rate_limit_delay(endpoint: str):
+def _current_tip_floor() -> Optional[int]:
+    """Latest landed-tip floor in lamports, or None if it is missing or too old to trust"""
+    if time.monotonic() - congestion_estimate["tip_floor_at"] > TIP_FLOOR_MAX_AGE_SECONDS:
+        return None
+    return congestion_estimate["tip_floor"]
+
+async def get_tip_floor_async() -> Optional[int]:
+    """Latest landed-tip floor in lamports (cached; refreshed in the background)"""
+    return _current_tip_floor()
+
+async def _refresh_estimates_forever():
     """
-    Asynchronous rate limit control with jitter to prevent thundering herd
+    Keep the congestion EWMA and tip floor warm from the background loop,
+    so no swap ever waits on a performance-sample or tip-floor request
     """
-    if endpoint in Config.api_last_call_time:
-        time_since_last_call = time.time() - Config.api_last_call_time[endpoint]
-        
-        if time_since_last_call < Config.RATE_LIMIT_DELAY:
-            # Add jitter (±10%) to avoid all threads waking at the same time
-            jitter = random.uniform(0.9, 1.1)
-            sleep_time = (Config.RATE_LIMIT_DELAY - time_since_last_call) * jitter
-            await asyncio.sleep(sleep_time)
+    while True:
+        if time.monotonic() - congestion_estimate["sampled_at"] > CONGESTION_REFRESH_SECONDS:
+            await _sample_tx_per_slot()
+        await _fetch_tip_floor()
+        await asyncio.sleep(TIP_FLOOR_REFRESH_SECONDS)
+
+async def calculate_tip_amount_async() -> int:
+    """
+    Calculate the appropriate tip amount based on network congestion and settings
+    """
+    return calculate_tip_amount()
+
+def _tip_for(congestion: str, tip_floor: Optional[int]) -> int:
+    """Tip in lamports for a congestion level and landed-tip floor"""
+    if tip_floor is None:
+        return TIP_LEVELS.get(congestion, TIP_LEVELS["medium"])
     
-    # Update last call time
-    Config.api_last_call_time[endpoint] = time.time()
+    tip = int(tip_floor * TIP_URGENCY.get(congestion, 1.0))
+    return max(TIP_LEVELS["low"], min(tip, TIP_LEVELS["extreme"]))
 
-async def handle_rate_limit_async(retry_count: int, max_retries: int, error: Optional[str] = None) -> Tuple[bool, int]:
+def calculate_tip_amount() -> int:
     """
-    Handle rate limiting with exponential backoff
-    Returns: (should_retry, new_retry_count)
+    Calculate the tip from the cached estimates; a few dict reads, no I/O
     """
-    if retry_count >= max_retries:
-        logger.error(f"Max rate limit retries exceeded: {error}")
-        return False, retry_count
-        
-    # Exponential backoff with jitter
-    backoff = min(2 ** retry_count + (random.random()), 10)
-    logger.warning(f"Rate limit hit! Waiting {backoff:.2f}s before retry {retry_count+1}/{max_retries}")
-    await asyncio.sleep(backoff)
+    # If user has a custom priority fee set, use that
+    if Config.PRIORITY_FEE_MODE == "custom":
+        return Config.PRIORITY_FEE_LAMPORTS
     
-    return True, retry_count + 1
+    # Otherwise price off recent landed tips, scaled by network congestion
+    return _tip_for(_congestion_level(), _current_tip_floor())
 
-def handle_rate_limit(retry_count: int, max_retries: int, error: Optional[str] = None) -> Tuple[bool, int]:
-    """Synchronous wrapper for async rate limit handler"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(handle_rate_limit_async(retry_count, max_retries, error))
-    finally:
-        loop.close()
+class RetryableError(Exception):
+    """An attempt failed in a way that is worth retrying (e.g. HTTP 429)"""
 
-# ================ RAYDIUM INTEGRATION FOR QUOTES ================
-async def get_quote_async(input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50, retry_count: int = 0) -> Optional[Dict]:
+def _is_throttled(e: Exception) -> bool:
+    """Whether an error is an HTTP 429 response"""
+    return isinstance(e, aiohttp.ClientResponseError) and e.status == 429
+
+def _is_retryable(e: Exception) -> bool:
+    """Rate limits, timeouts and dropped connections are worth retrying; anything else is not"""
+    return (isinstance(e, (RetryableError, asyncio.TimeoutError, aiohttp.ServerDisconnectedError,
+                           httpx.TimeoutException, httpx.RemoteProtocolError))
+            or _is_throttled(e))
+
+async def _with_retry(coro_factory: Callable, max_retries: Optional[int] = None,
+                      cap: float = 10.0, base: float = 0.2) -> Any:
     """
-    Get a price quote from Raydium with rate limit handling
+    Await coro_factory() until it succeeds, retrying retryable errors with
+    decorrelated-jitter backoff so concurrent callers don't retry in lockstep
     """
-    await rate_limit_delay("raydium_quote")
+    max_retries = Config.MAX_RATE_LIMIT_RETRIES if max_retries is None else max_retries
+    delay = base
+    for attempt in range(max_retries + 1):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                raise
+            delay = min(cap, random.uniform(base, delay * 3))
+            logger.warning(f"Rate limit hit! Waiting {delay:.2f}s before retry {attempt+1}/{max_retries}")
+            await asyncio.sleep(delay)
+
+# ================ RAYDIUM INTEGRATION FOR QUOTES ================
+def _quote_cache_key(input_mint: str, output_mint: str, amount: int, retry_count: int = 0) -> tuple:
+    """Cache key for a quote: the exact pair and amount (amountOut scales with the amount)"""
+    return (input_mint, output_mint, amount)
+
+@ttl_cache(seconds=1.5, key=_quote_cache_key)
+async def _fetch_quote(input_mint: str, output_mint: str, amount: int, retry_count: int = 0) -> Optional[Dict]:
+    """Fetch a Raydium quote, retrying rate limits and transient failures"""
+    async def quote_once() -> Dict:
+        await Config.api_buckets[Endpoint.RAYDIUM_QUOTE].acquire()
+        async with get_limiter(RAYDIUM_API_BASE).use() as call:
+            try:
+                quote = await get_quote_raydium(input_mint, output_mint, amount)
+            except Exception as e:
+                call["throttled"] = _is_throttled(e)
+                raise
+        if not quote:
+            # get_quote_raydium logs and swallows transient errors, so an empty quote is retried too
+            raise RetryableError("Raydium quote failed")
+        return quote
     
     try:
-        # Use Raydium for quotes
-        quote = await get_quote_raydium(input_mint, output_mint, amount)
-        
-        if quote:
-            # Convert slippage from bps to percentage if needed
-            quote['slippageBps'] = slippage_bps
-            return quote
-            
-        # Handle retries if quote failed
-        if retry_count < Config.MAX_RATE_LIMIT_RETRIES:
-            should_retry, new_retry = await handle_rate_limit_async(
-                retry_count, 
-                Config.MAX_RATE_LIMIT_RETRIES, 
-                "Raydium quote failed"
-            )
-            if should_retry:
-                return await get_quote_async(input_mint, output_mint, amount, slippage_bps, new_retry)
+        return await _with_retry(quote_once, max_retries=max(0, Config.MAX_RATE_LIMIT_RETRIES - retry_count))
     except Exception as e:
         logger.error(f"Error getting quote: {e}")
-        
-        # Check if it's worth retrying
-        if retry_count < Config.MAX_RATE_LIMIT_RETRIES and ("429" in str(e) or "timeout" in str(e).lower()):
-            should_retry, new_retry = await handle_rate_limit_async(
-                retry_count, 
-                Config.MAX_RATE_LIMIT_RETRIES,
-                str(e)
-            )
-            if should_retry:
-                return await get_quote_async(input_mint, output_mint, amount, slippage_bps, new_retry)
+        return None
+
+async def get_quote_async(input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50, retry_count: int = 0) -> Optional[Dict]:
+    """
+    Get a price quote from Raydium with rate limit handling
+    """
+    quote = await _fetch_quote(input_mint, output_mint, amount, retry_count)
+    if quote is None:
+        return None
     
-    return None
+    # Return a copy so callers never modify the cached quote
+    return {**quote, 'slippageBps': slippage_bps}
 
 def get_quote(input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50, retry_count: int = 0) -> Optional[Dict]:
     """Synchronous wrapper for async quote function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(get_quote_async(input_mint, output_mint, amount, slippage_bps, retry_count))
-    finally:
-        loop.close()
+    return run_sync(get_quote_async(input_mint, output_mint, amount, slippage_bps, retry_count))
 
 # ================ JITO TRANSACTION SUBMISSION ================
-async def prepare_jito_transaction(base64_tx: str) -> Optional[VersionedTransaction]:
+@functools.lru_cache(maxsize=128)
+def _decode_transaction(base64_tx: str) -> VersionedTransaction:
+    """Decode a base64 transaction; retries of the same swap reuse the decoded object"""
+    return VersionedTransaction.from_bytes(a2b_base64(base64_tx))
+
+def prepare_jito_transaction(base64_tx: str) -> Optional[VersionedTransaction]:
     """
     Prepare a Jito-optimized transaction from base64 encoded transaction
     - Adds tip instruction if needed
@@ -239,7 +460,7 @@ async def prepare_jito_transaction(base64_tx: str) -> Optional[VersionedTransact
     """
     try:
         # Decode the transaction
-        raw_tx = VersionedTransaction.from_bytes(base64.b64decode(base64_tx))
+        raw_tx = _decode_transaction(base64_tx)
         
         # TODO: For full implementation, add Jito tip instruction here
         # This would require modifying the transaction to include the tip
@@ -250,139 +471,218 @@ async def prepare_jito_transaction(base64_tx: str) -> Optional[VersionedTransact
         logger.error(f"Error preparing Jito transaction: {e}")
         return None
 
+def _sign_sync(tx: VersionedTransaction) -> VersionedTransaction:
+    """Sign a transaction with the payer keypair"""
+    signature = payer_keypair.sign_message(to_bytes_versioned(tx.message))
+    return VersionedTransaction.populate(tx.message, [signature])
+
 async def sign_transaction_async(tx: VersionedTransaction) -> Optional[VersionedTransaction]:
     """
     Sign a transaction with the payer keypair asynchronously
+    Signing runs in a worker thread so the CPU work does not stall the event loop
+    """
+    try:
+        return await asyncio.to_thread(_sign_sync, tx)
+    except Exception as e:
+        logger.error(f"Error signing transaction: {e}")
+        return None
+
+def _sign_and_serialize_sync(tx: VersionedTransaction) -> Tuple[VersionedTransaction, bytes]:
+    """Sign a transaction and serialize the result in one pass"""
+    signed_tx = _sign_sync(tx)
+    return signed_tx, bytes(signed_tx)
+
+async def sign_and_serialize_async(tx: VersionedTransaction) -> Optional[Tuple[VersionedTransaction, bytes]]:
+    """
+    Sign a transaction and return it with its serialized bytes, so the
+    submission paths can share the bytes instead of re-serializing
     """
     try:
-        signature = payer_keypair.sign_message(to_bytes_versioned(tx.message))
-        signed_tx = VersionedTransaction.populate(tx.message, [signature])
-        return signed_tx
+        return await asyncio.to_thread(_sign_and_serialize_sync, tx)
     except Exception as e:
         logger.error(f"Error signing transaction: {e}")
         return None
 
 def sign_transaction(tx: VersionedTransaction) -> Optional[VersionedTransaction]:
     """Synchronous wrapper for async signing function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(sign_transaction_async(tx))
-    finally:
-        loop.close()
+    return run_sync(sign_transaction_async(tx))
 
 # ================ JITO TRANSACTION SUBMISSION ================
-async def submit_to_jito_async(signed_tx: VersionedTransaction, tip_amount: int = 0) -> Optional[str]:
+def _b64_tx(raw_tx: bytes) -> str:
+    """Base64-encode a serialized transaction for the JSON APIs"""
+    return b2a_base64(raw_tx, newline=False).decode('ascii')
+
+def _as_raw_tx(signed_tx: Union[VersionedTransaction, bytes]) -> bytes:
+    """Serialized transaction bytes, reusing them if the caller already serialized"""
+    return signed_tx if isinstance(signed_tx, bytes) else bytes(signed_tx)
+
+def _as_b64_tx(signed_tx: Union[VersionedTransaction, bytes, str]) -> str:
+    """Base64 transaction, reusing any serialization the caller already did"""
+    return signed_tx if isinstance(signed_tx, str) else _b64_tx(_as_raw_tx(signed_tx))
+
+# Static part of the Jito submission body, serialized once
+_JITO_BODY_PREFIX = b'{"skipPreflight":false,"tipMicroLamports":'
+
+def _jito_body(b64_tx: str, tip_amount: int) -> bytes:
+    """
+    JSON body for a Jito submission, assembled from bytes
+    (base64 never needs JSON escaping, so the transaction can be spliced in as is)
+    """
+    # Convert lamports to micro-lamports for Jito
+    return b''.join((
+        _JITO_BODY_PREFIX, str(tip_amount * 1000).encode('ascii'),
+        b',"transaction":"', b64_tx.encode('ascii'), b'"}'
+    ))
+
+async def _post_to_jito(client: httpx.AsyncClient, url: str, body: bytes) -> httpx.Response:
+    """POST one submission to a Jito endpoint, raising RetryableError on HTTP 429"""
+    start_time = time.time()
+    
+    async with get_limiter(url).use() as call:
+        response = await client.post(url, headers=_JITO_HEADERS, content=body)
+        call["throttled"] = response.status_code == 429
+    
+    request_time = time.time() - start_time
+    logger.info(f"Jito submission time: {request_time*1000:.2f}ms")
+    
+    if response.status_code == 429:
+        raise RetryableError(f"Jito rate limited submission to {url}")
+    return response
+
+async def submit_to_jito_async(signed_tx: Union[VersionedTransaction, bytes, str], tip_amount: int = 0,
+                               url: str = JITO_RPC_URL, record_latency: bool = True) -> Optional[str]:
     """
     Submit a signed transaction to Jito's MEV-protected endpoint asynchronously
+    Accepts the transaction itself, its serialized bytes or its base64 encoding
     """
     try:
-        session = await get_async_session()
+        client = get_jito_client()
+        start_time = time.monotonic()
         
         # Serialize the transaction
-        serialized_tx = base64.b64encode(bytes(signed_tx)).decode('utf-8')
-        
-        # Prepare the API payload
-        payload = {
-            "transaction": serialized_tx,
-            "skipPreflight": False,
-            "tipMicroLamports": tip_amount * 1000  # Convert lamports to micro-lamports for Jito
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
+        serialized_tx = _as_b64_tx(signed_tx)
         
-        # Add auth header if provided
-        if JITO_AUTH_HEADER:
-            headers["Authorization"] = JITO_AUTH_HEADER
+        # Send to Jito API, backing off if it rate limits us
+        body = _jito_body(serialized_tx, tip_amount)
+        response = await _with_retry(lambda: _post_to_jito(client, url, body))
         
-        # Send to Jito API
-        start_time = time.time()
-        
-        async with session.post(
-            JITO_RPC_URL,
-            headers=headers,
-            json=payload,
-            timeout=5
-        ) as response:
-            request_time = time.time() - start_time
-            logger.info(f"Jito submission time: {request_time*1000:.2f}ms")
-            
-            if response.status == 200:
-                result = await response.json()
-                if 'result' in result:
-                    tx_sig = result['result']
-                    logger.info(f"Jito accepted transaction: {tx_sig}")
-                    return tx_sig
-                else:
-                    logger.error(f"Jito error: {result.get('error', 'Unknown error')}")
+        if response.status_code == 200:
+            result = fastjson.loads(response.content)
+            if 'result' in result:
+                tx_sig = result['result']
+                if record_latency:
+                    record_submission_latency(time.monotonic() - start_time)
+                logger.info(f"Jito accepted transaction: {tx_sig}")
+                return tx_sig
             else:
-                logger.error(f"Jito submission failed: {response.status} - {await response.text()}")
+                logger.error(f"Jito error: {result.get('error', 'Unknown error')}")
+        else:
+            logger.error(f"Jito submission failed: {response.status_code} - {response.text}")
         
     except Exception as e:
         logger.error(f"Error submitting to Jito: {e}")
     
     return None
 
-def submit_to_jito(signed_tx: VersionedTransaction, tip_amount: int = 0) -> Optional[str]:
+def submit_to_jito(signed_tx: Union[VersionedTransaction, bytes, str], tip_amount: int = 0) -> Optional[str]:
     """Synchronous wrapper for async Jito submission function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(submit_to_jito_async(signed_tx, tip_amount))
-    finally:
-        loop.close()
+    return run_sync(submit_to_jito_async(signed_tx, tip_amount))
 
 # ================ PARALLEL TRANSACTION SUBMISSION ================
-async def submit_transaction_parallel_async(signed_tx: VersionedTransaction, tip_amount: int) -> Optional[str]:
+async def submit_to_main_rpc_async(signed_tx: Union[VersionedTransaction, bytes]) -> Optional[str]:
+    """Submit a signed transaction (or its serialized bytes) to the main Solana RPC with the async client"""
+    response = await get_rpc_client(Config.RPC).send_raw_transaction(
+        txn=_as_raw_tx(signed_tx),
+        opts=TxOpts(skip_preflight=False, preflight_commitment=Config.DEFAULT_COMMITMENT)
+    )
+    return response.value
+
+async def submit_to_rpc_async(signed_tx: Union[VersionedTransaction, bytes, str], rpc_url: str) -> Optional[str]:
+    """
+    Submit a signed transaction to a Solana JSON-RPC endpoint asynchronously
+    Accepts the transaction itself, its serialized bytes or its base64 encoding
+    """
+    try:
+        session = await get_async_session()
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "sendTransaction",
+            "params": [
+                _as_b64_tx(signed_tx),
+                {"encoding": "base64", "skipPreflight": False, "preflightCommitment": Config.DEFAULT_COMMITMENT}
+            ]
+        }
+        
+        async with get_limiter(rpc_url).use() as call, session.post(rpc_url, data=_json_body(payload), headers=_JSON_HEADERS, timeout=_HTTP_TIMEOUT) as response:
+            call["throttled"] = response.status == 429
+            result = await _read_json(response)
+            if 'result' in result:
+                return result['result']
+            logger.error(f"RPC {rpc_url} rejected transaction: {result.get('error', 'Unknown error')}")
+    except Exception as e:
+        logger.error(f"Error submitting to RPC {rpc_url}: {e}")
+    
+    return None
+
+async def submit_transaction_parallel_async(signed_tx: Union[VersionedTransaction, bytes], tip_amount: int) -> Optional[str]:
     """
-    Submit the transaction in parallel to both Jito and regular Solana RPC
-    to maximize chances of fast inclusion
+    Submit the transaction in parallel to every Jito region, the main Solana RPC
+    and the backup RPC, returning the first signature accepted
     """
-    tx_sig = None
+    # Serialize once and share the encodings across every endpoint
+    raw_tx = _as_raw_tx(signed_tx)
+    b64_tx = _b64_tx(raw_tx)
     
-    # Create tasks for both submission methods
-    jito_task = asyncio.create_task(submit_to_jito_async(signed_tx, tip_amount))
+    # One task per Jito region. Only the first region to accept feeds the latency
+    # estimate: the far regions' replies measure distance, not congestion
+    start_time = time.monotonic()
+    latency_recorded = False
     
-    # Regular RPC submission in a thread to avoid blocking
-    loop = asyncio.get_event_loop()
-    regular_task = asyncio.create_task(loop.run_in_executor(
-        _thread_pool,
-        lambda: solana_client.send_raw_transaction(
-            txn=bytes(signed_tx),
-            opts=TxOpts(skip_preflight=False, preflight_commitment=Config.DEFAULT_COMMITMENT)
-        ).value
-    ))
+    def record_first_acceptance(task: asyncio.Task) -> None:
+        nonlocal latency_recorded
+        if not latency_recorded and not task.cancelled() and task.exception() is None and task.result():
+            latency_recorded = True
+            record_submission_latency(time.monotonic() - start_time)
     
-    # Wait for first successful result
-    done, pending = await asyncio.wait(
-        [jito_task, regular_task],
-        return_when=asyncio.FIRST_COMPLETED
-    )
+    tasks = [
+        asyncio.create_task(submit_to_jito_async(b64_tx, tip_amount, url=url, record_latency=False))
+        for url in JITO_RPC_URLS
+    ]
+    for task in tasks:
+        task.add_done_callback(record_first_acceptance)
     
-    # Process completed task
-    for task in done:
-        try:
-            result = task.result()
-            if result:
-                tx_sig = result
-                logger.info(f"Transaction submitted successfully: {tx_sig}")
-                break
-        except Exception as e:
-            logger.error(f"Error in transaction submission: {e}")
+    # Regular RPC submission
+    tasks.append(asyncio.create_task(submit_to_main_rpc_async(raw_tx)))
     
-    # Cancel remaining tasks
-    for task in pending:
-        task.cancel()
+    # Backup RPC over HTTP, if it is a separate endpoint
+    if Config.BACKUP_RPC and Config.BACKUP_RPC != Config.RPC:
+        tasks.append(asyncio.create_task(submit_to_rpc_async(b64_tx, Config.BACKUP_RPC)))
     
-    return tx_sig
-
-def submit_transaction_parallel(signed_tx: VersionedTransaction, tip_amount: int) -> Optional[str]:
-    """Synchronous wrapper for async parallel submission function"""
-    loop = asyncio.new_event_loop()
+    # Take results in completion order until one submission succeeds or all have failed
     try:
-        return loop.run_until_complete(submit_transaction_parallel_async(signed_tx, tip_amount))
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                result = await next_done
+            except Exception as e:
+                logger.error(f"Error in transaction submission: {e}")
+                continue
+            
+            if result:
+                logger.info(f"Transaction submitted successfully: {result}")
+                return result
     finally:
-        loop.close()
+        # Cancel the losers and reap them so their errors are not reported as never retrieved
+        losers = [task for task in tasks if not task.done()]
+        for task in losers:
+            task.cancel()
+        await asyncio.gather(*losers, return_exceptions=True)
+    
+    return None
+
+def submit_transaction_parallel(signed_tx: Union[VersionedTransaction, bytes], tip_amount: int) -> Optional[str]:
+    """Synchronous wrapper for async parallel submission function"""
+    return run_sync(submit_transaction_parallel_async(signed_tx, tip_amount))
 
 # ================ MAIN SWAP EXECUTION FUNCTION ================
 async def execute_swap_async(input_mint: str, output_mint: str, amount_in: int, slippage_percent: float = 1, 
@@ -393,7 +693,7 @@ async def execute_swap_async(input_mint: str, output_mint: str, amount_in: int,
     max_retries = max_retries or Config.MAX_SWAP_RETRIES
     
     # Calculate tip amount based on network conditions
-    tip_amount = calculate_tip_amount()
+    tip_amount = await calculate_tip_amount_async()
     logger.info(f"Using Jito tip: {tip_amount} lamports ({tip_amount/1e9:.9f} SOL)")
     
     # Use Raydium directly with Jito enabled
@@ -409,13 +709,10 @@ async def execute_swap_async(input_mint: str, output_mint: str, amount_in: int,
 def execute_swap(input_mint: str, output_mint: str, amount_in: int, slippage_percent: float = 1, 
                retry_count: int = 0, max_retries: Optional[int] = None) -> Tuple[bool, Optional[float]]:
     """Synchronous wrapper for async swap execution function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(execute_swap_async(input_mint, output_mint, amount_in, slippage_percent, retry_count, max_retries))
-    finally:
-        loop.close()
+    return run_sync(execute_swap_async(input_mint, output_mint, amount_in, slippage_percent, retry_count, max_retries))
 
 # ================ ADDITIONAL UTILITIES ================
+@ttl_cache(seconds=60)
 async def get_jito_tip_accounts_async() -> List[str]:
     """
     Get the current valid Jito tip accounts asynchronously
@@ -431,17 +728,16 @@ async def get_jito_tip_accounts_async() -> List[str]:
 
 def get_jito_tip_accounts() -> List[str]:
     """Synchronous wrapper for async tip accounts function"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(get_jito_tip_accounts_async())
-    finally:
-        loop.close()
+    return run_sync(get_jito_tip_accounts_async())
 
 # Clean up async resources on exit
 def cleanup_async_resources():
     """Close async resources when program exits"""
-    if _async_session is not None and not _async_session.closed:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(_async_session.close())
-        loop.close()
\ No newline at end of file
+    _estimates_refresher.cancel()
+    shutdown()
+
+# Prime the background loop's connection pool without blocking import
+asyncio.run_coroutine_threadsafe(_warm_up_connections(), bg_loop)
+
+# Keep congestion and tip-floor estimates fresh off the swap path
+_estimates_refresher = asyncio.run_coroutine_threadsafe(_refresh_estimates_forever(), bg_loop)
@@ -19,11 +19,19 @@ import signal
 import sys
 import threading
 import base64
-import requests
+import functools
+import inspect
+import sqlite3
+import aiohttp
 import websockets
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Rich console imports for beautiful CLI
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
@@ -56,119 +64,239 @@ except ImportError:
 
 # Import other modules only after activation is confirmed
 from config import Config, logger, setup_signal_handlers
+from fastjson import dumps
 from solanaa import initialize_clients, initialize_wallet, get_sol_balance, get_token_balance_async
 from telegram import initialize_telegram, fetch_channels, setup_telegram_handler, get_active_chats, add_new_chats, remove_chats
 from trading import start_price_tracking, show_active_tracking
 from config import change_buy_amount, change_profit_target, change_stop_loss
 from config import change_trailing_stop, change_exit_strategy, change_priority_fee_settings
-from config import configure_all_parameters, stop_event
+from config import configure_all_parameters, stop_event, request_stop
 
 # Import Raydium module instead of Jupiter
 import raydium_v4
 
 # Import database module
-from database import db
+from database import get_db
 
 # Import paper trading module
 from paper_trading import PaperConfig, initialize_paper_trading
-from paper_trading import measure_rpc_delay, measure_rpc_delay_sync
+from paper_trading import measure_rpc_delay, time_rpc_health
 from paper_trading import paper_buy_token, paper_buy_token_async
 from paper_trading import paper_sell_token, paper_sell_token_async
 from paper_trading import show_paper_portfolio
 
+class BufferedConsole(Console):
+    """Console that can queue renderables and emit them to the terminal in a single print"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._line_buffer = []
+    
+    def write(self, *renderables):
+        """Queue renderables (markup strings, panels, tables) for the next flush"""
+        self._line_buffer.extend(renderables)
+    
+    def flush(self):
+        """Print everything queued by write() as one group"""
+        if self._line_buffer:
+            renderables, self._line_buffer = self._line_buffer, []
+            super().print(Group(*renderables))
+    
+    def print(self, *objects, **kwargs):
+        # Anything queued goes out first so output stays in order
+        self.flush()
+        super().print(*objects, **kwargs)
+
 # Initialize rich console for beautiful output
-console = Console()
+console = BufferedConsole()
 
 # Global variables for Raydium integration
 raydium_initialized = False
 
 # ================ HEARTBEAT & MONITORING FUNCTIONS ================
-async def heartbeat_monitor():
-    """Monitor bot health and send alerts"""
-    last_rpc_check = datetime.now()
-    last_db_stats = datetime.now()
+RPC_HEALTH_INTERVAL = 300          # 5 minutes
+DB_STATS_INTERVAL = 3600           # 1 hour
+TELEGRAM_SILENCE_LIMIT = 1800      # 30 minutes
+TELEGRAM_RECHECK_INTERVAL = 60     # while silent
+HEARTBEAT_BACKOFF_START = 60       # first retry after a failed check
+HEARTBEAT_BACKOFF_MAX = 900        # cap while a check keeps failing
+RPC_HEALTH_TIMEOUT = 8             # seconds allowed per check before it counts as failed
+DB_STATS_TIMEOUT = 2
+TELEGRAM_RECONNECT_TIMEOUT = 10
+
+# Errors a health check can expect during a network or RPC outage
+_OUTAGE_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+# Pending heartbeat timers and the checks they have started, cancelled by stop_heartbeat
+_heartbeat_handles = set()
+_heartbeat_tasks = set()
+
+# Consecutive failures per check name, for backoff
+_heartbeat_failures = {}
+
+def _schedule_heartbeat(delay, check):
+    """Start check() as a task after delay seconds, unless the bot is stopping"""
+    loop = asyncio.get_running_loop()
     
-    while not stop_event.is_set():
-        try:
-            current_time = datetime.now()
-            
-            # Check if bot is still receiving messages
-            if (current_time - Config.last_telegram_message_time).seconds > 1800:  # 30 minutes
-                logger.warning("No Telegram messages for 30 minutes! Checking connection...")
-                
-                # Check if Telegram is still connected
-                global telegram_client
-                if telegram_client and not telegram_client.is_connected():
-                    logger.warning("Telegram disconnected, attempting reconnection...")
-                    try:
-                        await telegram_client.connect()
-                        logger.info("Telegram reconnected successfully")
-                    except Exception as e:
-                        logger.error(f"Failed to reconnect Telegram: {e}")
-            
-            # Check RPC health every 5 minutes
-            if (current_time - last_rpc_check).seconds > 300:
-                last_rpc_check = current_time
-                rpc_health = await check_rpc_health()
-                
-                if not rpc_health['primary']:
-                    logger.warning("Primary RPC unhealthy, switching to backup")
-                    Config.RPC, Config.BACKUP_RPC = Config.BACKUP_RPC, Config.RPC
-                    Config.save_to_env()
-                    
-                    # Reinitialize clients with new RPC
-                    from solanaa import initialize_clients
-                    initialize_clients(Config.RPC)
-            
-            # Log database statistics every hour
-            if (current_time - last_db_stats).seconds > 3600:
-                last_db_stats = current_time
-                stats = db.get_trade_statistics()
-                if stats['closed_trades'] > 0:
-                    logger.info(f"Hourly Stats - Trades: {stats['closed_trades']}, Win Rate: {stats['win_rate']:.1f}%, Total P/L: {stats['total_profit_loss']:.6f} SOL")
-            
-            # Check WebSocket connection if enabled
-            if Config.ENABLE_WEBSOCKET and not Config.websocket_connected:
-                logger.warning("WebSocket disconnected, will reconnect on next trade")
+    def fire():
+        _heartbeat_handles.discard(handle)
+        if stop_event.is_set():
+            return
+        task = loop.create_task(check())
+        _heartbeat_tasks.add(task)
+        task.add_done_callback(_heartbeat_tasks.discard)
+    
+    handle = loop.call_later(delay, fire)
+    _heartbeat_handles.add(handle)
+
+def _next_heartbeat_delay(name, interval, failed):
+    """Delay before a check runs again: its interval after a success, exponential backoff after failures"""
+    if not failed:
+        _heartbeat_failures.pop(name, None)
+        return interval
+    failures = _heartbeat_failures[name] = _heartbeat_failures.get(name, 0) + 1
+    return min(HEARTBEAT_BACKOFF_START * 2 ** (failures - 1), HEARTBEAT_BACKOFF_MAX)
+
+async def _telegram_liveness_task(telegram_client):
+    """Reconnect Telegram if no messages have arrived for TELEGRAM_SILENCE_LIMIT seconds"""
+    interval = TELEGRAM_RECHECK_INTERVAL
+    failed = False
+    try:
+        silent_for = time.monotonic() - Config.last_telegram_message_time
+        if silent_for > TELEGRAM_SILENCE_LIMIT:
+            logger.warning("No Telegram messages for 30 minutes! Checking connection...")
             
-            # Sleep for 60 seconds
-            await asyncio.sleep(60)
+            # Check if Telegram is still connected
+            if telegram_client and not telegram_client.is_connected():
+                logger.warning("Telegram disconnected, attempting reconnection...")
+                await asyncio.wait_for(telegram_client.connect(), TELEGRAM_RECONNECT_TIMEOUT)
+                logger.info("Telegram reconnected successfully")
+        else:
+            # Sleep until the silence limit could next be reached
+            interval = TELEGRAM_SILENCE_LIMIT - silent_for
+    except asyncio.TimeoutError:
+        failed = True
+        logger.debug(f"Telegram reconnect timed out after {TELEGRAM_RECONNECT_TIMEOUT}s")
+    except _OUTAGE_ERRORS as e:
+        failed = True
+        logger.error(f"Failed to reconnect Telegram: {e}")
+    except Exception as e:
+        failed = True
+        logger.error(f"Error in Telegram liveness check: {e}")
+    _schedule_heartbeat(
+        _next_heartbeat_delay("telegram", interval, failed),
+        functools.partial(_telegram_liveness_task, telegram_client)
+    )
+
+async def _rpc_health_task():
+    """Switch to the backup RPC if the primary is unhealthy"""
+    failed = False
+    try:
+        rpc_health = await asyncio.wait_for(check_rpc_health(), RPC_HEALTH_TIMEOUT)
+        
+        if not rpc_health['primary'] and not rpc_health['backup']:
+            # Both down looks like our own connectivity; retry sooner instead of swapping
+            failed = True
+            logger.warning("Primary and backup RPC both unhealthy, retrying with backoff")
+        elif not rpc_health['primary']:
+            logger.warning("Primary RPC unhealthy, switching to backup")
+            # Runtime failover only; .env keeps the configured primary
+            Config.RPC, Config.BACKUP_RPC = Config.BACKUP_RPC, Config.RPC
+            Config.rpc_failed_over = not Config.rpc_failed_over
             
-        except Exception as e:
-            logger.error(f"Error in heartbeat monitor: {e}")
-            await asyncio.sleep(60)
+            # Reinitialize clients with new RPC
+            from solanaa import initialize_clients
+            initialize_clients(Config.RPC)
+        
+        # Check WebSocket connection if enabled
+        if Config.ENABLE_WEBSOCKET and not Config.websocket_connected:
+            logger.warning("WebSocket disconnected, will reconnect on next trade")
+    except asyncio.TimeoutError:
+        failed = True
+        logger.debug(f"RPC health check timed out after {RPC_HEALTH_TIMEOUT}s")
+    except _OUTAGE_ERRORS as e:
+        failed = True
+        logger.warning(f"RPC health check failed: {e}")
+    except Exception as e:
+        failed = True
+        logger.error(f"Error in RPC health check: {e}")
+    _schedule_heartbeat(_next_heartbeat_delay("rpc", RPC_HEALTH_INTERVAL, failed), _rpc_health_task)
 
-async def check_rpc_health() -> dict:
-    """Check health of RPC endpoints"""
-    health = {"primary": False, "backup": False}
-    
+async def _db_stats_task():
+    """Log trade statistics from the database"""
+    failed = False
     try:
-        # Test primary RPC
-        start = time.time()
-        response = requests.post(
-            Config.RPC,
-            json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
-            timeout=5
+        # SQLite can block on a lock, so query off the event loop
+        stats = await asyncio.wait_for(asyncio.to_thread(get_db().get_trade_statistics), DB_STATS_TIMEOUT)
+        if stats['closed_trades'] > 0:
+            logger.info(f"Hourly Stats - Trades: {stats['closed_trades']}, Win Rate: {stats['win_rate']:.1f}%, Total P/L: {stats['total_profit_loss']:.6f} SOL")
+    except asyncio.TimeoutError:
+        failed = True
+        logger.debug(f"Database statistics query timed out after {DB_STATS_TIMEOUT}s")
+    except sqlite3.Error as e:
+        failed = True
+        logger.error(f"Database error logging statistics: {e}")
+    except Exception as e:
+        failed = True
+        logger.error(f"Error logging database statistics: {e}")
+    _schedule_heartbeat(_next_heartbeat_delay("db_stats", DB_STATS_INTERVAL, failed), _db_stats_task)
+
+def heartbeat_monitor(telegram_client):
+    """Schedule the bot health checks on the running event loop"""
+    _schedule_heartbeat(0, functools.partial(_telegram_liveness_task, telegram_client))
+    _schedule_heartbeat(RPC_HEALTH_INTERVAL, _rpc_health_task)
+    _schedule_heartbeat(DB_STATS_INTERVAL, _db_stats_task)
+
+async def stop_heartbeat():
+    """Cancel pending health check timers and wait for running checks to finish cancelling"""
+    for handle in _heartbeat_handles:
+        handle.cancel()
+    _heartbeat_handles.clear()
+    
+    tasks = list(_heartbeat_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+# Shared HTTP session for health probes, so repeat checks reuse their TCP/TLS connections
+_http_session = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get or create the shared HTTP session for health probes"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, enable_cleanup_closed=True)
         )
-        if response.status_code == 200 and (time.time() - start) < 2:
-            health["primary"] = True
-    except:
-        pass
-    
+    return _http_session
+
+# getHealth request body, serialized once
+_HEALTH_BODY = dumps({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+async def _probe_rpc(url: str) -> bool:
+    """Whether an RPC endpoint answers getHealth with 200 in under 2 seconds"""
+    start = time.monotonic()
     try:
-        # Test backup RPC
-        start = time.time()
-        response = requests.post(
-            Config.BACKUP_RPC,
-            json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
-            timeout=5
-        )
-        if response.status_code == 200 and (time.time() - start) < 2:
-            health["backup"] = True
-    except:
-        pass
-    
-    return health
+        async with get_http_session().post(
+            url,
+            data=_HEALTH_BODY,
+            headers=_JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=2)
+        ) as response:
+            return response.status == 200 and (time.monotonic() - start) < 2
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+        # Timeouts, connection errors and malformed URLs count as unhealthy
+        logger.debug(f"RPC probe failed for {url}: {e}")
+        return False
+
+async def check_rpc_health() -> dict:
+    """Check health of RPC endpoints (both probed concurrently)"""
+    primary, backup = await asyncio.gather(
+        _probe_rpc(Config.RPC),
+        _probe_rpc(Config.BACKUP_RPC)
+    )
+    return {"primary": primary, "backup": backup}
 
 # ================ RAYDIUM INITIALIZATION ================
 def initialize_raydium_module(solana_client, payer_keypair):
@@ -190,127 +318,242 @@ def initialize_raydium_module(solana_client, payer_keypair):
     logger.info("Raydium V4 integration initialized successfully")
 
 # ================ UI HELPER FUNCTIONS ================
+@functools.cache
+def _header_text(title, char, style, width=80):
+    """Build the header block for print_header once per title/char/style"""
+    rule = char * width
+    return Text(f"\n{rule}\n{title.center(width)}\n{rule}", style=style)
+
 def print_header(title, char="=", style="bold blue"):
     """Print a nice formatted header with title"""
-    width = 80
-    console.print(f"\n[{style}]{char * width}[/{style}]")
-    console.print(f"[{style}]{title.center(width)}[/{style}]")
-    console.print(f"[{style}]{char * width}[/{style}]")
+    console.print(_header_text(title, char, style))
+
+# Pre-parsed markup for the settings table, so repeat renders skip Rich's markup parser
+_EN = Text.from_markup("[green]Enabled[/]")
+_DIS = Text.from_markup("[red]Disabled[/]")
+_YES = Text.from_markup("[green]Yes[/]")
+_NO = Text.from_markup("[red]No[/]")
+_SWAP_ENGINE = Text.from_markup("[bold magenta]Raydium V4 CLMM[/] (Direct AMM)")
+_SECTIONS = {
+    name: Text.from_markup(f"[bold]{name}[/]")
+    for name in (
+        "Trading Settings", "Paper Trading Settings", "Exit Strategy Settings", "Safety Settings",
+        "Paper Exit Strategy Settings", "Transaction Settings", "Advanced Settings",
+        "DEX Integration", "RPC Performance", "Network Settings", "API Settings",
+    )
+}
+
+# Last settings table shown and the rows it was built from, reused while nothing has changed
+_settings_table = None
+_settings_rows = None
 
 def display_current_settings():
     """Display all current settings loaded from .env with enhanced UI"""
-    # Create a table for trading settings
-    table = Table(title="CURRENT CONFIGURATION", show_header=True, header_style="bold blue")
-    table.add_column("Setting", style="cyan", justify="right")
-    table.add_column("Value", style="green")
-    
-    # Trading settings
-    table.add_row("[bold]Trading Settings[/]", "")
-    table.add_row("Buy Amount", f"{Config.BUY_AMOUNT} SOL")
-    table.add_row("Auto-Trading", f"{'[green]Enabled[/]' if Config.AUTO_TRADE else '[red]Disabled[/]'}")
-    table.add_row("Auto-Selling", f"{'[green]Enabled[/]' if Config.AUTO_SELL else '[red]Disabled[/]'}")
-    
-    # Paper trading settings
-    table.add_row("[bold]Paper Trading Settings[/]", "")
-    table.add_row("Paper Trading", f"{'[green]Enabled[/]' if PaperConfig.PAPER_ENABLED else '[red]Disabled[/]'}")
-    table.add_row("Paper SOL Balance", f"{PaperConfig.PAPER_SOL_BALANCE} SOL")
-    table.add_row("Paper Buy Amount", f"{PaperConfig.PAPER_BUY_AMOUNT} SOL")
-    table.add_row("Paper Auto-Trading", f"{'[green]Enabled[/]' if PaperConfig.PAPER_AUTO_TRADE else '[red]Disabled[/]'}")
-    table.add_row("Paper Auto-Selling", f"{'[green]Enabled[/]' if PaperConfig.PAPER_AUTO_SELL else '[red]Disabled[/]'}")
-    
-    # Strategy settings
-    table.add_row("[bold]Exit Strategy Settings[/]", "")
-    table.add_row("Strategy", f"{Config.EXIT_STRATEGY}")
-    table.add_row("Profit Target", f"{Config.PROFIT_TARGET}%")
-    table.add_row("Stop Loss", f"{Config.STOP_LOSS}%")
-    table.add_row("Trailing Stop", f"{Config.TRAILING_STOP}%")
-    table.add_row("Max Hold Time", f"{Config.MAX_HOLD_TIME/3600} hours")
-    
-    # Safety settings
-    table.add_row("[bold]Safety Settings[/]", "")
-    table.add_row("Min Liquidity", f"${Config.MIN_LIQUIDITY_USD}")
-    table.add_row("Max Position Size", f"{Config.MAX_POSITION_SIZE_PERCENT}% of liquidity")
-    table.add_row("Check Honeypot", f"{'[green]Enabled[/]' if Config.CHECK_HONEYPOT else '[red]Disabled[/]'}")
+    global _settings_table, _settings_rows
+    C, P = Config, PaperConfig
+    
+    rows = [
+        # Trading settings
+        (_SECTIONS["Trading Settings"], ""),
+        ("Buy Amount", f"{C.BUY_AMOUNT} SOL"),
+        ("Auto-Trading", _EN if C.AUTO_TRADE else _DIS),
+        ("Auto-Selling", _EN if C.AUTO_SELL else _DIS),
+        
+        # Paper trading settings
+        (_SECTIONS["Paper Trading Settings"], ""),
+        ("Paper Trading", _EN if P.PAPER_ENABLED else _DIS),
+        ("Paper SOL Balance", f"{P.PAPER_SOL_BALANCE} SOL"),
+        ("Paper Buy Amount", f"{P.PAPER_BUY_AMOUNT} SOL"),
+        ("Paper Auto-Trading", _EN if P.PAPER_AUTO_TRADE else _DIS),
+        ("Paper Auto-Selling", _EN if P.PAPER_AUTO_SELL else _DIS),
+        
+        # Strategy settings
+        (_SECTIONS["Exit Strategy Settings"], ""),
+        ("Strategy", str(C.EXIT_STRATEGY)),
+        ("Profit Target", f"{C.PROFIT_TARGET}%"),
+        ("Stop Loss", f"{C.STOP_LOSS}%"),
+        ("Trailing Stop", f"{C.TRAILING_STOP}%"),
+        ("Max Hold Time", f"{C.MAX_HOLD_TIME/3600} hours"),
+        
+        # Safety settings
+        (_SECTIONS["Safety Settings"], ""),
+        ("Min Liquidity", f"${C.MIN_LIQUIDITY_USD}"),
+        ("Max Position Size", f"{C.MAX_POSITION_SIZE_PERCENT}% of liquidity"),
+        ("Check Honeypot", _EN if C.CHECK_HONEYPOT else _DIS),
+    ]
     
     # Paper exit strategy settings (if different)
-    if (PaperConfig.PAPER_PROFIT_TARGET is not None or 
-        PaperConfig.PAPER_STOP_LOSS is not None or 
-        PaperConfig.PAPER_TRAILING_STOP is not None or 
-        PaperConfig.PAPER_MAX_HOLD_TIME is not None or
-        PaperConfig.PAPER_EXIT_STRATEGY is not None):
+    es, pt, sl, ts, mh = (
+        P.PAPER_EXIT_STRATEGY, P.PAPER_PROFIT_TARGET, P.PAPER_STOP_LOSS,
+        P.PAPER_TRAILING_STOP, P.PAPER_MAX_HOLD_TIME,
+    )
+    if any(x is not None for x in (es, pt, sl, ts, mh)):
+        rows.append((_SECTIONS["Paper Exit Strategy Settings"], ""))
+        if es is not None:
+            rows.append(("Paper Strategy", str(es)))
+        if pt is not None:
+            rows.append(("Paper Profit Target", f"{pt}%"))
+        if sl is not None:
+            rows.append(("Paper Stop Loss", f"{sl}%"))
+        if ts is not None:
+            rows.append(("Paper Trailing Stop", f"{ts}%"))
+        if mh is not None:
+            rows.append(("Paper Max Hold Time", f"{mh/3600} hours"))
+    
+    fee_mode = C.PRIORITY_FEE_MODE
+    last_measurement = P.last_delay_measurement
+    rows += [
+        # Transaction settings
+        (_SECTIONS["Transaction Settings"], ""),
+        ("Slippage", f"{C.DEFAULT_SLIPPAGE}%"),
+        ("Priority Fee", fee_mode if fee_mode == 'auto' else f"Custom ({C.PRIORITY_FEE_LAMPORTS} lamports)"),
+        ("Price Impact Warning", f"{C.PRICE_IMPACT_WARNING}%"),
+        ("Price Impact Abort", f"{C.PRICE_IMPACT_ABORT}%"),
         
-        table.add_row("[bold]Paper Exit Strategy Settings[/]", "")
+        # Advanced settings
+        (_SECTIONS["Advanced Settings"], ""),
+        ("Order Splitting", _EN if C.USE_ORDER_SPLITTING else _DIS),
+        ("Volume Monitoring", _EN if C.ENABLE_VOLUME_MONITORING else _DIS),
+        ("WebSocket", _EN if C.ENABLE_WEBSOCKET else _DIS),
         
-        if PaperConfig.PAPER_EXIT_STRATEGY is not None:
-            table.add_row("Paper Strategy", f"{PaperConfig.PAPER_EXIT_STRATEGY}")
+        # DEX Integration
+        (_SECTIONS["DEX Integration"], ""),
+        ("Swap Engine", _SWAP_ENGINE),
+        ("Raydium Initialized", _YES if raydium_initialized else _NO),
         
-        if PaperConfig.PAPER_PROFIT_TARGET is not None:
-            table.add_row("Paper Profit Target", f"{PaperConfig.PAPER_PROFIT_TARGET}%")
-            
-        if PaperConfig.PAPER_STOP_LOSS is not None:
-            table.add_row("Paper Stop Loss", f"{PaperConfig.PAPER_STOP_LOSS}%")
-            
-        if PaperConfig.PAPER_TRAILING_STOP is not None:
-            table.add_row("Paper Trailing Stop", f"{PaperConfig.PAPER_TRAILING_STOP}%")
-            
-        if PaperConfig.PAPER_MAX_HOLD_TIME is not None:
-            table.add_row("Paper Max Hold Time", f"{PaperConfig.PAPER_MAX_HOLD_TIME/3600} hours")
-    
-    # Transaction settings
-    table.add_row("[bold]Transaction Settings[/]", "")
-    table.add_row("Slippage", f"{Config.DEFAULT_SLIPPAGE}%")
-    table.add_row("Priority Fee", f"{Config.PRIORITY_FEE_MODE if Config.PRIORITY_FEE_MODE == 'auto' else f'Custom ({Config.PRIORITY_FEE_LAMPORTS} lamports)'}")
-    table.add_row("Price Impact Warning", f"{Config.PRICE_IMPACT_WARNING}%")
-    table.add_row("Price Impact Abort", f"{Config.PRICE_IMPACT_ABORT}%")
-    
-    # Advanced settings
-    table.add_row("[bold]Advanced Settings[/]", "")
-    table.add_row("Order Splitting", f"{'[green]Enabled[/]' if Config.USE_ORDER_SPLITTING else '[red]Disabled[/]'}")
-    table.add_row("Volume Monitoring", f"{'[green]Enabled[/]' if Config.ENABLE_VOLUME_MONITORING else '[red]Disabled[/]'}")
-    table.add_row("WebSocket", f"{'[green]Enabled[/]' if Config.ENABLE_WEBSOCKET else '[red]Disabled[/]'}")
-    
-    # DEX Integration
-    table.add_row("[bold]DEX Integration[/]", "")
-    table.add_row("Swap Engine", "[bold magenta]Raydium V4 CLMM[/] (Direct AMM)")
-    table.add_row("Raydium Initialized", f"{'[green]Yes[/]' if raydium_initialized else '[red]No[/]'}")
-    
-    # RPC Performance
-    table.add_row("[bold]RPC Performance[/]", "")
-    table.add_row("Measured Delay", f"{PaperConfig.avg_measured_delay:.2f} ms")
-    table.add_row("Last Measurement", f"{datetime.fromtimestamp(PaperConfig.last_delay_measurement).strftime('%H:%M:%S') if PaperConfig.last_delay_measurement > 0 else 'Never'}")
-    
-    # Network settings
-    table.add_row("[bold]Network Settings[/]", "")
-    table.add_row("RPC URL", f"{Config.RPC}")
-    table.add_row("Backup RPC", f"{Config.BACKUP_RPC}")
-    
-    # Rate limit settings
-    table.add_row("[bold]API Settings[/]", "")
-    table.add_row("Rate Limit", f"{Config.RATE_LIMIT_REQUESTS_PER_MINUTE} req/min")
-    table.add_row("Price Check Interval", f"{Config.PRICE_CHECK_INTERVAL}s")
-    table.add_row("Price Display Interval", f"{Config.PRICE_DISPLAY_INTERVAL}s")
-    
-    console.print(table)
+        # RPC Performance
+        (_SECTIONS["RPC Performance"], ""),
+        ("Measured Delay", f"{P.avg_measured_delay:.2f} ms"),
+        ("Last Measurement", datetime.fromtimestamp(last_measurement).strftime('%H:%M:%S') if last_measurement > 0 else 'Never'),
+        
+        # Network settings
+        (_SECTIONS["Network Settings"], ""),
+        ("RPC URL", str(C.RPC)),
+        ("Backup RPC", str(C.BACKUP_RPC)),
+        
+        # Rate limit settings
+        (_SECTIONS["API Settings"], ""),
+        ("Rate Limit", f"{C.RATE_LIMIT_REQUESTS_PER_MINUTE} req/min"),
+        ("Price Check Interval", f"{C.PRICE_CHECK_INTERVAL}s"),
+        ("Price Display Interval", f"{C.PRICE_DISPLAY_INTERVAL}s"),
+    ]
+    
+    if rows != _settings_rows:
+        # Create a table for trading settings
+        table = Table(title="CURRENT CONFIGURATION", show_header=True, header_style="bold blue")
+        table.add_column("Setting", style="cyan", justify="right")
+        table.add_column("Value", style="green")
+        for setting, value in rows:
+            table.add_row(setting, value)
+        _settings_table, _settings_rows = table, rows
+    
+    console.print(_settings_table)
+
+RPC_MEASURE_TIMEOUT = 5  # seconds before a speed test gives up on a dead RPC
+
+async def measure_rpc_delay_bounded(measurement):
+    """Await an RPC delay measurement, falling back to the last average if it takes too long"""
+    try:
+        return await asyncio.wait_for(measurement, timeout=RPC_MEASURE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"RPC speed test timed out after {RPC_MEASURE_TIMEOUT}s")
+        return PaperConfig.avg_measured_delay
+
+async def time_rpc_bounded(url):
+    """Time one getHealth call to url in ms, or None if it fails or takes too long"""
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(time_rpc_health, url), timeout=RPC_MEASURE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"RPC speed test of {url} timed out after {RPC_MEASURE_TIMEOUT}s")
+        return None
+
+def _rpc_result_lines(delay_ms):
+    """Response time and assessment lines of a speed test panel"""
+    if delay_ms is None:
+        return ("[bold cyan]Response Time:[/] [bold red]Unreachable[/]\n"
+                "[bold cyan]Performance Assessment:[/] [bold red]Failed (error, timeout or non-200 response)[/]\n")
+    speed_color, assessment = _assess_rpc_speed(delay_ms)
+    return (f"[bold cyan]Response Time:[/] [bold {speed_color}]{delay_ms:.2f} ms[/]\n"
+            f"[bold cyan]Performance Assessment:[/] [bold {speed_color}]{assessment}[/]\n")
+
+# (upper bound in ms, colour, assessment), checked in order
+_SPEED_BUCKETS = (
+    (100, "green", "Excellent"),
+    (200, "green", "Good"),
+    (500, "yellow", "Average"),
+    (float("inf"), "red", "Slow"),
+)
+
+def _assess_rpc_speed(delay_ms):
+    """Return the (colour, assessment) bucket for an RPC delay in ms"""
+    return next((color, assessment) for limit, color, assessment in _SPEED_BUCKETS if delay_ms < limit)
+
+# Static configuration panel content, parsed once at import
+_RPC_OPTIONS_TEXT = Text.from_markup(
+    "Using a private RPC with higher rate limits is recommended for better performance.\n\n"
+    "Options:\n"
+    "[cyan]1.[/] Helius - [link=https://www.helius.dev/]https://www.helius.dev/[/link]\n"
+    "[cyan]2.[/] QuickNode - [link=https://www.quicknode.com/]https://www.quicknode.com/[/link]\n"
+    "[cyan]3.[/] Triton - [link=https://triton.one/]https://triton.one/[/link]\n"
+    "[cyan]4.[/] Continue with current RPC settings\n\n"
+)
+_RPC_OPTIONS_TITLE = Text.from_markup("[bold cyan]RPC Options[/]")
+_TELEGRAM_API_PANEL = Panel.fit(
+    Text.from_markup(
+        "You need to enter your Telegram API credentials to monitor groups.\n"
+        "Get them from [link=https://my.telegram.org/apps]https://my.telegram.org/apps[/link] if you don't have them."
+    ),
+    title=Text.from_markup("[bold yellow]TELEGRAM API REQUIRED[/]"),
+    border_style="yellow"
+)
+_TELEGRAM_TIPS_PANEL = Panel.fit(
+    Text(
+        "1. Make sure your API ID and hash are correct\n"
+        "2. Ensure your phone number is in the correct format (+19295259432)\n"
+        "3. Check your internet connection"
+    ),
+    title=Text.from_markup("[bold yellow]TIPS FOR RESOLVING TELEGRAM ISSUES[/]"),
+    border_style="yellow"
+)
+
+def _ask_float(label, current, param, target=Config, unit="", scale=1):
+    """Prompt for a numeric setting showing its current value; a blank answer keeps it"""
+    answer = Prompt.ask(f"{label} ({current}{unit})", default=str(current)).strip()
+    if answer:
+        target.update_param(param, float(answer) * scale)
+
+def _settings_text(*rows):
+    """Build a bullet list of (label, value) settings; bool values show as Enabled/Disabled"""
+    text = Text()
+    for label, value in rows:
+        text.append(f"• {label}: ")
+        if isinstance(value, bool):
+            text.append("Enabled" if value else "Disabled", style="bold green" if value else "bold red")
+        else:
+            text.append(str(value), style="bold")
+        text.append("\n")
+    return text
+
+def uvloop_active():
+    """Return True if the running event loop is a uvloop loop"""
+    return uvloop is not None and isinstance(asyncio.get_running_loop(), uvloop.Loop)
 
 # Function to configure RPC settings
+
 async def configure_rpc():
     """Configure Solana RPC endpoint with enhanced UI"""
     print_header("SOLANA RPC CONFIGURATION")
     
     # Create a panel with RPC information
-    rpc_panel = Panel.fit(
-        "Using a private RPC with higher rate limits is recommended for better performance.\n\n"
-        "Options:\n"
-        "[cyan]1.[/] Helius - [link=https://www.helius.dev/]https://www.helius.dev/[/link]\n"
-        "[cyan]2.[/] QuickNode - [link=https://www.quicknode.com/]https://www.quicknode.com/[/link]\n"
-        "[cyan]3.[/] Triton - [link=https://triton.one/]https://triton.one/[/link]\n"
-        "[cyan]4.[/] Continue with current RPC settings\n\n"
-        f"Current RPC: [bold]{Config.RPC}[/bold]",
-        title="[bold cyan]RPC Options[/]", 
-        border_style="cyan"
-    )
+    rpc_info = _RPC_OPTIONS_TEXT.copy()
+    rpc_info.append("Current RPC: ")
+    rpc_info.append(str(Config.RPC), style="bold")
+    rpc_panel = Panel.fit(rpc_info, title=_RPC_OPTIONS_TITLE, border_style="cyan")
     console.print(rpc_panel)
     
+    if uvloop_active():
+        console.print("Event loop: [bold green]uvloop[/]")
+    
     choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4"], default="4")
     
     if choice == "4":
@@ -321,17 +564,19 @@ async def configure_rpc():
     
     if rpc_url:
         Config.RPC = rpc_url
+        Config.rpc_failed_over = False
         Config.save_to_env()
         console.print(f"Using custom RPC: [bold green]{Config.RPC}[/bold green]")
     else:
         Config.RPC = Config.BACKUP_RPC
+        Config.rpc_failed_over = False
         Config.save_to_env()
         console.print(f"Using public RPC: [bold yellow]{Config.RPC}[/bold yellow] (Note: May have rate limiting issues)")
     
     # Test RPC speed
     if Confirm.ask("Would you like to test the RPC speed?", default=True):
         with console.status("[cyan]Measuring RPC response time...[/]"):
-            delay_ms = measure_rpc_delay_sync()
+            delay_ms = await measure_rpc_delay_bounded(measure_rpc_delay())
         
         console.print(f"RPC Response Time: [bold]⏱ {delay_ms:.2f} ms[/]")
         
@@ -450,12 +695,7 @@ async def configure_telegram():
     
     # Configure Telegram API credentials if not set
     if not all([Config.TELEGRAM_API_ID, Config.TELEGRAM_API_HASH, Config.TELEGRAM_PHONE]):
-        console.print(Panel.fit(
-            "You need to enter your Telegram API credentials to monitor groups.\n"
-            "Get them from [link=https://my.telegram.org/apps]https://my.telegram.org/apps[/link] if you don't have them.",
-            title="[bold yellow]TELEGRAM API REQUIRED[/]", 
-            border_style="yellow"
-        ))
+        console.print(_TELEGRAM_API_PANEL)
         
         # Get Telegram API credentials
         Config.TELEGRAM_API_ID = Prompt.ask("Enter your Telegram API ID")
@@ -513,14 +753,7 @@ async def configure_telegram():
     except Exception as e:
         console.print(f"[bold red]Error setting up Telegram: {e}[/bold red]")
         
-        tips_panel = Panel.fit(
-            "1. Make sure your API ID and hash are correct\n"
-            "2. Ensure your phone number is in the correct format (+19295259432)\n"
-            "3. Check your internet connection",
-            title="[bold yellow]TIPS FOR RESOLVING TELEGRAM ISSUES[/]", 
-            border_style="yellow"
-        )
-        console.print(tips_panel)
+        console.print(_TELEGRAM_TIPS_PANEL)
         
         retry = Confirm.ask("\nRetry Telegram setup?", default=True)
         if retry:
@@ -541,9 +774,11 @@ async def configure_trading():
     
     # Create a panel with current trading settings
     settings_panel = Panel.fit(
-        f"• Buy Amount: [bold]{Config.BUY_AMOUNT}[/bold] SOL\n"
-        f"• Auto-Trading: [bold {'green' if Config.AUTO_TRADE else 'red'}]{'Enabled' if Config.AUTO_TRADE else 'Disabled'}[/bold]\n"
-        f"• Auto-Selling: [bold {'green' if Config.AUTO_SELL else 'red'}]{'Enabled' if Config.AUTO_SELL else 'Disabled'}[/bold]\n",
+        _settings_text(
+            ("Buy Amount", f"{Config.BUY_AMOUNT} SOL"),
+            ("Auto-Trading", bool(Config.AUTO_TRADE)),
+            ("Auto-Selling", bool(Config.AUTO_SELL)),
+        ),
         title="[bold cyan]Current Trading Settings[/]", 
         border_style="cyan"
     )
@@ -552,27 +787,22 @@ async def configure_trading():
     update_settings = Confirm.ask("Update trading settings?", default=False)
     
     if update_settings:
-        # Trading settings
-        new_buy_amount = Prompt.ask(
-            f"Buy Amount ({Config.BUY_AMOUNT} SOL)", 
-            default=str(Config.BUY_AMOUNT)
-        )
-        if new_buy_amount.strip(): 
-            Config.update_param('BUY_AMOUNT', float(new_buy_amount))
+        with Config.batch_updates():
+            # Trading settings
+            _ask_float("Buy Amount", Config.BUY_AMOUNT, 'BUY_AMOUNT', unit=" SOL")
+                
+            auto_trade_setting = Confirm.ask(
+                f"Enable auto-trading?", 
+                default=Config.AUTO_TRADE
+            )
+            Config.update_param('AUTO_TRADE', auto_trade_setting)
+            
+            auto_sell_setting = Confirm.ask(
+                f"Enable auto-selling?", 
+                default=Config.AUTO_SELL
+            )
+            Config.update_param('AUTO_SELL', auto_sell_setting)
             
-        auto_trade_setting = Confirm.ask(
-            f"Enable auto-trading?", 
-            default=Config.AUTO_TRADE
-        )
-        Config.update_param('AUTO_TRADE', auto_trade_setting)
-        
-        auto_sell_setting = Confirm.ask(
-            f"Enable auto-selling?", 
-            default=Config.AUTO_SELL
-        )
-        Config.update_param('AUTO_SELL', auto_sell_setting)
-        
-        Config.save_to_env()
         console.print("[bold green]Trading settings updated successfully![/bold green]")
     else:
         console.print("[cyan]Keeping current trading settings.[/cyan]")
@@ -584,12 +814,14 @@ async def configure_paper_trading():
     
     # Create a panel with current paper trading settings
     settings_panel = Panel.fit(
-        f"• Paper Trading: [bold {'green' if PaperConfig.PAPER_ENABLED else 'red'}]{'Enabled' if PaperConfig.PAPER_ENABLED else 'Disabled'}[/bold]\n"
-        f"• Paper SOL Balance: [bold]{PaperConfig.PAPER_SOL_BALANCE}[/bold] SOL\n"
-        f"• Paper Buy Amount: [bold]{PaperConfig.PAPER_BUY_AMOUNT}[/bold] SOL\n"
-        f"• Paper Slippage: [bold]{PaperConfig.PAPER_SLIPPAGE}%[/bold]\n"
-        f"• Paper Auto-Trading: [bold {'green' if PaperConfig.PAPER_AUTO_TRADE else 'red'}]{'Enabled' if PaperConfig.PAPER_AUTO_TRADE else 'Disabled'}[/bold]\n"
-        f"• Paper Auto-Selling: [bold {'green' if PaperConfig.PAPER_AUTO_SELL else 'red'}]{'Enabled' if PaperConfig.PAPER_AUTO_SELL else 'Disabled'}[/bold]\n",
+        _settings_text(
+            ("Paper Trading", bool(PaperConfig.PAPER_ENABLED)),
+            ("Paper SOL Balance", f"{PaperConfig.PAPER_SOL_BALANCE} SOL"),
+            ("Paper Buy Amount", f"{PaperConfig.PAPER_BUY_AMOUNT} SOL"),
+            ("Paper Slippage", f"{PaperConfig.PAPER_SLIPPAGE}%"),
+            ("Paper Auto-Trading", bool(PaperConfig.PAPER_AUTO_TRADE)),
+            ("Paper Auto-Selling", bool(PaperConfig.PAPER_AUTO_SELL)),
+        ),
         title="[bold cyan]Current Paper Trading Settings[/]", 
         border_style="cyan"
     )
@@ -598,7 +830,7 @@ async def configure_paper_trading():
     # Measure RPC speed to show accurate simulation values
     if Confirm.ask("Measure current RPC speed (for realistic simulation)?", default=True):
         with console.status("[cyan]Measuring RPC response time...[/]"):
-            delay_ms = measure_rpc_delay_sync()
+            delay_ms = await measure_rpc_delay_bounded(measure_rpc_delay())
         
         console.print(f"RPC Response Time: [bold]⏱ {delay_ms:.2f} ms[/]")
         
@@ -615,109 +847,81 @@ async def configure_paper_trading():
     update_settings = Confirm.ask("Update paper trading settings?", default=True)
     
     if update_settings:
-        # Paper trading settings
-        paper_enabled = Confirm.ask(
-            f"Enable paper trading?", 
-            default=PaperConfig.PAPER_ENABLED
-        )
-        PaperConfig.update_param('PAPER_ENABLED', paper_enabled)
-        
-        new_paper_balance = Prompt.ask(
-            f"Paper SOL Balance ({PaperConfig.PAPER_SOL_BALANCE} SOL)", 
-            default=str(PaperConfig.PAPER_SOL_BALANCE)
-        )
-        if new_paper_balance.strip(): 
-            PaperConfig.update_param('PAPER_SOL_BALANCE', float(new_paper_balance))
-        
-        new_paper_buy_amount = Prompt.ask(
-            f"Paper Buy Amount ({PaperConfig.PAPER_BUY_AMOUNT} SOL)", 
-            default=str(PaperConfig.PAPER_BUY_AMOUNT)
-        )
-        if new_paper_buy_amount.strip(): 
-            PaperConfig.update_param('PAPER_BUY_AMOUNT', float(new_paper_buy_amount))
-            
-        new_paper_slippage = Prompt.ask(
-            f"Paper Slippage ({PaperConfig.PAPER_SLIPPAGE}%)", 
-            default=str(PaperConfig.PAPER_SLIPPAGE)
-        )
-        if new_paper_slippage.strip(): 
-            PaperConfig.update_param('PAPER_SLIPPAGE', float(new_paper_slippage))
+        with PaperConfig.batch_updates():
+            # Paper trading settings
+            paper_enabled = Confirm.ask(
+                f"Enable paper trading?", 
+                default=PaperConfig.PAPER_ENABLED
+            )
+            PaperConfig.update_param('PAPER_ENABLED', paper_enabled)
             
-        paper_auto_trade = Confirm.ask(
-            f"Enable paper auto-trading?", 
-            default=PaperConfig.PAPER_AUTO_TRADE
-        )
-        PaperConfig.update_param('PAPER_AUTO_TRADE', paper_auto_trade)
-        
-        paper_auto_sell = Confirm.ask(
-            f"Enable paper auto-selling?", 
-            default=PaperConfig.PAPER_AUTO_SELL
-        )
-        PaperConfig.update_param('PAPER_AUTO_SELL', paper_auto_sell)
-        
-        # Ask if user wants to use separate exit strategy for paper trading
-        use_separate_exit = Confirm.ask(
-            f"Use separate exit strategy for paper trading?", 
-            default=PaperConfig.PAPER_EXIT_STRATEGY is not None
-        )
-        
-        if use_separate_exit:
-            # Configure paper-specific exit strategy
-            console.print("\n[bold cyan]PAPER EXIT STRATEGY OPTIONS:[/bold cyan]")
-            console.print("1. Full Sell at Take Profit (FULL_TP)")
-            console.print("2. Trailing Stop Only (TRAILING_STOP)")
+            _ask_float("Paper SOL Balance", PaperConfig.PAPER_SOL_BALANCE, 'PAPER_SOL_BALANCE', PaperConfig, unit=" SOL")
             
-            strategy_choice = Prompt.ask(
-                "Select paper exit strategy", 
-                choices=["1", "2"], 
-                default="1" if PaperConfig.PAPER_EXIT_STRATEGY == "FULL_TP" or not PaperConfig.PAPER_EXIT_STRATEGY else "2"
+            _ask_float("Paper Buy Amount", PaperConfig.PAPER_BUY_AMOUNT, 'PAPER_BUY_AMOUNT', PaperConfig, unit=" SOL")
+                
+            _ask_float("Paper Slippage", PaperConfig.PAPER_SLIPPAGE, 'PAPER_SLIPPAGE', PaperConfig, unit="%")
+                
+            paper_auto_trade = Confirm.ask(
+                f"Enable paper auto-trading?", 
+                default=PaperConfig.PAPER_AUTO_TRADE
             )
+            PaperConfig.update_param('PAPER_AUTO_TRADE', paper_auto_trade)
             
-            if strategy_choice == "1":
-                PaperConfig.update_param('PAPER_EXIT_STRATEGY', 'FULL_TP')
-            else:
-                PaperConfig.update_param('PAPER_EXIT_STRATEGY', 'TRAILING_STOP')
+            paper_auto_sell = Confirm.ask(
+                f"Enable paper auto-selling?", 
+                default=PaperConfig.PAPER_AUTO_SELL
+            )
+            PaperConfig.update_param('PAPER_AUTO_SELL', paper_auto_sell)
             
-            # Paper-specific profit target
-            new_profit_target = Prompt.ask(
-                f"Paper Profit Target ({PaperConfig.PAPER_PROFIT_TARGET or Config.PROFIT_TARGET}%)", 
-                default=str(PaperConfig.PAPER_PROFIT_TARGET or Config.PROFIT_TARGET)
+            # Ask if user wants to use separate exit strategy for paper trading
+            use_separate_exit = Confirm.ask(
+                f"Use separate exit strategy for paper trading?", 
+                default=PaperConfig.PAPER_EXIT_STRATEGY is not None
             )
-            if new_profit_target.strip():
-                PaperConfig.update_param('PAPER_PROFIT_TARGET', float(new_profit_target))
+            
+            if use_separate_exit:
+                # Current paper values, falling back to the main settings
+                paper_strategy = PaperConfig.PAPER_EXIT_STRATEGY
+                paper_profit = PaperConfig.PAPER_PROFIT_TARGET or Config.PROFIT_TARGET
+                paper_stop = PaperConfig.PAPER_STOP_LOSS or Config.STOP_LOSS
+                paper_trailing = PaperConfig.PAPER_TRAILING_STOP or Config.TRAILING_STOP
+                paper_hold_hours = (PaperConfig.PAPER_MAX_HOLD_TIME or Config.MAX_HOLD_TIME) / 3600
                 
-            # Paper-specific stop loss
-            new_stop_loss = Prompt.ask(
-                f"Paper Stop Loss ({PaperConfig.PAPER_STOP_LOSS or Config.STOP_LOSS}%)", 
-                default=str(PaperConfig.PAPER_STOP_LOSS or Config.STOP_LOSS)
-            )
-            if new_stop_loss.strip():
-                PaperConfig.update_param('PAPER_STOP_LOSS', float(new_stop_loss))
+                # Configure paper-specific exit strategy
+                console.print("\n[bold cyan]PAPER EXIT STRATEGY OPTIONS:[/bold cyan]")
+                console.print("1. Full Sell at Take Profit (FULL_TP)")
+                console.print("2. Trailing Stop Only (TRAILING_STOP)")
                 
-            # Paper-specific trailing stop
-            new_trailing_stop = Prompt.ask(
-                f"Paper Trailing Stop ({PaperConfig.PAPER_TRAILING_STOP or Config.TRAILING_STOP}%)", 
-                default=str(PaperConfig.PAPER_TRAILING_STOP or Config.TRAILING_STOP)
-            )
-            if new_trailing_stop.strip():
-                PaperConfig.update_param('PAPER_TRAILING_STOP', float(new_trailing_stop))
+                strategy_choice = Prompt.ask(
+                    "Select paper exit strategy", 
+                    choices=["1", "2"], 
+                    default="1" if paper_strategy == "FULL_TP" or not paper_strategy else "2"
+                )
                 
-            # Paper-specific max hold time
-            new_max_hold_hours = Prompt.ask(
-                f"Paper Max Hold Time ({(PaperConfig.PAPER_MAX_HOLD_TIME or Config.MAX_HOLD_TIME)/3600} hours)", 
-                default=str((PaperConfig.PAPER_MAX_HOLD_TIME or Config.MAX_HOLD_TIME)/3600)
-            )
-            if new_max_hold_hours.strip():
-                PaperConfig.update_param('PAPER_MAX_HOLD_TIME', float(new_max_hold_hours) * 3600)
-        else:
-            # Reset paper-specific settings to use main settings
-            PaperConfig.update_param('PAPER_EXIT_STRATEGY', None)
-            PaperConfig.update_param('PAPER_PROFIT_TARGET', None)
-            PaperConfig.update_param('PAPER_STOP_LOSS', None)
-            PaperConfig.update_param('PAPER_TRAILING_STOP', None)
-            PaperConfig.update_param('PAPER_MAX_HOLD_TIME', None)
-        
-        PaperConfig.save_to_env()
+                if strategy_choice == "1":
+                    PaperConfig.update_param('PAPER_EXIT_STRATEGY', 'FULL_TP')
+                else:
+                    PaperConfig.update_param('PAPER_EXIT_STRATEGY', 'TRAILING_STOP')
+                
+                # Paper-specific profit target
+                _ask_float("Paper Profit Target", paper_profit, 'PAPER_PROFIT_TARGET', PaperConfig, unit="%")
+                    
+                # Paper-specific stop loss
+                _ask_float("Paper Stop Loss", paper_stop, 'PAPER_STOP_LOSS', PaperConfig, unit="%")
+                    
+                # Paper-specific trailing stop
+                _ask_float("Paper Trailing Stop", paper_trailing, 'PAPER_TRAILING_STOP', PaperConfig, unit="%")
+                    
+                # Paper-specific max hold time
+                _ask_float("Paper Max Hold Time", paper_hold_hours, 'PAPER_MAX_HOLD_TIME', PaperConfig, unit=" hours", scale=3600)
+            else:
+                # Reset paper-specific settings to use main settings
+                PaperConfig.update_param('PAPER_EXIT_STRATEGY', None)
+                PaperConfig.update_param('PAPER_PROFIT_TARGET', None)
+                PaperConfig.update_param('PAPER_STOP_LOSS', None)
+                PaperConfig.update_param('PAPER_TRAILING_STOP', None)
+                PaperConfig.update_param('PAPER_MAX_HOLD_TIME', None)
+            
         console.print("[bold green]Paper trading settings updated successfully![/bold green]")
     else:
         console.print("[cyan]Keeping current paper trading settings.[/cyan]")
@@ -727,99 +931,91 @@ async def configure_exit_strategy():
     """Configure exit strategy parameters with enhanced UI"""
     print_header("EXIT STRATEGY CONFIGURATION")
     
+    # Snapshot the current settings once for the panels and prompt defaults
+    exit_strategy = Config.EXIT_STRATEGY
+    profit_target = Config.PROFIT_TARGET
+    stop_loss = Config.STOP_LOSS
+    trailing_stop = Config.TRAILING_STOP
+    max_hold_hours = Config.MAX_HOLD_TIME / 3600
+    paper_strategy = PaperConfig.PAPER_EXIT_STRATEGY
+    paper_profit = PaperConfig.PAPER_PROFIT_TARGET
+    paper_stop = PaperConfig.PAPER_STOP_LOSS
+    paper_trailing = PaperConfig.PAPER_TRAILING_STOP
+    paper_hold = PaperConfig.PAPER_MAX_HOLD_TIME
+    
     # Create a panel with current exit strategy settings
     settings_panel = Panel.fit(
-        f"• Strategy: [bold]{Config.EXIT_STRATEGY}[/bold]\n"
-        f"• Profit Target: [bold green]{Config.PROFIT_TARGET}%[/bold green]\n"
-        f"• Stop Loss: [bold red]{Config.STOP_LOSS}%[/bold red]\n"
-        f"• Trailing Stop: [bold cyan]{Config.TRAILING_STOP}%[/bold cyan]\n"
-        f"• Max Hold Time: [bold]{Config.MAX_HOLD_TIME/3600}[/bold] hours\n",
+        f"• Strategy: [bold]{exit_strategy}[/bold]\n"
+        f"• Profit Target: [bold green]{profit_target}%[/bold green]\n"
+        f"• Stop Loss: [bold red]{stop_loss}%[/bold red]\n"
+        f"• Trailing Stop: [bold cyan]{trailing_stop}%[/bold cyan]\n"
+        f"• Max Hold Time: [bold]{max_hold_hours}[/bold] hours\n",
         title="[bold cyan]Current Exit Strategy Settings[/]", 
         border_style="cyan"
     )
-    console.print(settings_panel)
+    console.write(settings_panel)
     
     # Also show paper trading exit strategy settings if they differ
     if (PaperConfig.PAPER_ENABLED and
-        (PaperConfig.PAPER_EXIT_STRATEGY is not None or
-         PaperConfig.PAPER_PROFIT_TARGET is not None or
-         PaperConfig.PAPER_STOP_LOSS is not None or
-         PaperConfig.PAPER_TRAILING_STOP is not None or
-         PaperConfig.PAPER_MAX_HOLD_TIME is not None)):
+        any(x is not None for x in (paper_strategy, paper_profit, paper_stop, paper_trailing, paper_hold))):
         
         paper_settings_panel = Panel.fit(
-            f"• Paper Strategy: [bold]{PaperConfig.PAPER_EXIT_STRATEGY or Config.EXIT_STRATEGY}[/bold]\n"
-            f"• Paper Profit Target: [bold green]{PaperConfig.PAPER_PROFIT_TARGET or Config.PROFIT_TARGET}%[/bold green]\n"
-            f"• Paper Stop Loss: [bold red]{PaperConfig.PAPER_STOP_LOSS or Config.STOP_LOSS}%[/bold red]\n"
-            f"• Paper Trailing Stop: [bold cyan]{PaperConfig.PAPER_TRAILING_STOP or Config.TRAILING_STOP}%[/bold cyan]\n"
-            f"• Paper Max Hold Time: [bold]{(PaperConfig.PAPER_MAX_HOLD_TIME or Config.MAX_HOLD_TIME)/3600}[/bold] hours\n",
+            f"• Paper Strategy: [bold]{paper_strategy or exit_strategy}[/bold]\n"
+            f"• Paper Profit Target: [bold green]{paper_profit or profit_target}%[/bold green]\n"
+            f"• Paper Stop Loss: [bold red]{paper_stop or stop_loss}%[/bold red]\n"
+            f"• Paper Trailing Stop: [bold cyan]{paper_trailing or trailing_stop}%[/bold cyan]\n"
+            f"• Paper Max Hold Time: [bold]{paper_hold / 3600 if paper_hold else max_hold_hours}[/bold] hours\n",
             title="[bold yellow]Current Paper Exit Strategy Settings[/]", 
             border_style="yellow"
         )
-        console.print(paper_settings_panel)
+        console.write(paper_settings_panel)
     
+    console.flush()
     update_settings = Confirm.ask("Update exit strategy settings?", default=False)
     
     if update_settings:
-        # Exit strategy settings
-        console.print("\n[bold cyan]EXIT STRATEGY OPTIONS:[/bold cyan]")
-        console.print("1. Full Sell at Take Profit (FULL_TP)")
-        console.print("2. Trailing Stop Only (TRAILING_STOP)")
-        console.print(f"Current: [bold]{Config.EXIT_STRATEGY}[/bold]")
-        
-        strategy_choice = Prompt.ask(
-            "Select exit strategy", 
-            choices=["1", "2"], 
-            default="1" if Config.EXIT_STRATEGY == "FULL_TP" else "2"
-        )
-        
-        if strategy_choice == "1": 
-            Config.update_param('EXIT_STRATEGY', 'FULL_TP')
-        elif strategy_choice == "2": 
-            Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
-        
-        # Additional trading parameters
-        new_profit_target = Prompt.ask(
-            f"Profit Target ({Config.PROFIT_TARGET}%)", 
-            default=str(Config.PROFIT_TARGET)
-        )
-        if new_profit_target.strip(): 
-            Config.update_param('PROFIT_TARGET', float(new_profit_target))
+        with Config.batch_updates():
+            # Exit strategy settings
+            console.write(
+                "\n[bold cyan]EXIT STRATEGY OPTIONS:[/bold cyan]",
+                "1. Full Sell at Take Profit (FULL_TP)",
+                "2. Trailing Stop Only (TRAILING_STOP)",
+                f"Current: [bold]{exit_strategy}[/bold]"
+            )
+            console.flush()
             
-        new_stop_loss = Prompt.ask(
-            f"Stop Loss ({Config.STOP_LOSS}%)", 
-            default=str(Config.STOP_LOSS)
-        )
-        if new_stop_loss.strip(): 
-            Config.update_param('STOP_LOSS', float(new_stop_loss))
+            strategy_choice = Prompt.ask(
+                "Select exit strategy", 
+                choices=["1", "2"], 
+                default="1" if exit_strategy == "FULL_TP" else "2"
+            )
             
-        new_trailing_stop = Prompt.ask(
-            f"Trailing Stop ({Config.TRAILING_STOP}%)", 
-            default=str(Config.TRAILING_STOP)
-        )
-        if new_trailing_stop.strip(): 
-            Config.update_param('TRAILING_STOP', float(new_trailing_stop))
-        
-        new_hold_hours = Prompt.ask(
-            f"Max Hold Time ({Config.MAX_HOLD_TIME/3600} hours)", 
-            default=str(Config.MAX_HOLD_TIME/3600)
-        )
-        if new_hold_hours.strip():
-            Config.update_param('MAX_HOLD_TIME', float(new_hold_hours) * 3600)
+            if strategy_choice == "1": 
+                Config.update_param('EXIT_STRATEGY', 'FULL_TP')
+            elif strategy_choice == "2": 
+                Config.update_param('EXIT_STRATEGY', 'TRAILING_STOP')
             
-        Config.save_to_env()
+            # Additional trading parameters
+            _ask_float("Profit Target", profit_target, 'PROFIT_TARGET', unit="%")
+                
+            _ask_float("Stop Loss", stop_loss, 'STOP_LOSS', unit="%")
+                
+            _ask_float("Trailing Stop", trailing_stop, 'TRAILING_STOP', unit="%")
+            
+            _ask_float("Max Hold Time", max_hold_hours, 'MAX_HOLD_TIME', unit=" hours", scale=3600)
+                
         console.print("[bold green]Exit strategy settings updated successfully![/bold green]")
         
         # Ask if user wants to apply same settings to paper trading
         if PaperConfig.PAPER_ENABLED:
             apply_to_paper = Confirm.ask("Apply these same settings to paper trading?", default=True)
             if apply_to_paper:
-                PaperConfig.update_param('PAPER_EXIT_STRATEGY', None)
-                PaperConfig.update_param('PAPER_PROFIT_TARGET', None)
-                PaperConfig.update_param('PAPER_STOP_LOSS', None)
-                PaperConfig.update_param('PAPER_TRAILING_STOP', None)
-                PaperConfig.update_param('PAPER_MAX_HOLD_TIME', None)
-                PaperConfig.save_to_env()
+                with PaperConfig.batch_updates():
+                    PaperConfig.update_param('PAPER_EXIT_STRATEGY', None)
+                    PaperConfig.update_param('PAPER_PROFIT_TARGET', None)
+                    PaperConfig.update_param('PAPER_STOP_LOSS', None)
+                    PaperConfig.update_param('PAPER_TRAILING_STOP', None)
+                    PaperConfig.update_param('PAPER_MAX_HOLD_TIME', None)
                 console.print("[bold green]Applied settings to paper trading.[/bold green]")
     else:
         console.print("[cyan]Keeping current exit strategy settings.[/cyan]")
@@ -842,30 +1038,33 @@ async def configure_priority_fees():
     update_settings = Confirm.ask("Update priority fee settings?", default=False)
     
     if update_settings:
-        # Priority fee settings
-        console.print("\n[bold cyan]PRIORITY FEE OPTIONS:[/bold cyan]")
-        console.print("1. Auto (Jupiter automatically adjusts)")
-        console.print("2. Custom (Set a fixed fee)")
-        
-        priority_fee_choice = Prompt.ask(
-            "Select priority fee mode", 
-            choices=["1", "2"], 
-            default="1" if Config.PRIORITY_FEE_MODE == "auto" else "2"
-        )
-        
-        if priority_fee_choice == "1": 
-            Config.update_param('PRIORITY_FEE_MODE', 'auto')
-        elif priority_fee_choice == "2":
-            Config.update_param('PRIORITY_FEE_MODE', 'custom')
-            # Ask for custom fee amount
-            new_fee = Prompt.ask(
-                f"Enter fee in lamports", 
-                default=str(Config.PRIORITY_FEE_LAMPORTS)
+        with Config.batch_updates():
+            # Priority fee settings
+            console.write(
+                "\n[bold cyan]PRIORITY FEE OPTIONS:[/bold cyan]",
+                "1. Auto (Jupiter automatically adjusts)",
+                "2. Custom (Set a fixed fee)"
             )
-            if new_fee.strip():
-                Config.update_param('PRIORITY_FEE_LAMPORTS', int(new_fee))
-        
-        Config.save_to_env()
+            console.flush()
+            
+            priority_fee_choice = Prompt.ask(
+                "Select priority fee mode", 
+                choices=["1", "2"], 
+                default="1" if Config.PRIORITY_FEE_MODE == "auto" else "2"
+            )
+            
+            if priority_fee_choice == "1": 
+                Config.update_param('PRIORITY_FEE_MODE', 'auto')
+            elif priority_fee_choice == "2":
+                Config.update_param('PRIORITY_FEE_MODE', 'custom')
+                # Ask for custom fee amount
+                new_fee = Prompt.ask(
+                    f"Enter fee in lamports", 
+                    default=str(Config.PRIORITY_FEE_LAMPORTS)
+                )
+                if new_fee.strip():
+                    Config.update_param('PRIORITY_FEE_LAMPORTS', int(new_fee))
+            
         console.print("[bold green]Priority fee settings updated successfully![/bold green]")
     else:
         console.print("[cyan]Keeping current priority fee settings.[/cyan]")
@@ -888,28 +1087,13 @@ async def configure_transaction_settings():
     update_settings = Confirm.ask("Update transaction settings?", default=False)
     
     if update_settings:
-        new_slippage = Prompt.ask(
-            f"Default Slippage ({Config.DEFAULT_SLIPPAGE}%)", 
-            default=str(Config.DEFAULT_SLIPPAGE)
-        )
-        if new_slippage.strip():
-            Config.update_param('DEFAULT_SLIPPAGE', float(new_slippage))
-            
-        new_impact_warning = Prompt.ask(
-            f"Price Impact Warning ({Config.PRICE_IMPACT_WARNING}%)", 
-            default=str(Config.PRICE_IMPACT_WARNING)
-        )
-        if new_impact_warning.strip():
-            Config.update_param('PRICE_IMPACT_WARNING', float(new_impact_warning))
+        with Config.batch_updates():
+            _ask_float("Default Slippage", Config.DEFAULT_SLIPPAGE, 'DEFAULT_SLIPPAGE', unit="%")
+                
+            _ask_float("Price Impact Warning", Config.PRICE_IMPACT_WARNING, 'PRICE_IMPACT_WARNING', unit="%")
+                
+            _ask_float("Price Impact Abort", Config.PRICE_IMPACT_ABORT, 'PRICE_IMPACT_ABORT', unit="%")
             
-        new_impact_abort = Prompt.ask(
-            f"Price Impact Abort ({Config.PRICE_IMPACT_ABORT}%)", 
-            default=str(Config.PRICE_IMPACT_ABORT)
-        )
-        if new_impact_abort.strip():
-            Config.update_param('PRICE_IMPACT_ABORT', float(new_impact_abort))
-        
-        Config.save_to_env()
         console.print("[bold green]Transaction settings updated successfully![/bold green]")
     else:
         console.print("[cyan]Keeping current transaction settings.[/cyan]")
@@ -922,11 +1106,11 @@ async def manage_telegram_chats():
     # Show current chats
     active_chats = get_active_chats()
     if active_chats:
-        console.print("[bold]Currently monitored chats:[/]")
-        for i, (chat_id, chat_name) in enumerate(active_chats):
-            console.print(f"{i+1}. {chat_name} (ID: {chat_id})")
+        console.write("[bold]Currently monitored chats:[/]")
+        console.write(*(f"{i+1}. {chat_name} (ID: {chat_id})" for i, (chat_id, chat_name) in enumerate(active_chats)))
     else:
-        console.print("[bold yellow]No chats currently being monitored.[/]")
+        console.write("[bold yellow]No chats currently being monitored.[/]")
+    console.flush()
     
     # Ask what action to perform
     action = Prompt.ask(
@@ -965,49 +1149,51 @@ async def initial_setup():
     """Run initial setup for first-time users or when reconfiguring with beautiful UI"""
     print_header("SOLANA TRADING BOT SETUP WIZARD", "=")
     
-    # Configure RPC
-    with console.status("[bold green]Configuring RPC...[/]"):
-        rpc_url = await configure_rpc()
-    
-    # Initialize Solana client
-    with console.status("[bold green]Initializing Solana client...[/]"):
-        solana_client = initialize_clients(rpc_url)
-    
-    # Configure wallet
-    with console.status("[bold green]Configuring wallet...[/]"):
-        payer_keypair = await configure_wallet()
-        if not payer_keypair:
-            return None, None, None, None
-    
-    # Initialize Raydium after we have solana_client and payer_keypair
-    with console.status("[bold green]Initializing Raydium V4 integration...[/]"):
-        initialize_raydium_module(solana_client, payer_keypair)
-    
-    # Configure Telegram
-    with console.status("[bold green]Configuring Telegram...[/]"):
-        telegram_client, chat_list = await configure_telegram()
-        if not telegram_client or not chat_list:
-            return None, None, None, None
-    
-    # Configure trading parameters
-    with console.status("[bold green]Configuring trading parameters...[/]"):
-        await configure_trading()
-    
-    # Configure paper trading
-    with console.status("[bold green]Configuring paper trading...[/]"):
-        await configure_paper_trading()
-    
-    # Configure exit strategy
-    with console.status("[bold green]Configuring exit strategy...[/]"):
-        await configure_exit_strategy()
-    
-    # Configure priority fees
-    with console.status("[bold green]Configuring priority fees...[/]"):
-        await configure_priority_fees()
-    
-    # Configure transaction settings
-    with console.status("[bold green]Configuring transaction settings...[/]"):
-        await configure_transaction_settings()
+    # Write .env once at the end instead of after every step
+    with Config.batch_updates(), PaperConfig.batch_updates():
+        # Configure RPC
+        with console.status("[bold green]Configuring RPC...[/]"):
+            rpc_url = await configure_rpc()
+        
+        # Initialize Solana client
+        with console.status("[bold green]Initializing Solana client...[/]"):
+            solana_client = initialize_clients(rpc_url)
+        
+        # Configure wallet
+        with console.status("[bold green]Configuring wallet...[/]"):
+            payer_keypair = await configure_wallet()
+            if not payer_keypair:
+                return None, None, None, None
+        
+        # Initialize Raydium after we have solana_client and payer_keypair
+        with console.status("[bold green]Initializing Raydium V4 integration...[/]"):
+            initialize_raydium_module(solana_client, payer_keypair)
+        
+        # Configure Telegram
+        with console.status("[bold green]Configuring Telegram...[/]"):
+            telegram_client, chat_list = await configure_telegram()
+            if not telegram_client or not chat_list:
+                return None, None, None, None
+        
+        # Configure trading parameters
+        with console.status("[bold green]Configuring trading parameters...[/]"):
+            await configure_trading()
+        
+        # Configure paper trading
+        with console.status("[bold green]Configuring paper trading...[/]"):
+            await configure_paper_trading()
+        
+        # Configure exit strategy
+        with console.status("[bold green]Configuring exit strategy...[/]"):
+            await configure_exit_strategy()
+        
+        # Configure priority fees
+        with console.status("[bold green]Configuring priority fees...[/]"):
+            await configure_priority_fees()
+        
+        # Configure transaction settings
+        with console.status("[bold green]Configuring transaction settings...[/]"):
+            await configure_transaction_settings()
     
     # Show final configuration
     print_header("SETUP COMPLETE", "=")
@@ -1130,6 +1316,31 @@ async def wait_for_tokens_and_start_tracking_async(token_address, price_per_toke
     return await enhanced_wait_async(token_address, price_per_token, max_attempts, wait_time)
 
 # Function to handle trading mode toggle
+# Trading mode choice -> (Config updates, PaperConfig updates, confirmation)
+# Manual mode leaves PAPER_ENABLED alone so the paper portfolio stays visible
+_TRADING_MODES = {
+    "1": (  # Real Trading Only
+        (('AUTO_TRADE', True),),
+        (('PAPER_ENABLED', False),),
+        "[bold green]✓[/] Real Trading Mode activated. Paper trading disabled.",
+    ),
+    "2": (  # Paper Trading Only
+        (('AUTO_TRADE', False),),
+        (('PAPER_ENABLED', True), ('PAPER_AUTO_TRADE', True)),
+        "[bold magenta]✓[/] Paper Trading Mode activated. Real trading disabled.",
+    ),
+    "3": (  # Both Real & Paper
+        (('AUTO_TRADE', True),),
+        (('PAPER_ENABLED', True), ('PAPER_AUTO_TRADE', True)),
+        "[bold cyan]✓[/] Parallel Trading Mode activated. Both real and paper trading enabled.",
+    ),
+    "4": (  # Manual Only
+        (('AUTO_TRADE', False),),
+        (('PAPER_AUTO_TRADE', False),),
+        "[bold yellow]✓[/] Manual Trading Mode activated. All auto-trading disabled.",
+    ),
+}
+
 async def toggle_trading_mode():
     """Toggle between real, paper, or both trading modes"""
     print_header("TRADING MODE SELECTION")
@@ -1141,7 +1352,7 @@ async def toggle_trading_mode():
         title="[bold blue]Current Trading Modes[/]", 
         border_style="blue"
     )
-    console.print(current_panel)
+    console.write(current_panel)
     
     # Create a menu for mode selection
     mode_panel = Panel.fit(
@@ -1152,374 +1363,336 @@ async def toggle_trading_mode():
         title="[bold blue]SELECT TRADING MODE[/]", 
         border_style="blue"
     )
-    console.print(mode_panel)
+    console.write(mode_panel)
+    console.flush()
     
-    mode_choice = Prompt.ask("Select trading mode", choices=["1", "2", "3", "4"], default="1")
+    mode_choice = Prompt.ask("Select trading mode", choices=list(_TRADING_MODES), default="1")
     
-    if mode_choice == "1":  # Real Trading Only
-        Config.update_param('AUTO_TRADE', True)
-        PaperConfig.update_param('PAPER_ENABLED', False)
-        console.print("[bold green]✓[/] Real Trading Mode activated. Paper trading disabled.")
+    config_updates, paper_updates, message = _TRADING_MODES[mode_choice]
+    
+    # Save both configs once when the mode change is done
+    with Config.batch_updates(), PaperConfig.batch_updates():
+        for param, value in config_updates:
+            Config.update_param(param, value)
+        for param, value in paper_updates:
+            PaperConfig.update_param(param, value)
+    console.print(message)
+
+# Main menu, built once; only the mode line under it changes between renders
+_MENU_PANEL = Panel.fit(
+    Text.from_markup(
+        "[bold cyan]GENERAL SETTINGS[/]\n"
+        "1. [cyan]View Current Settings[/]\n"
+        "2. [cyan]Change Buy Amount[/]\n"
+        "3. [cyan]Change Profit Target[/]\n"
+        "4. [cyan]Change Stop Loss[/]\n"
+        "5. [cyan]Change Trailing Stop[/]\n"
+        "6. [cyan]Change Exit Strategy[/]\n"
+        "7. [cyan]Change Priority Fee Settings[/]\n"
+        "8. [cyan]Configure All Parameters[/]\n"
+        "9. [cyan]Configure Paper Trading[/]\n"
+        "10. [cyan]Toggle Trading Mode[/]\n"
+        "11. [cyan]Measure RPC Speed[/]\n\n"
+        
+        "[bold green]REAL TRADING[/]\n"
+        "12. [green]Show Active Tracking[/]\n"
+        "13. [green]Manual Buy Token[/]\n"
+        "14. [yellow]Manual Sell Token[/]\n\n"
+        
+        "[bold magenta]PAPER TRADING[/]\n"
+        "15. [magenta]Show Paper Portfolio[/]\n"
+        "16. [magenta]Manual Paper Buy[/]\n"
+        "17. [magenta]Manual Paper Sell[/]\n"
+        "18. [magenta]Reset Paper Portfolio[/]\n\n"
+        
+        "[bold blue]TELEGRAM[/]\n"
+        "19. [blue]Manage Telegram Chats[/]\n\n"
+        
+        "[bold purple]DATABASE[/]\n"
+        "20. [purple]View Trade History[/]\n"
+        "21. [purple]View Trading Statistics[/]\n\n"
         
-    elif mode_choice == "2":  # Paper Trading Only
-        Config.update_param('AUTO_TRADE', False)
-        PaperConfig.update_param('PAPER_ENABLED', True)
-        PaperConfig.update_param('PAPER_AUTO_TRADE', True)
-        console.print("[bold magenta]✓[/] Paper Trading Mode activated. Real trading disabled.")
+        "0. [red]Exit Bot[/]"
+    ),
+    title=Text.from_markup("[bold blue]BOT CONTROL MENU[/]"),
+    border_style="blue"
+)
+_MENU_CHOICES = [str(i) for i in range(22)]
+
+# Mode line under the menu, keyed by (AUTO_TRADE, PAPER_AUTO_TRADE)
+_MENU_MODE_TEXT = {
+    (True, True): Text.from_markup("Current Mode: [bold green]Real + Paper Trading Active[/]"),
+    (True, False): Text.from_markup("Current Mode: [bold green]Real Trading Active[/] | Paper Trading Disabled"),
+    (False, True): Text.from_markup("Current Mode: Real Trading Disabled | [bold magenta]Paper Trading Active[/]"),
+    (False, False): Text("Current Mode: Auto-Trading Disabled (Manual Only)"),
+}
+
+# Menu actions too long to sit inline in the dispatch table
+async def _menu_rpc_speed_test():
+    """Time the primary RPC and optionally the backup, offering to swap"""
+    console.print("[bold]Measuring RPC Speed...[/]")
+    with console.status("[cyan]Testing RPC response time...[/]"):
+        # Single raw timing, so it compares like with like against the backup below
+        delay_ms = await time_rpc_bounded(Config.RPC)
+    
+    # Display results with colored indicators
+    results_panel = Panel.fit(
+        f"[bold cyan]RPC URL:[/] {Config.RPC}\n"
+        + _rpc_result_lines(delay_ms),
+        title=f"[bold blue]RPC SPEED TEST RESULTS[/]", 
+        border_style="blue"
+    )
+    console.print(results_panel)
+    
+    # Offer to test backup RPC too
+    if Confirm.ask("Would you like to test the backup RPC as well?", default=True):
+        # Time the backup by URL so the shared Config is only touched if the user swaps
+        backup_rpc = Config.BACKUP_RPC
+        with console.status("[cyan]Testing backup RPC response time...[/]"):
+            backup_delay_ms = await time_rpc_bounded(backup_rpc)
         
-    elif mode_choice == "3":  # Both Real & Paper
-        Config.update_param('AUTO_TRADE', True)
-        PaperConfig.update_param('PAPER_ENABLED', True)
-        PaperConfig.update_param('PAPER_AUTO_TRADE', True)
-        console.print("[bold cyan]✓[/] Parallel Trading Mode activated. Both real and paper trading enabled.")
+        # Display backup results
+        backup_results_panel = Panel.fit(
+            f"[bold cyan]Backup RPC URL:[/] {backup_rpc}\n"
+            + _rpc_result_lines(backup_delay_ms),
+            title=f"[bold blue]BACKUP RPC SPEED TEST RESULTS[/]", 
+            border_style="blue"
+        )
+        console.print(backup_results_panel)
         
-    elif mode_choice == "4":  # Manual Only
-        Config.update_param('AUTO_TRADE', False)
-        PaperConfig.update_param('PAPER_AUTO_TRADE', False)
-        console.print("[bold yellow]✓[/] Manual Trading Mode activated. All auto-trading disabled.")
+        # Offer to swap if the backup answered and the primary did not, or the backup is faster
+        if backup_delay_ms is None:
+            swap_prompt = None
+        elif delay_ms is None:
+            swap_prompt = "Primary RPC is unreachable but the backup answered. Would you like to make it your primary RPC?"
+        elif delay_ms - backup_delay_ms > 50:  # At least 50ms improvement
+            swap_prompt = f"Backup RPC is {delay_ms - backup_delay_ms:.2f} ms faster. Would you like to make it your primary RPC?"
+        else:
+            swap_prompt = None
+        if swap_prompt:
+            if Confirm.ask(swap_prompt, default=True):
+                # Swap RPCs permanently, saving once
+                primary_rpc = Config.RPC
+                with Config.batch_updates():
+                    Config.update_param('RPC', backup_rpc)
+                    Config.update_param('BACKUP_RPC', primary_rpc)
+                console.print("[bold green]✓[/] RPCs swapped successfully!")
+
+async def _menu_manual_buy():
+    """Manual real buy from the menu"""
+    token_addr = Prompt.ask("Enter token address to buy")
+    if token_addr.strip():
+        amount = float(Prompt.ask(f"Enter amount in SOL", default=str(Config.BUY_AMOUNT)))
+        with console.status("[bold green]Processing buy transaction...[/]"):
+            # Use the async version directly
+            success = await buy_token_async(token_addr, amount)
+            if success:
+                console.print("[bold green]Buy transaction submitted successfully![/bold green]")
+            else:
+                console.print("[bold red]Buy transaction failed. Check logs for details.[/bold red]")
+
+async def _menu_manual_sell():
+    """Manual real sell from the menu"""
+    token_addr = Prompt.ask("Enter token address to sell")
+    if token_addr.strip():
+        percentage = int(Prompt.ask("Enter percentage to sell (1-100)", default="100"))
+        with console.status("[bold yellow]Processing sell transaction...[/]"):
+            # Use the async version directly
+            success = await sell_token_async(token_addr, percentage)
+            if success:
+                console.print("[bold green]Sell transaction completed successfully![/bold green]")
+            else:
+                console.print("[bold red]Sell transaction failed. Check logs for details.[/bold red]")
+
+def _menu_paper_portfolio():
+    """Show the paper portfolio if paper trading is on"""
+    if not PaperConfig.PAPER_ENABLED:
+        console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
+        return
+    show_paper_portfolio()
+
+async def _menu_paper_buy():
+    """Manual paper buy from the menu"""
+    if not PaperConfig.PAPER_ENABLED:
+        console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
+        return
+    token_addr = Prompt.ask("Enter token address to paper buy")
+    if token_addr.strip():
+        amount = float(Prompt.ask(f"Enter amount in SOL", default=str(PaperConfig.PAPER_BUY_AMOUNT)))
+        with console.status("[bold magenta]Processing paper buy transaction...[/]"):
+            # Use the async version directly
+            success = await paper_buy_token_async(token_addr, amount)
+            if success:
+                console.print("[bold green]Paper buy transaction completed successfully![/bold green]")
+            else:
+                console.print("[bold red]Paper buy transaction failed. Check logs for details.[/bold red]")
+
+async def _menu_paper_sell():
+    """Manual paper sell from the menu"""
+    if not PaperConfig.PAPER_ENABLED:
+        console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
+        return
+    # Show paper portfolio first
+    show_paper_portfolio()
     
-    ## Save updated settings
-    Config.save_to_env()
-    PaperConfig.save_to_env()
+    token_addr = Prompt.ask("Enter token address to paper sell")
+    if token_addr.strip():
+        if token_addr not in PaperConfig.paper_portfolio["tokens"]:
+            console.print(f"[bold red]Token {token_addr} not found in paper portfolio![/bold red]")
+        else:
+            percentage = int(Prompt.ask("Enter percentage to sell (1-100)", default="100"))
+            with console.status("[bold magenta]Processing paper sell transaction...[/]"):
+                # Use the async version directly
+                success = await paper_sell_token_async(token_addr, percentage)
+                if success:
+                    console.print("[bold green]Paper sell transaction completed successfully![/bold green]")
+                else:
+                    console.print("[bold red]Paper sell transaction failed. Check logs for details.[/bold red]")
+
+def _menu_reset_paper_portfolio():
+    """Reset the paper portfolio to a fresh SOL balance"""
+    if not PaperConfig.PAPER_ENABLED:
+        console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
+        return
+    reset_confirm = Confirm.ask(
+        "[bold yellow]⚠ This will reset your paper trading portfolio and all tokens.[/] Continue?",
+        default=False
+    )
+    
+    if reset_confirm:
+        # Ask for new starting balance
+        new_balance = float(Prompt.ask(
+            "Enter new starting SOL balance",
+            default=str(PaperConfig.PAPER_SOL_BALANCE)
+        ))
+        
+        # Reset the portfolio
+        PaperConfig.paper_portfolio = {
+            "sol_balance": new_balance,
+            "tokens": {},
+            "transaction_history": []
+        }
+        
+        # Clear any tracking data
+        PaperConfig.paper_price_tracking = {}
+        PaperConfig.paper_processed_addresses = set()
+        PaperConfig.paper_auto_sell_locks = {}
+        
+        # Update the SOL balance parameter too
+        PaperConfig.update_param('PAPER_SOL_BALANCE', new_balance)
+        
+        console.print(f"[bold green]✓[/] Paper portfolio reset with {new_balance} SOL balance")
+
+async def _menu_trade_history():
+    """Show the last 10 trades from the database"""
+    console.print("[bold]Recent Trade History[/]")
+    
+    # Get last 10 trades from database
+    trades = await asyncio.to_thread(get_db().get_recent_trades, 10)
+    
+    if trades:
+        history_table = Table(show_header=True, header_style="bold blue")
+        history_table.add_column("Token", style="cyan")
+        history_table.add_column("Buy Time", style="cyan")
+        history_table.add_column("Sell Time", style="cyan")
+        history_table.add_column("ROI", style="cyan")
+        history_table.add_column("Exit Reason", style="cyan")
+        
+        for trade in trades:
+            token, buy_time, sell_time, roi, reason = trade
+            roi_color = "green" if roi and roi > 0 else "red"
+            roi_str = f"[{roi_color}]{roi:.2f}%[/]" if roi else "Open"
+            
+            # Timestamps are stored as unix milliseconds
+            history_table.add_row(
+                token[:16] + "...",
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(buy_time / 1000)) if buy_time else "",
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sell_time / 1000)) if sell_time else "Open",
+                roi_str,
+                reason or "Still holding"
+            )
+        
+        console.print(history_table)
+    else:
+        console.print("[yellow]No trade history yet.[/]")
+
+async def _menu_trade_statistics():
+    """Show aggregate trade statistics from the database"""
+    stats = await asyncio.to_thread(get_db().get_trade_statistics)
+    
+    if stats['closed_trades'] > 0:
+        stats_panel = Panel.fit(
+            f"[bold cyan]Total Trades:[/] {stats['total_trades']}\n"
+            f"[bold cyan]Closed Trades:[/] {stats['closed_trades']}\n"
+            f"[bold cyan]Winning Trades:[/] {stats['winning_trades']}\n"
+            f"[bold cyan]Losing Trades:[/] {stats['losing_trades']}\n"
+            f"[bold cyan]Win Rate:[/] {stats['win_rate']:.1f}%\n"
+            f"[bold cyan]Total P/L:[/] {stats['total_profit_loss']:.6f} SOL\n"
+            f"[bold cyan]Average ROI:[/] {stats['avg_roi']:.2f}%\n"
+            f"[bold cyan]Best Trade:[/] {stats['best_trade_roi']:.2f}%\n"
+            f"[bold cyan]Worst Trade:[/] {stats['worst_trade_roi']:.2f}%\n"
+            f"[bold cyan]Avg Hold Time:[/] {stats['avg_hold_time_hours']:.1f} hours\n",
+            title="[bold green]TRADING STATISTICS[/]",
+            border_style="green"
+        )
+        console.print(stats_panel)
+    else:
+        console.print("[yellow]No completed trades yet. Statistics will appear after your first closed trade.[/]")
+
+# Menu choice -> handler; coroutine handlers are awaited, plain ones called
+_MENU_DISPATCH = {
+    "1": display_current_settings,
+    "2": change_buy_amount,
+    "3": change_profit_target,
+    "4": change_stop_loss,
+    "5": change_trailing_stop,
+    "6": change_exit_strategy,
+    "7": change_priority_fee_settings,
+    "8": configure_all_parameters,
+    "9": configure_paper_trading,
+    "10": toggle_trading_mode,
+    "11": _menu_rpc_speed_test,
+    # Real trading
+    "12": show_active_tracking,
+    "13": _menu_manual_buy,
+    "14": _menu_manual_sell,
+    # Paper trading
+    "15": _menu_paper_portfolio,
+    "16": _menu_paper_buy,
+    "17": _menu_paper_sell,
+    "18": _menu_reset_paper_portfolio,
+    # Telegram
+    "19": manage_telegram_chats,
+    # Database
+    "20": _menu_trade_history,
+    "21": _menu_trade_statistics,
+}
+_MENU_ASYNC = frozenset(k for k, handler in _MENU_DISPATCH.items() if inspect.iscoroutinefunction(handler))
 
 # Interactive menu for bot control
 async def interactive_menu():
     """Interactive menu for bot control with beautiful UI"""
     while not stop_event.is_set():
         try:
-            # Create a menu panel with new options
-            menu_panel = Panel.fit(
-                "[bold cyan]GENERAL SETTINGS[/]\n"
-                "1. [cyan]View Current Settings[/]\n"
-                "2. [cyan]Change Buy Amount[/]\n"
-                "3. [cyan]Change Profit Target[/]\n"
-                "4. [cyan]Change Stop Loss[/]\n"
-                "5. [cyan]Change Trailing Stop[/]\n"
-                "6. [cyan]Change Exit Strategy[/]\n"
-                "7. [cyan]Change Priority Fee Settings[/]\n"
-                "8. [cyan]Configure All Parameters[/]\n"
-                "9. [cyan]Configure Paper Trading[/]\n"
-                "10. [cyan]Toggle Trading Mode[/]\n"
-                "11. [cyan]Measure RPC Speed[/]\n\n"
-                
-                "[bold green]REAL TRADING[/]\n"
-                "12. [green]Show Active Tracking[/]\n"
-                "13. [green]Manual Buy Token[/]\n"
-                "14. [yellow]Manual Sell Token[/]\n\n"
-                
-                "[bold magenta]PAPER TRADING[/]\n"
-                "15. [magenta]Show Paper Portfolio[/]\n"
-                "16. [magenta]Manual Paper Buy[/]\n"
-                "17. [magenta]Manual Paper Sell[/]\n"
-                "18. [magenta]Reset Paper Portfolio[/]\n\n"
-                
-                "[bold blue]TELEGRAM[/]\n"
-                "19. [blue]Manage Telegram Chats[/]\n\n"
-                
-                "[bold purple]DATABASE[/]\n"
-                "20. [purple]View Trade History[/]\n"
-                "21. [purple]View Trading Statistics[/]\n\n"
-                
-                "0. [red]Exit Bot[/]",
-                title="[bold blue]BOT CONTROL MENU[/]", 
-                border_style="blue"
-            )
-            console.print(menu_panel)
+            console.write(_MENU_PANEL)
             
             # Add paper trading indicator in the menu title if enabled
             if PaperConfig.PAPER_ENABLED:
-                if Config.AUTO_TRADE and PaperConfig.PAPER_AUTO_TRADE:
-                    mode_text = "[bold green]Real + Paper Trading Active[/]"
-                elif Config.AUTO_TRADE:
-                    mode_text = "[bold green]Real Trading Active[/] | Paper Trading Disabled"
-                elif PaperConfig.PAPER_AUTO_TRADE:
-                    mode_text = "Real Trading Disabled | [bold magenta]Paper Trading Active[/]"
-                else:
-                    mode_text = "Auto-Trading Disabled (Manual Only)"
-                console.print(f"Current Mode: {mode_text}")
+                console.write(_MENU_MODE_TEXT[bool(Config.AUTO_TRADE), bool(PaperConfig.PAPER_AUTO_TRADE)])
+            console.flush()
             
-            choice = Prompt.ask("\nEnter your choice", 
-                               choices=["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10",
-                                        "11", "12", "13", "14", "15", "16", "17", "18", "19", "20", "21"], 
-                               default="1")
+            choice = Prompt.ask("\nEnter your choice", choices=_MENU_CHOICES, default="1")
             
             if choice == "0":
                 console.print("[bold red]Shutting down bot...[/bold red]")
-                stop_event.set()
+                request_stop()
                 break
-            elif choice == "1":
-                display_current_settings()
-            elif choice == "2":
-                change_buy_amount()
-            elif choice == "3":
-                change_profit_target()
-            elif choice == "4":
-                change_stop_loss()
-            elif choice == "5":
-                change_trailing_stop()
-            elif choice == "6":
-                change_exit_strategy()
-            elif choice == "7":
-                change_priority_fee_settings()
-            elif choice == "8":
-                configure_all_parameters()
-            elif choice == "9":
-                await configure_paper_trading()
-            elif choice == "10":
-                # Trading mode toggle
-                await toggle_trading_mode()
-            elif choice == "11":
-                # Measure RPC speed
-                console.print("[bold]Measuring RPC Speed...[/]")
-                with console.status("[cyan]Testing RPC response time...[/]"):
-                    delay_ms = measure_rpc_delay_sync()
-                
-                # Display results with colored indicators
-                if delay_ms < 100:
-                    speed_color = "green"
-                    assessment = "Excellent"
-                elif delay_ms < 200:
-                    speed_color = "green"
-                    assessment = "Good"
-                elif delay_ms < 500:
-                    speed_color = "yellow"
-                    assessment = "Average"
-                else:
-                    speed_color = "red"
-                    assessment = "Slow"
-                
-                results_panel = Panel.fit(
-                    f"[bold cyan]RPC URL:[/] {Config.RPC}\n"
-                    f"[bold cyan]Response Time:[/] [bold {speed_color}]{delay_ms:.2f} ms[/]\n"
-                    f"[bold cyan]Performance Assessment:[/] [bold {speed_color}]{assessment}[/]\n",
-                    title=f"[bold blue]RPC SPEED TEST RESULTS[/]", 
-                    border_style="blue"
-                )
-                console.print(results_panel)
-                
-                # Offer to test backup RPC too
-                if Confirm.ask("Would you like to test the backup RPC as well?", default=True):
-                    # Temporarily swap RPC URLs
-                    temp = Config.RPC
-                    Config.RPC = Config.BACKUP_RPC
-                    Config.BACKUP_RPC = temp
-                    
-                    with console.status("[cyan]Testing backup RPC response time...[/]"):
-                        backup_delay_ms = measure_rpc_delay_sync()
-                    
-                    # Display backup results
-                    if backup_delay_ms < 100:
-                        backup_speed_color = "green"
-                        backup_assessment = "Excellent"
-                    elif backup_delay_ms < 200:
-                        backup_speed_color = "green"
-                        backup_assessment = "Good"
-                    elif backup_delay_ms < 500:
-                        backup_speed_color = "yellow"
-                        backup_assessment = "Average"
-                    else:
-                        backup_speed_color = "red"
-                        backup_assessment = "Slow"
-                    
-                    backup_results_panel = Panel.fit(
-                        f"[bold cyan]Backup RPC URL:[/] {Config.RPC}\n"
-                        f"[bold cyan]Response Time:[/] [bold {backup_speed_color}]{backup_delay_ms:.2f} ms[/]\n"
-                        f"[bold cyan]Performance Assessment:[/] [bold {backup_speed_color}]{backup_assessment}[/]\n",
-                        title=f"[bold blue]BACKUP RPC SPEED TEST RESULTS[/]", 
-                        border_style="blue"
-                    )
-                    console.print(backup_results_panel)
-                    
-                    # Swap back
-                    temp = Config.RPC
-                    Config.RPC = Config.BACKUP_RPC
-                    Config.BACKUP_RPC = temp
-                    
-                    # Offer to swap if backup is faster
-                    if backup_delay_ms < delay_ms and (delay_ms - backup_delay_ms) > 50:  # At least 50ms improvement
-                        if Confirm.ask(f"Backup RPC is {delay_ms - backup_delay_ms:.2f} ms faster. Would you like to make it your primary RPC?", default=True):
-                            # Swap RPCs permanently
-                            temp = Config.RPC
-                            Config.RPC = Config.BACKUP_RPC
-                            Config.BACKUP_RPC = temp
-                            Config.save_to_env()
-                            console.print("[bold green]✓[/] RPCs swapped successfully!")
-            
-            # REAL TRADING OPTIONS
-            elif choice == "12":
-                show_active_tracking()
-            elif choice == "13":
-                token_addr = Prompt.ask("Enter token address to buy")
-                if token_addr.strip():
-                    amount = float(Prompt.ask(f"Enter amount in SOL", default=str(Config.BUY_AMOUNT)))
-                    with console.status("[bold green]Processing buy transaction...[/]"):
-                        # Use the async version directly
-                        success = await buy_token_async(token_addr, amount)
-                        if success:
-                            console.print("[bold green]Buy transaction submitted successfully![/bold green]")
-                        else:
-                            console.print("[bold red]Buy transaction failed. Check logs for details.[/bold red]")
-            elif choice == "14":
-                token_addr = Prompt.ask("Enter token address to sell")
-                if token_addr.strip():
-                    percentage = int(Prompt.ask("Enter percentage to sell (1-100)", default="100"))
-                    with console.status("[bold yellow]Processing sell transaction...[/]"):
-                        # Use the async version directly
-                        success = await sell_token_async(token_addr, percentage)
-                        if success:
-                            console.print("[bold green]Sell transaction completed successfully![/bold green]")
-                        else:
-                            console.print("[bold red]Sell transaction failed. Check logs for details.[/bold red]")
-            
-            # PAPER TRADING OPTIONS
-            elif choice == "15":
-                # Show paper portfolio
-                if not PaperConfig.PAPER_ENABLED:
-                    console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
-                else:
-                    show_paper_portfolio()
-            elif choice == "16":
-                # Manual paper buy
-                if not PaperConfig.PAPER_ENABLED:
-                    console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
-                else:
-                    token_addr = Prompt.ask("Enter token address to paper buy")
-                    if token_addr.strip():
-                        amount = float(Prompt.ask(f"Enter amount in SOL", default=str(PaperConfig.PAPER_BUY_AMOUNT)))
-                        with console.status("[bold magenta]Processing paper buy transaction...[/]"):
-                            # Use the async version directly
-                            success = await paper_buy_token_async(token_addr, amount)
-                            if success:
-                                console.print("[bold green]Paper buy transaction completed successfully![/bold green]")
-                            else:
-                                console.print("[bold red]Paper buy transaction failed. Check logs for details.[/bold red]")
-            elif choice == "17":
-                # Manual paper sell
-                if not PaperConfig.PAPER_ENABLED:
-                    console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
-                else:
-                    # Show paper portfolio first
-                    show_paper_portfolio()
-                    
-                    token_addr = Prompt.ask("Enter token address to paper sell")
-                    if token_addr.strip():
-                        if token_addr not in PaperConfig.paper_portfolio["tokens"]:
-                            console.print(f"[bold red]Token {token_addr} not found in paper portfolio![/bold red]")
-                        else:
-                            percentage = int(Prompt.ask("Enter percentage to sell (1-100)", default="100"))
-                            with console.status("[bold magenta]Processing paper sell transaction...[/]"):
-                                # Use the async version directly
-                                success = await paper_sell_token_async(token_addr, percentage)
-                                if success:
-                                    console.print("[bold green]Paper sell transaction completed successfully![/bold green]")
-                                else:
-                                    console.print("[bold red]Paper sell transaction failed. Check logs for details.[/bold red]")
-            elif choice == "18":
-                # Reset paper portfolio
-                if not PaperConfig.PAPER_ENABLED:
-                    console.print("[bold red]Paper trading is disabled. Enable it in settings first.[/bold red]")
-                else:
-                    reset_confirm = Confirm.ask(
-                        "[bold yellow]⚠ This will reset your paper trading portfolio and all tokens.[/] Continue?",
-                        default=False
-                    )
-                    
-                    if reset_confirm:
-                        # Ask for new starting balance
-                        new_balance = float(Prompt.ask(
-                            "Enter new starting SOL balance",
-                            default=str(PaperConfig.PAPER_SOL_BALANCE)
-                        ))
-                        
-                        # Reset the portfolio
-                        PaperConfig.paper_portfolio = {
-                            "sol_balance": new_balance,
-                            "tokens": {},
-                            "transaction_history": []
-                        }
-                        
-                        # Clear any tracking data
-                        PaperConfig.paper_price_tracking = {}
-                        PaperConfig.paper_processed_addresses = set()
-                        PaperConfig.paper_auto_sell_locks = {}
-                        
-                        # Update the SOL balance parameter too
-                        PaperConfig.update_param('PAPER_SOL_BALANCE', new_balance)
-                        
-                        console.print(f"[bold green]✓[/] Paper portfolio reset with {new_balance} SOL balance")
             
-            # TELEGRAM OPTIONS
-            elif choice == "19":
-                # Manage Telegram chats
-                await manage_telegram_chats()
-                
-            # DATABASE OPTIONS
-            elif choice == "20":
-                # View trade history
-                console.print("[bold]Recent Trade History[/]")
-                
-                # Get last 10 trades from database
-                with db.lock:
-                    conn = db.get_connection()
-                    try:
-                        cursor = conn.execute('''
-                            SELECT token_address, buy_time, sell_time, roi_percent, exit_reason
-                            FROM trades
-                            ORDER BY buy_time DESC
-                            LIMIT 10
-                        ''')
-                        
-                        trades = cursor.fetchall()
-                        
-                        if trades:
-                            history_table = Table(show_header=True, header_style="bold blue")
-                            history_table.add_column("Token", style="cyan")
-                            history_table.add_column("Buy Time", style="cyan")
-                            history_table.add_column("Sell Time", style="cyan")
-                            history_table.add_column("ROI", style="cyan")
-                            history_table.add_column("Exit Reason", style="cyan")
-                            
-                            for trade in trades:
-                                token, buy_time, sell_time, roi, reason = trade
-                                roi_color = "green" if roi and roi > 0 else "red"
-                                roi_str = f"[{roi_color}]{roi:.2f}%[/]" if roi else "Open"
-                                
-                                history_table.add_row(
-                                    token[:16] + "...",
-                                    buy_time[:19] if buy_time else "",
-                                    sell_time[:19] if sell_time else "Open",
-                                    roi_str,
-                                    reason or "Still holding"
-                                )
-                            
-                            console.print(history_table)
-                        else:
-                            console.print("[yellow]No trade history yet.[/]")
-                    finally:
-                        conn.close()
-                        
-            elif choice == "21":
-                # View trading statistics
-                stats = db.get_trade_statistics()
-                
-                if stats['closed_trades'] > 0:
-                    stats_panel = Panel.fit(
-                        f"[bold cyan]Total Trades:[/] {stats['total_trades']}\n"
-                        f"[bold cyan]Closed Trades:[/] {stats['closed_trades']}\n"
-                        f"[bold cyan]Winning Trades:[/] {stats['winning_trades']}\n"
-                        f"[bold cyan]Losing Trades:[/] {stats['losing_trades']}\n"
-                        f"[bold cyan]Win Rate:[/] {stats['win_rate']:.1f}%\n"
-                        f"[bold cyan]Total P/L:[/] {stats['total_profit_loss']:.6f} SOL\n"
-                        f"[bold cyan]Average ROI:[/] {stats['avg_roi']:.2f}%\n"
-                        f"[bold cyan]Best Trade:[/] {stats['best_trade_roi']:.2f}%\n"
-                        f"[bold cyan]Worst Trade:[/] {stats['worst_trade_roi']:.2f}%\n"
-                        f"[bold cyan]Avg Hold Time:[/] {stats['avg_hold_time_hours']:.1f} hours\n",
-                        title="[bold green]TRADING STATISTICS[/]",
-                        border_style="green"
-                    )
-                    console.print(stats_panel)
-                else:
-                    console.print("[yellow]No completed trades yet. Statistics will appear after your first closed trade.[/]")
+            handler = _MENU_DISPATCH[choice]
+            if choice in _MENU_ASYNC:
+                await handler()
+            else:
+                handler()
             
             # Small delay to prevent high CPU usage
             await asyncio.sleep(0.1)
@@ -1553,8 +1726,11 @@ async def main():
     # Initialize paper trading module
     initialize_paper_trading()
     
+    # Skip addresses already handled by the previous run
+    Config.load_state()
+    
     # Initialize last message time
-    Config.last_telegram_message_time = datetime.now()
+    Config.last_telegram_message_time = time.monotonic()
     
     # Check if .env is properly configured (has RPC and API credentials)
     has_config = all([
@@ -1614,7 +1790,7 @@ async def main():
     
     # Start health monitoring
     console.print("[bold]Starting health monitoring...[/]")
-    heartbeat_task = asyncio.create_task(heartbeat_monitor())
+    heartbeat_monitor(telegram_client)
     
     # Show status with trading mode indicators
     trading_mode_text = ""
@@ -1670,7 +1846,7 @@ async def main():
         while not stop_event.is_set():
             await asyncio.sleep(1)
             
-        # Cancel menu and heartbeat tasks when stop_event is set
+        # Cancel menu task when stop_event is set
         if not menu_task.done():
             menu_task.cancel()
             try:
@@ -1678,23 +1854,27 @@ async def main():
             except asyncio.CancelledError:
                 pass
                 
-        if not heartbeat_task.done():
-            heartbeat_task.cancel()
-            try:
-                await heartbeat_task
-            except asyncio.CancelledError:
-                pass
-                
     except KeyboardInterrupt:
         console.print("[bold yellow]Bot stopped by user.[/bold yellow]")
-        stop_event.set()
+        request_stop()
     finally:
         # Clean up
+        await stop_heartbeat()
+        
         if telegram_client and telegram_client.is_connected():
             console.print("[bold]Disconnecting from Telegram...[/bold]")
             with console.status("[cyan]Closing connection...[/]"):
                 await telegram_client.disconnect()
         
+        if _http_session is not None and not _http_session.closed:
+            await _http_session.close()
+        
+        # Persist processed addresses for the next run
+        try:
+            Config.snapshot_state()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save bot state: {e}")
+        
         # Final status report
         console.print("[bold]Final status report:[/bold]")
         show_active_tracking()
@@ -1709,5 +1889,9 @@ async def main():
         ))
 
 if __name__ == "__main__":
-    # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    # Run the main function, on uvloop when it is installed and enabled
+    if uvloop is not None and Config.USE_UVLOOP:
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -23,8 +23,9 @@ from rich.text import Text
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.prompt import Prompt, Confirm
 
-from config import Config, logger, stop_event
-from solanaa import get_token_balance, get_token_balance_async, get_sol_balance, solana_client
+from config import BatchedEnvSave, Config, logger, stop_flag
+from fastjson import dumps
+from solanaa import get_token_balance, get_token_balance_async, get_sol_balance, solana_client, rpc_session
 from jupiter import get_quote, get_quote_async, execute_swap_async
 from trading import check_token_price, check_sell_conditions, start_price_tracking
 
@@ -32,7 +33,7 @@ from trading import check_token_price, check_sell_conditions, start_price_tracki
 console = Console()
 
 # ================ PAPER TRADING CONFIGURATION ================
-class PaperConfig:
+class PaperConfig(BatchedEnvSave):
     """Configuration class for paper trading settings"""
     # Default paper trading values (will be overridden by .env if available)
     PAPER_ENABLED = True
@@ -117,8 +118,8 @@ class PaperConfig:
         logger.info(f"Paper trading initialized with {cls.PAPER_SOL_BALANCE} SOL balance")
     
     @classmethod
-    def save_to_env(cls):
-        """Save paper trading settings to .env file"""
+    def _write_env(cls):
+        """Write the paper trading settings to .env now"""
         # Read existing .env file
         env_lines = []
         if os.path.exists('.env'):
@@ -223,7 +224,7 @@ class PaperConfig:
             if param_name == 'PAPER_SOL_BALANCE':
                 cls.paper_portfolio["sol_balance"] = value
             
-            # Save changes to .env
+            # Save changes to .env (deferred inside batch_updates)
             cls.save_to_env()
             return True
         else:
@@ -266,59 +267,64 @@ async def measure_rpc_delay():
         logger.error(f"Error measuring RPC delay: {e}")
         return PaperConfig.avg_measured_delay  # Return current average on error
 
+# getHealth request body, serialized once
+_HEALTH_BODY = dumps({"jsonrpc": "2.0", "id": 1, "method": "getHealth", "params": []})
+
+def time_rpc_health(url):
+    """
+    Time one getHealth call to url in milliseconds (blocking; run it in a thread from async code)
+    Returns None if the call fails, times out or gets a non-200 response
+    """
+    try:
+        start_time = time.perf_counter()
+        response = rpc_session.post(url, data=_HEALTH_BODY, timeout=5)
+        end_time = time.perf_counter()
+    except Exception as e:
+        logger.warning(f"RPC health check to {url} failed: {e}")
+        return None
+    
+    if response.status_code != 200:
+        logger.warning(f"RPC {url} answered getHealth with HTTP {response.status_code}")
+        return None
+    
+    # Calculate delay in milliseconds
+    return (end_time - start_time) * 1000
+
+def measure_rpc_health_delay():
+    """Time the primary RPC and fold the result into the simulated delay average (blocking)"""
+    delay_ms = time_rpc_health(Config.RPC)
+    if delay_ms is None:
+        return PaperConfig.avg_measured_delay
+    
+    # Store the measurement
+    PaperConfig.rpc_delay_measurements.append(delay_ms)
+    # Keep only the last 10 measurements
+    if len(PaperConfig.rpc_delay_measurements) > 10:
+        PaperConfig.rpc_delay_measurements = PaperConfig.rpc_delay_measurements[-10:]
+        
+    # Calculate the average
+    PaperConfig.avg_measured_delay = sum(PaperConfig.rpc_delay_measurements) / len(PaperConfig.rpc_delay_measurements)
+    PaperConfig.last_delay_measurement = time.time()
+    
+    logger.info(f"RPC delay measured: {delay_ms:.2f}ms (avg: {PaperConfig.avg_measured_delay:.2f}ms)")
+    return PaperConfig.avg_measured_delay
+
 # Fixed measure_rpc_delay_sync function to avoid nested event loops
 def measure_rpc_delay_sync():
     """Synchronous wrapper for RPC delay measurement that won't error when run in an event loop"""
     # Check if we're already in an event loop
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # We're already in an event loop, run a synchronous version directly
-            try:
-                # Use direct HTTP call instead of asyncio
-                import requests
-                import time
-                
-                headers = {"Content-Type": "application/json"}
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getHealth",
-                    "params": []
-                }
-                
-                start_time = time.time()
-                response = requests.post(Config.RPC, headers=headers, json=payload, timeout=5)
-                end_time = time.time()
-                
-                # Calculate delay in milliseconds
-                delay_ms = (end_time - start_time) * 1000
-                
-                # Store the measurement
-                PaperConfig.rpc_delay_measurements.append(delay_ms)
-                # Keep only the last 10 measurements
-                if len(PaperConfig.rpc_delay_measurements) > 10:
-                    PaperConfig.rpc_delay_measurements = PaperConfig.rpc_delay_measurements[-10:]
-                    
-                # Calculate the average
-                PaperConfig.avg_measured_delay = sum(PaperConfig.rpc_delay_measurements) / len(PaperConfig.rpc_delay_measurements)
-                PaperConfig.last_delay_measurement = time.time()
-                
-                logger.info(f"RPC delay measured: {delay_ms:.2f}ms (avg: {PaperConfig.avg_measured_delay:.2f}ms)")
-                return PaperConfig.avg_measured_delay
-            except Exception as e:
-                logger.error(f"Error directly measuring RPC delay: {e}")
-                return PaperConfig.avg_measured_delay
-        else:
-            # No running event loop, we can create one
-            return loop.run_until_complete(measure_rpc_delay())
+        asyncio.get_running_loop()
+        in_event_loop = True
     except RuntimeError:
-        # If we can't get the event loop, create a new one
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(measure_rpc_delay())
-        finally:
-            loop.close()
+        in_event_loop = False
+    
+    if in_event_loop:
+        # We're already in an event loop, use a direct HTTP call instead of asyncio
+        return measure_rpc_health_delay()
+    
+    # No running event loop, we can run one
+    return asyncio.run(measure_rpc_delay())
 
 
 # Function to show paper portfolio
@@ -827,7 +833,7 @@ async def track_paper_token_price(token_address, duration_seconds):
     last_display_time = 0
     price_check_failures = 0
     
-    while datetime.now().timestamp() < end_time and not stop_event.is_set():
+    while datetime.now().timestamp() < end_time and not stop_flag.v:
         try:
             current_time = time.time()
             
@@ -960,7 +966,7 @@ async def track_paper_token_price(token_address, duration_seconds):
                 if current_time - last_display_time >= Config.PRICE_DISPLAY_INTERVAL:
                     # Format time since purchase
                     time_since_purchase = datetime.now() - tracking_data['buy_time']
-                    hours, remainder = divmod(time_since_purchase.seconds, 3600)
+                    hours, remainder = divmod(int(time_since_purchase.total_seconds()), 3600)
                     minutes, seconds = divmod(remainder, 60)
                     time_str = f"{hours}h {minutes}m {seconds}s"
                     
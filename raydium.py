@@ -8,10 +8,8 @@ Raydium V4 integration module for Solana Trading Bot
 import base64
 import struct
 import time
-import json
 import requests
 import asyncio
-import aiohttp
 from typing import Dict, Optional, Tuple, List, Any
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
@@ -24,12 +22,18 @@ from solders.compute_budget import set_compute_unit_price, set_compute_unit_limi
 from solana.rpc.types import TxOpts
 from spl.token.constants import TOKEN_PROGRAM_ID, ASSOCIATED_TOKEN_PROGRAM_ID
 import concurrent.futures
+import functools
+
+from fastjson import loads as _json_loads
 
 from config import Config, logger
-from solanaa import payer_keypair, solana_client, confirm_transaction_async
+from solanaa import payer_keypair, confirm_transaction_async
+from eventloop import get_async_session, get_rpc_client, run_sync
 
-# Thread pool for concurrent operations
-_thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+# Small pool for transaction signing, the only blocking work left here; created on first use
+@functools.cache
+def _signing_pool() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="raydium-sign")
 
 # ================ RAYDIUM CONSTANTS ================
 RAYDIUM_AMM_PROGRAM = Pubkey.from_string("675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8")
@@ -55,14 +59,14 @@ async def get_raydium_pools():
         return pool_cache
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(RAYDIUM_API_V3, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    pool_cache = {pool['baseMint']: pool for pool in data['official']}
-                    pool_cache.update({pool['quoteMint']: pool for pool in data['official']})
-                    pool_cache_timestamp = time.time()
-                    return pool_cache
+        session = await get_async_session()
+        async with session.get(RAYDIUM_API_V3, timeout=10) as response:
+            if response.status == 200:
+                data = await response.json(loads=_json_loads)
+                pool_cache = {pool['baseMint']: pool for pool in data['official']}
+                pool_cache.update({pool['quoteMint']: pool for pool in data['official']})
+                pool_cache_timestamp = time.time()
+                return pool_cache
     except Exception as e:
         logger.error(f"Error fetching Raydium pools: {e}")
     
@@ -79,13 +83,13 @@ async def find_pool_by_mints(mint_a: str, mint_b: str) -> Optional[Dict]:
     
     # Try API v3 for more pools
     try:
-        async with aiohttp.ClientSession() as session:
-            url = f"{RAYDIUM_POOL_API}?mint1={mint_a}&mint2={mint_b}"
-            async with session.get(url, timeout=5) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get('data') and len(data['data']) > 0:
-                        return data['data'][0]
+        session = await get_async_session()
+        url = f"{RAYDIUM_POOL_API}?mint1={mint_a}&mint2={mint_b}"
+        async with session.get(url, timeout=5) as response:
+            if response.status == 200:
+                data = await response.json(loads=_json_loads)
+                if data.get('data') and len(data['data']) > 0:
+                    return data['data'][0]
     except Exception as e:
         logger.error(f"Error finding pool via API: {e}")
     
@@ -226,11 +230,7 @@ async def get_quote_async(input_mint: str, output_mint: str, amount: int, slippa
 
 def get_quote(input_mint: str, output_mint: str, amount: int, slippage_bps: int = 50) -> Optional[Dict]:
     """Synchronous wrapper for get_quote_async"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(get_quote_async(input_mint, output_mint, amount, slippage_bps))
-    finally:
-        loop.close()
+    return run_sync(get_quote_async(input_mint, output_mint, amount, slippage_bps))
 
 # ================ SWAP INSTRUCTION BUILDERS ================
 def build_swap_instruction(
@@ -369,11 +369,8 @@ async def execute_swap_async(
         )
         
         # Get recent blockhash
-        loop = asyncio.get_event_loop()
-        recent_blockhash = await loop.run_in_executor(
-            _thread_pool,
-            lambda: solana_client.get_latest_blockhash().value.blockhash
-        )
+        rpc_client = get_rpc_client(Config.RPC)
+        recent_blockhash = (await rpc_client.get_latest_blockhash()).value.blockhash
         
         # Build transaction
         message = MessageV0.try_compile(
@@ -383,17 +380,15 @@ async def execute_swap_async(
             recent_blockhash=recent_blockhash,
         )
         
-        tx = VersionedTransaction(message, [payer_keypair])
+        # Ed25519 signing is pure CPU; keep it off the event loop
+        tx = await asyncio.get_running_loop().run_in_executor(_signing_pool(), VersionedTransaction, message, [payer_keypair])
         
         # Send transaction
         logger.info("Sending Raydium swap transaction...")
-        tx_sig = await loop.run_in_executor(
-            _thread_pool,
-            lambda: solana_client.send_raw_transaction(
-                bytes(tx),
-                opts=TxOpts(skip_preflight=False, preflight_commitment=Config.DEFAULT_COMMITMENT)
-            ).value
-        )
+        tx_sig = (await rpc_client.send_raw_transaction(
+            bytes(tx),
+            opts=TxOpts(skip_preflight=False, preflight_commitment=Config.DEFAULT_COMMITMENT)
+        )).value
         
         if not tx_sig:
             logger.error("Failed to send transaction")
@@ -441,13 +436,9 @@ def execute_swap(
     max_retries: Optional[int] = None
 ) -> Tuple[bool, Optional[float]]:
     """Synchronous wrapper for execute_swap_async"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(
-            execute_swap_async(input_mint, output_mint, amount_in, slippage_percent, retry_count, max_retries)
-        )
-    finally:
-        loop.close()
+    return run_sync(
+        execute_swap_async(input_mint, output_mint, amount_in, slippage_percent, retry_count, max_retries)
+    )
 
 # ================ ADDITIONAL FUNCTIONS FOR COMPATIBILITY ================
 async def get_swap_tx_async(quote_response: Dict, retry_count: int = 0) -> Optional[Dict]:
@@ -461,11 +452,7 @@ async def get_swap_tx_async(quote_response: Dict, retry_count: int = 0) -> Optio
 
 def get_swap_tx(quote_response: Dict, retry_count: int = 0) -> Optional[Dict]:
     """Synchronous wrapper for get_swap_tx_async"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(get_swap_tx_async(quote_response, retry_count))
-    finally:
-        loop.close()
+    return run_sync(get_swap_tx_async(quote_response, retry_count))
 
 # ================ POOL INFORMATION ================
 async def get_pool_info(token_address: str) -> Optional[Dict]:
@@ -525,7 +512,7 @@ async def initialize_raydium():
 
 # Run initialization on module import
 try:
-    asyncio.run(initialize_raydium())
+    run_sync(initialize_raydium())
 except:
     # If running in existing event loop
     pass
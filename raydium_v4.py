@@ -25,6 +25,9 @@ from solana.rpc.commitment import Commitment
 import requests
 import logging
 
+from fastjson import loads as _json_loads
+from eventloop import close_loop_resources, get_async_session, run_sync
+
 # Setup logger
 logger = logging.getLogger(__name__)
 
@@ -40,9 +43,11 @@ SYSTEM_PROGRAM_ID = Pubkey.from_string("11111111111111111111111111111111")
 # Default SOL mint
 SOL_MINT = "So11111111111111111111111111111111111111112"
 
+# Seconds between re-sends of an unconfirmed transaction
+REBROADCAST_INTERVAL = 1.5
+
 # Pool cache for faster lookups
 pool_cache = {}
-_session = None
 
 # Raydium API endpoints
 RAYDIUM_API_BASE = "https://api-v3.raydium.io"
@@ -65,15 +70,26 @@ def initialize_raydium(client: Client, keypair: Keypair, app_config: Any, jito_s
     logger.info("Raydium V4 module initialized")
 
 # ================ HELPER FUNCTIONS ================
-async def get_async_session():
-    """Get or create async HTTP session"""
-    global _session
-    if _session is None:
-        _session = aiohttp.ClientSession(
-            headers={"Content-Type": "application/json"},
-            timeout=aiohttp.ClientTimeout(total=10)
-        )
-    return _session
+async def _query_best_pool(session: aiohttp.ClientSession, mint1: str, mint2: str) -> Optional[Dict]:
+    """Return the highest-liquidity V4 CLMM pool listed for mint1/mint2 in that order"""
+    params = {
+        "mint1": mint1,
+        "mint2": mint2,
+        "poolType": "concentrate",  # V4 CLMM pools
+        "poolSortField": "liquidity",
+        "sortType": "desc",
+        "pageSize": 10
+    }
+    
+    async with session.get(f"{RAYDIUM_API_BASE}/pools/info/list", params=params) as response:
+        if response.status == 200:
+            data = await response.json(loads=_json_loads)
+            if data.get("success") and data.get("data"):
+                pools = data["data"]["data"]
+                if pools:
+                    # Get the pool with highest liquidity
+                    return pools[0]
+    return None
 
 async def find_raydium_pool(token_a: str, token_b: str) -> Optional[Dict]:
     """Find Raydium V4 CLMM pool for token pair"""
@@ -86,44 +102,27 @@ async def find_raydium_pool(token_a: str, token_b: str) -> Optional[Dict]:
     try:
         session = await get_async_session()
         
-        # Query pool by mints
-        params = {
-            "mint1": token_a,
-            "mint2": token_b,
-            "poolType": "concentrate",  # V4 CLMM pools
-            "poolSortField": "liquidity",
-            "sortType": "desc",
-            "pageSize": 10
-        }
+        # Query both mint orders at once instead of paying a second round trip for the reverse
+        forward, reverse = await asyncio.gather(
+            _query_best_pool(session, token_a, token_b),
+            _query_best_pool(session, token_b, token_a),
+            return_exceptions=True
+        )
         
-        async with session.get(f"{RAYDIUM_API_BASE}/pools/info/list", params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                if data.get("success") and data.get("data"):
-                    pools = data["data"]["data"]
-                    if pools:
-                        # Get the pool with highest liquidity
-                        best_pool = pools[0]
-                        pool_cache[cache_key] = best_pool
-                        logger.info(f"Found Raydium V4 pool: {best_pool['id']}")
-                        return best_pool
-        
-        # Try reverse order
-        cache_key_reverse = f"{token_b}_{token_a}"
-        params["mint1"] = token_b
-        params["mint2"] = token_a
-        
-        async with session.get(f"{RAYDIUM_API_BASE}/pools/info/list", params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                if data.get("success") and data.get("data"):
-                    pools = data["data"]["data"]
-                    if pools:
-                        best_pool = pools[0]
-                        pool_cache[cache_key] = best_pool
-                        pool_cache[cache_key_reverse] = best_pool
-                        logger.info(f"Found Raydium V4 pool (reversed): {best_pool['id']}")
-                        return best_pool
+        if isinstance(forward, dict):
+            pool_cache[cache_key] = forward
+            logger.info(f"Found Raydium V4 pool: {forward['id']}")
+            return forward
+        
+        if isinstance(reverse, dict):
+            pool_cache[cache_key] = reverse
+            pool_cache[f"{token_b}_{token_a}"] = reverse
+            logger.info(f"Found Raydium V4 pool (reversed): {reverse['id']}")
+            return reverse
+        
+        for error in (forward, reverse):
+            if isinstance(error, Exception):
+                raise error
                         
     except Exception as e:
         logger.error(f"Error finding Raydium pool: {e}")
@@ -138,7 +137,7 @@ async def get_pool_keys(pool_id: str) -> Optional[Dict]:
         async with session.get(f"{RAYDIUM_API_BASE}/pools/key/ids", 
                              params={"ids": pool_id}) as response:
             if response.status == 200:
-                data = await response.json()
+                data = await response.json(loads=_json_loads)
                 if data.get("success") and data.get("data"):
                     return data["data"][0]
     except Exception as e:
@@ -267,6 +266,41 @@ async def get_associated_token_address(mint: Pubkey, owner: Pubkey) -> Pubkey:
     )[0]
 
 # ================ MAIN SWAP FUNCTION ================
+def _sign_and_serialize(message: MessageV0) -> bytes:
+    """Sign a message with the payer keypair and serialize the transaction once for every send"""
+    return bytes(VersionedTransaction(message, [payer_keypair]))
+
+def _send_transaction(raw_tx: bytes, priority_fee: int, use_jito: bool) -> Optional[str]:
+    """Submit a serialized signed transaction via Jito if available, otherwise directly to the RPC"""
+    if use_jito and jito_submit_fn:
+        # Use Jito submission if available
+        return jito_submit_fn(raw_tx, priority_fee)
+    
+    # Direct submission
+    response = solana_client.send_raw_transaction(
+        txn=raw_tx,
+        opts={"skip_preflight": True, "preflight_commitment": "processed"}
+    )
+    return str(response.value) if response.value else None
+
+async def _rebroadcast_until_expiry(raw_tx: bytes, priority_fee: int,
+                                    use_jito: bool, last_valid_block_height: int):
+    """
+    Re-send an already signed transaction every REBROADCAST_INTERVAL seconds until
+    its blockhash expires; the caller cancels this once the transaction confirms.
+    Re-sending identical bytes is safe because the signature deduplicates it
+    """
+    while True:
+        await asyncio.sleep(REBROADCAST_INTERVAL)
+        try:
+            block_height = await asyncio.to_thread(solana_client.get_block_height)
+            if block_height.value > last_valid_block_height:
+                logger.warning("Blockhash expired before confirmation, stopping rebroadcast")
+                return
+            await asyncio.to_thread(_send_transaction, raw_tx, priority_fee, use_jito)
+        except Exception as e:
+            logger.debug(f"Rebroadcast failed: {e}")
+
 async def execute_raydium_swap(
     input_mint: str,
     output_mint: str,
@@ -285,6 +319,9 @@ async def execute_raydium_swap(
         logger.error("Raydium module not initialized. Call initialize_raydium() first.")
         return False, None
     
+    # Fetch the blockhash off the loop while the pool lookup and quote math run
+    blockhash_task = asyncio.create_task(asyncio.to_thread(solana_client.get_latest_blockhash))
+    
     try:
         start_time = time.time()
         
@@ -362,8 +399,8 @@ async def execute_raydium_swap(
             priority_fee
         )
         
-        # Get recent blockhash
-        recent_blockhash_resp = solana_client.get_latest_blockhash()
+        # Get recent blockhash (prefetched above)
+        recent_blockhash_resp = await blockhash_task
         recent_blockhash = recent_blockhash_resp.value.blockhash
         
         # Create message
@@ -374,8 +411,8 @@ async def execute_raydium_swap(
             recent_blockhash=Hash.from_string(str(recent_blockhash))
         )
         
-        # Create and sign transaction
-        transaction = VersionedTransaction(message, [payer_keypair])
+        # Create and sign transaction; Ed25519 signing is pure CPU, so keep it off the loop
+        raw_tx = await asyncio.to_thread(_sign_and_serialize, message)
         
         build_time = time.time() - build_start
         logger.info(f"Transaction build time: {build_time*1000:.2f}ms")
@@ -384,16 +421,7 @@ async def execute_raydium_swap(
         logger.info("Submitting transaction...")
         submit_start = time.time()
         
-        if use_jito and jito_submit_fn:
-            # Use Jito submission if available
-            tx_sig = jito_submit_fn(transaction, priority_fee)
-        else:
-            # Direct submission
-            response = solana_client.send_raw_transaction(
-                txn=bytes(transaction),
-                opts={"skip_preflight": True, "preflight_commitment": "processed"}
-            )
-            tx_sig = str(response.value) if response.value else None
+        tx_sig = _send_transaction(raw_tx, priority_fee, use_jito)
         
         submit_time = time.time() - submit_start
         logger.info(f"Submission time: {submit_time*1000:.2f}ms")
@@ -408,8 +436,14 @@ async def execute_raydium_swap(
         logger.info("Confirming transaction...")
         confirm_start = time.time()
         
-        # Simple confirmation check
-        confirmed = await confirm_transaction_raydium(tx_sig, commitment=confirm_commitment)
+        # Keep re-sending the same signed transaction while we wait, in case a leader drops it
+        rebroadcast = asyncio.create_task(_rebroadcast_until_expiry(
+            raw_tx, priority_fee, use_jito, recent_blockhash_resp.value.last_valid_block_height
+        ))
+        try:
+            confirmed = await confirm_transaction_raydium(tx_sig, commitment=confirm_commitment)
+        finally:
+            rebroadcast.cancel()
         
         confirm_time = time.time() - confirm_start
         total_time = time.time() - start_time
@@ -438,6 +472,10 @@ async def execute_raydium_swap(
     except Exception as e:
         logger.error(f"Raydium swap error: {e}")
         return False, None
+    finally:
+        # Early exits never await the prefetch
+        if not blockhash_task.done():
+            blockhash_task.cancel()
 
 async def confirm_transaction_raydium(tx_sig: str, commitment: str = "confirmed", max_retries: int = 20) -> bool:
     """Confirm transaction with retries"""
@@ -468,7 +506,7 @@ async def get_raydium_price(token_mint: str) -> Optional[float]:
         # Get price in USDC
         async with session.get(f"{RAYDIUM_PRICE_API}?mints={token_mint}") as response:
             if response.status == 200:
-                data = await response.json()
+                data = await response.json(loads=_json_loads)
                 if data.get("success") and data.get("data"):
                     price_data = data["data"].get(token_mint)
                     if price_data:
@@ -536,49 +574,31 @@ def execute_swap(input_mint: str, output_mint: str, amount_in: int,
         sol_mint = SOL_MINT
     
     # Run async function
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(
-            execute_raydium_swap(
-                input_mint, 
-                output_mint, 
-                amount_in, 
-                slippage_percent, 
-                use_jito=True,
-                priority_fee=priority_fee,
-                price_impact_warning=price_impact_warning,
-                price_impact_abort=price_impact_abort
-            )
+    return run_sync(
+        execute_raydium_swap(
+            input_mint, 
+            output_mint, 
+            amount_in, 
+            slippage_percent, 
+            use_jito=True,
+            priority_fee=priority_fee,
+            price_impact_warning=price_impact_warning,
+            price_impact_abort=price_impact_abort
         )
-    finally:
-        loop.close()
+    )
 
 def get_quote(input_mint: str, output_mint: str, amount_in: int, 
               slippage_bps: int = 50, retry_count: int = 0) -> Optional[Dict]:
     """Drop-in replacement for Jupiter get_quote using Raydium"""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(
-            get_quote_raydium(input_mint, output_mint, amount_in)
-        )
-    finally:
-        loop.close()
+    return run_sync(get_quote_raydium(input_mint, output_mint, amount_in))
 
 # Async versions for direct use
 execute_swap_async = execute_raydium_swap
 get_quote_async = get_quote_raydium
 
 # ================ CLEANUP ================
-async def cleanup():
-    """Clean up resources"""
-    global _session
-    if _session:
-        await _session.close()
-        _session = None
-
-# Register cleanup
-import atexit
-atexit.register(lambda: asyncio.run(cleanup()))
+# Closes the running loop's session; the background loop is closed at exit by eventloop
+cleanup = close_loop_resources
 
 # ================ EXAMPLE USAGE ================
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ import aiohttp
 import time
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
@@ -21,6 +22,7 @@ import os
 import concurrent.futures
 import random
 from config import Config, logger
+from fastjson import dumps, loads
 
 # Initialize clients with connection pooling
 solana_client = None  # Will be initialized after getting RPC configuration
@@ -32,6 +34,14 @@ payer_keypair = None
 # Thread pool for parallel operations
 _thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
 
+# Keep-alive session for direct JSON-RPC calls, so repeat calls to the primary
+# and backup RPC reuse their TCP/TLS connections
+rpc_session = requests.Session()
+rpc_session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+_rpc_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+rpc_session.mount("https://", _rpc_adapter)
+rpc_session.mount("http://", _rpc_adapter)
+
 # ================ SOLANA UTILITIES ================
 def initialize_clients(rpc_url=None):
     """Initialize Solana clients with provided RPC URL or from config with connection pooling"""
@@ -146,9 +156,9 @@ async def get_token_balance_async(mint_str):
         async def try_rpc(url, timeout=3):
             try:
                 async with aiohttp.ClientSession() as session:
-                    async with session.post(url, json=payload, headers=headers, timeout=timeout) as response:
+                    async with session.post(url, data=dumps(payload), headers=headers, timeout=timeout) as response:
                         if response.status == 200:
-                            return await response.json()
+                            return await response.json(loads=loads)
                 return None
             except Exception:
                 return None
@@ -237,7 +247,7 @@ async def get_sol_balance_async():
 async def _get_balance_from_client(client):
     """Helper function to get balance from a specific client"""
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         resp = await loop.run_in_executor(
             _thread_pool,
             lambda: client.get_balance(payer_keypair.pubkey())
@@ -261,18 +271,18 @@ def get_sol_balance():
         
         # Try primary RPC first
         try:
-            response = requests.post(Config.RPC, headers=headers, json=payload, timeout=5)
+            response = rpc_session.post(Config.RPC, headers=headers, data=dumps(payload), timeout=5)
             if response.status_code == 200:
-                result = response.json()
+                result = loads(response.content)
                 if "result" in result and "value" in result["result"]:
                     return result["result"]["value"] / 1e9
         except Exception:
             pass
             
         # Try backup RPC as fallback
-        response = requests.post(Config.BACKUP_RPC, headers=headers, json=payload, timeout=5)
+        response = rpc_session.post(Config.BACKUP_RPC, headers=headers, data=dumps(payload), timeout=5)
         if response.status_code == 200:
-            result = response.json()
+            result = loads(response.content)
             if "result" in result and "value" in result["result"]:
                 return result["result"]["value"] / 1e9
                 
@@ -285,7 +295,7 @@ def get_sol_balance():
 async def check_status_async(txn_sig, client, rpc_name="Unknown RPC"):
     """Check transaction status using a specific client (for parallel checking)."""
     try:
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         status_res = await loop.run_in_executor(
             _thread_pool,
             lambda: client.get_signature_statuses([txn_sig])
@@ -342,9 +352,9 @@ async def confirm_transaction_async(txn_sig, max_retries=None, retry_interval=No
         
         # Try primary RPC
         try:
-            response = requests.post(Config.RPC, headers=headers, json=payload, timeout=3)
+            response = rpc_session.post(Config.RPC, headers=headers, data=dumps(payload), timeout=3)
             if response.status_code == 200:
-                result = response.json()
+                result = loads(response.content)
                 if "result" in result and result["result"]:
                     # Success!
                     confirm_time = time.time() - start_time
@@ -359,9 +369,9 @@ async def confirm_transaction_async(txn_sig, max_retries=None, retry_interval=No
             
         # Try backup RPC right away if primary failed
         try:
-            backup_response = requests.post(Config.BACKUP_RPC, headers=headers, json=payload, timeout=3)
+            backup_response = rpc_session.post(Config.BACKUP_RPC, headers=headers, data=dumps(payload), timeout=3)
             if backup_response.status_code == 200:
-                backup_result = backup_response.json()
+                backup_result = loads(backup_response.content)
                 if "result" in backup_result and backup_result["result"]:
                     # Success!
                     confirm_time = time.time() - start_time
@@ -383,9 +393,9 @@ async def confirm_transaction_async(txn_sig, max_retries=None, retry_interval=No
                 "params": [[str(txn_sig)], {"searchTransactionHistory": True}]
             }
             
-            status_response = requests.post(Config.RPC, headers=headers, json=status_payload, timeout=3)
+            status_response = rpc_session.post(Config.RPC, headers=headers, data=dumps(status_payload), timeout=3)
             if status_response.status_code == 200:
-                status_result = status_response.json()
+                status_result = loads(status_response.content)
                 if "result" in status_result and status_result["result"]["value"][0]:
                     status = status_result["result"]["value"][0]
                     if status and status.get("confirmationStatus") in ["confirmed", "finalized"]:
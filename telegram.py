@@ -5,11 +5,12 @@ Enhanced Telegram monitoring module with sentiment analysis and filtering
 import re
 import threading
 import asyncio
+import time
 from datetime import datetime
 from telethon import TelegramClient, events
 from typing import Dict, List, Tuple, Optional
 
-from config import Config, logger, extract_solana_addresses, stop_event
+from config import Config, logger, extract_solana_addresses, stop_flag
 from trading import buy_token
 
 # Global variables
@@ -188,7 +189,7 @@ def is_trusted_source(event) -> bool:
 async def create_message_handler(chat_id: int, chat_name: str, buy_amount: float):
     """Create an enhanced message handler for a specific chat"""
     async def handler_func(event):
-        if stop_event.is_set():
+        if stop_flag.v:
             return
         
         try:
@@ -196,7 +197,7 @@ async def create_message_handler(chat_id: int, chat_name: str, buy_amount: float
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # Update last message time
-            Config.last_telegram_message_time = datetime.now()
+            Config.last_telegram_message_time = time.monotonic()
             
             # Remove emojis from message for Windows compatibility
             safe_message = re.sub(r'[^\x00-\x7F]+', '*', message_text)
@@ -228,15 +229,13 @@ async def create_message_handler(chat_id: int, chat_name: str, buy_amount: float
                     logger.info(f"Processing {len(filtered_addresses)} addresses after filtering")
                     
                     for address in filtered_addresses:
-                        if address in Config.processed_addresses:
+                        if Config.seen(address):
                             logger.info(f"Already processed address: {address}")
                             continue
                         
                         logger.info(f"New token address detected: {address} from {chat_name}")
                         logger.info(f"Message sentiment: {analysis['sentiment']} ({analysis['confidence']:.2f} confidence)")
                         
-                        Config.processed_addresses.add(address)
-                        
                         # Execute buy if auto-trading is enabled and sentiment is positive
                         if Config.AUTO_TRADE:
                             # Adjust buy amount based on confidence
@@ -5,11 +5,10 @@ Enhanced trading module with liquidity checks, multi-level TP, volume monitoring
 import asyncio
 import threading
 import time
-import concurrent.futures
 import websockets
 import json
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Optional, Tuple, List, Any, Union
 import random
 import signal
@@ -20,29 +19,26 @@ from rich.panel import Panel
 from rich.text import Text
 # UPDATED: Import from raydium instead of jupiter
 from raydium import execute_swap, execute_swap_async, get_quote_async
-from config import Config, logger, stop_event
+from config import Config, logger, stop_flag
 from solanaa import get_token_balance_async, get_token_balance, get_sol_balance
-from database import db  # Import our new database module
+from database import get_db  # Import our new database module
 
 # Rich console for beautiful CLI output
 console = Console()
 
-# Thread pool for concurrent operations
-_thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
-
 # WebSocket connection for real-time updates
 websocket_connection = None
 websocket_subscriptions = {}
 
 # Volume tracking data
-volume_history = {}  # {token_address: [(timestamp, volume), ...]}
+volume_history = {}  # {token_address: [(time.monotonic(), volume), ...]}
 
 # ================ LIQUIDITY & SAFETY CHECKS ================
 async def check_token_safety(token_address: str, buy_amount_sol: float) -> Tuple[bool, str, Dict]:
     """Check if token is safe to trade (liquidity, honeypot, etc.)"""
     try:
         # Check if known honeypot
-        if Config.CHECK_HONEYPOT and db.is_known_honeypot(token_address):
+        if Config.CHECK_HONEYPOT and get_db().is_known_honeypot(token_address):
             return False, "Token marked as honeypot/scam", {}
         
         # Get a small quote to check liquidity
@@ -132,7 +128,7 @@ async def buy_token_async(token_address, sol_amount=None, slippage=None, source=
         console.print(f"[bold red]⚠ SAFETY CHECK FAILED:[/] {safety_msg}")
         # Mark as potential honeypot if it's a scam
         if "honeypot" in safety_msg.lower() or "scam" in safety_msg.lower():
-            db.mark_token_as_honeypot(token_address)
+            get_db().mark_token_as_honeypot(token_address)
         return False
     
     console.print(f"[bold green]✓[/] Safety checks passed: {safety_msg}")
@@ -163,7 +159,7 @@ async def buy_token_async(token_address, sol_amount=None, slippage=None, source=
         logger.info(f"Swap transaction confirmed. Waiting for tokens to appear in wallet...")
         
         # Record buy in database
-        db.record_buy(
+        get_db().record_buy(
             token_address=token_address,
             buy_price=price_per_token,
             buy_amount_sol=sol_amount,
@@ -298,11 +294,11 @@ async def track_volume(token_address: str):
         current_volume = await get_token_volume(token_address)
         
         if current_volume is not None:
-            timestamp = datetime.now()
+            timestamp = time.monotonic()
             volume_history[token_address].append((timestamp, current_volume))
             
             # Keep only last hour of data
-            cutoff_time = timestamp - timedelta(hours=1)
+            cutoff_time = timestamp - 3600
             volume_history[token_address] = [
                 (ts, vol) for ts, vol in volume_history[token_address]
                 if ts > cutoff_time
@@ -341,16 +337,16 @@ async def check_volume_conditions(token_address: str) -> Tuple[bool, str]:
         return False, "Insufficient volume data"
     
     # Get volumes for different time windows
-    now = datetime.now()
+    now = time.monotonic()
     
     # Last 1 minute
-    vol_1min = sum(vol for ts, vol in history if (now - ts).seconds <= 60)
+    vol_1min = sum(vol for ts, vol in history if now - ts <= 60)
     
     # Last 5 minutes
-    vol_5min = sum(vol for ts, vol in history if (now - ts).seconds <= 300)
+    vol_5min = sum(vol for ts, vol in history if now - ts <= 300)
     
     # Last 30 minutes
-    vol_30min = sum(vol for ts, vol in history if (now - ts).seconds <= 1800)
+    vol_30min = sum(vol for ts, vol in history if now - ts <= 1800)
     
     # Check for volume spike (potential dump)
     if vol_5min > 0 and vol_1min > vol_5min * 0.4:  # 40% of 5min volume in 1min
@@ -418,7 +414,7 @@ async def websocket_listen_for_token(token_address: str):
     """Listen for WebSocket updates for a specific token"""
     global websocket_connection
     
-    while token_address in Config.price_tracking and not stop_event.is_set():
+    while token_address in Config.price_tracking and not stop_flag.v:
         try:
             if not websocket_connection or websocket_connection.closed:
                 await asyncio.sleep(5)
@@ -507,24 +503,21 @@ async def sell_token_async(token_address, percentage=100, slippage=None):
     slippage = slippage or Config.DEFAULT_SLIPPAGE
     
     # Check if we're already selling this token
-    if token_address in Config.auto_sell_locks and Config.auto_sell_locks[token_address]:
+    if not Config.begin_sell(token_address):
         console.print(f"[bold yellow]⚠[/] Already selling token {token_address}, skipping duplicate sell request")
         return False
     
-    # Acquire lock
-    Config.auto_sell_locks[token_address] = True
-    
     try:
         if percentage < 1 or percentage > 100:
             console.print("[bold red]⚠[/] Percentage must be between 1 and 100")
-            Config.auto_sell_locks[token_address] = False
+            Config.end_sell(token_address)
             return False
         
         # Get token balance
         lamports, token_amount = await get_token_balance_async(token_address)
         if lamports == 0:
             console.print(f"[bold yellow]⚠[/] No balance found for token {token_address}")
-            Config.auto_sell_locks[token_address] = False
+            Config.end_sell(token_address)
             return False
         
         # Calculate amount to sell
@@ -569,7 +562,7 @@ async def sell_token_async(token_address, percentage=100, slippage=None):
             current_price = sol_amount_received / (token_amount * percentage / 100) if token_amount > 0 else 0
             
             # Record sell in database
-            db.record_sell(
+            get_db().record_sell(
                 token_address=token_address,
                 sell_price=current_price,
                 sell_amount_sol=sol_amount_received,
@@ -591,9 +584,6 @@ async def sell_token_async(token_address, percentage=100, slippage=None):
                 buy_amount = Config.BUY_AMOUNT  # The amount we used to buy
                 roi_percent = ((sol_amount_received - buy_amount) / buy_amount) * 100
                 
-                # Update max ROI in database
-                db.update_max_roi(token_address, roi_percent)
-                
                 # Create a nice panel for the results
                 result_panel = Panel.fit(
                     f"[bold cyan]Initial investment:[/] {buy_amount:.6f} SOL\n"
@@ -613,7 +603,7 @@ async def sell_token_async(token_address, percentage=100, slippage=None):
                     # Would send unsubscribe message here
                     del websocket_subscriptions[token_address]
             
-            Config.auto_sell_locks[token_address] = False
+            Config.end_sell(token_address)
             return True
         else:
             console.print(f"[bold red]✗[/] Failed to sell token {token_address} after multiple attempts")
@@ -622,25 +612,25 @@ async def sell_token_async(token_address, percentage=100, slippage=None):
             # 1. Try one more time with higher slippage if it was a regular call
             if slippage < 5.0:
                 console.print(f"[bold yellow]⚠[/] Attempting one more sale with higher slippage (5%)")
-                Config.auto_sell_locks[token_address] = False  # Release lock before recursive call
+                Config.end_sell(token_address)  # Release lock before recursive call
                 return await sell_token_async(token_address, percentage, 5.0)
                 
             # 2. If it's already a high slippage attempt or a stop-loss scenario, 
             # try with a smaller percentage to get some liquidity
             elif percentage > 50 and slippage >= 5.0:
                 console.print(f"[bold yellow]⚠[/] Attempting to sell 50% instead of {percentage}% to improve liquidity")
-                Config.auto_sell_locks[token_address] = False
+                Config.end_sell(token_address)
                 return await sell_token_async(token_address, 50, slippage)
             
             # If all retry strategies failed, alert the user directly in the logs
             console.print(f"[bold red]✗[/] CRITICAL: Failed to sell {token_address} after all retry attempts!")
             console.print(f"[bold yellow]⚠[/] You may need to manually sell this token with higher slippage or in smaller increments")
         
-        Config.auto_sell_locks[token_address] = False
+        Config.end_sell(token_address)
         return False
     except Exception as e:
         logger.error(f"Error selling token: {e}")
-        Config.auto_sell_locks[token_address] = False
+        Config.end_sell(token_address)
         return False
 
 def sell_token(token_address, percentage=100, slippage=None):
@@ -673,7 +663,7 @@ async def wait_for_tokens_and_start_tracking_async(token_address, price_per_toke
                 console.print(f"[bold green]✓[/] Purchase complete! Received {token_amount} tokens")
                 
                 # Save token metadata
-                db.save_token_metadata(token_address, {
+                get_db().save_token_metadata(token_address, {
                     'symbol': 'UNKNOWN',  # Would fetch actual symbol
                     'name': 'Unknown Token',  # Would fetch actual name
                     'decimals': 9,
@@ -714,7 +704,7 @@ async def track_token_price(token_address, duration_seconds):
     if Config.ENABLE_VOLUME_MONITORING:
         asyncio.create_task(track_volume_periodic(token_address))
     
-    while datetime.now().timestamp() < end_time and not stop_event.is_set():
+    while datetime.now().timestamp() < end_time and not stop_flag.v:
         try:
             current_time = time.time()
             
@@ -744,7 +734,7 @@ async def track_token_price(token_address, duration_seconds):
                         tracking_data['price_history'] = tracking_data['price_history'][-100:]
                     
                     # Record price point in database
-                    db.record_price_point(token_address, current_price)
+                    get_db().record_price_point(token_address, current_price)
                     
                     # Calculate percent change from buy price
                     buy_price = tracking_data['buy_price']
@@ -755,7 +745,7 @@ async def track_token_price(token_address, duration_seconds):
                     if current_price > tracking_data['high_price']:
                         tracking_data['high_price'] = current_price
                         # Update max ROI in database
-                        db.update_max_roi(token_address, percent_change)
+                        get_db().update_max_roi(token_address, percent_change)
                     if current_price < tracking_data['low_price'] or tracking_data['low_price'] == 0:
                         tracking_data['low_price'] = current_price
                     
@@ -796,7 +786,7 @@ async def track_token_price(token_address, duration_seconds):
 
 async def track_volume_periodic(token_address: str):
     """Periodically track volume for a token"""
-    while token_address in Config.price_tracking and not stop_event.is_set():
+    while token_address in Config.price_tracking and not stop_flag.v:
         try:
             await track_volume(token_address)
             await asyncio.sleep(30)  # Check every 30 seconds
@@ -808,7 +798,7 @@ async def display_tracking_update(token_address: str, tracking_data: Dict):
     """Display enhanced tracking update with more information"""
     # Format time since purchase
     time_since_purchase = datetime.now() - tracking_data['buy_time']
-    hours, remainder = divmod(time_since_purchase.seconds, 3600)
+    hours, remainder = divmod(int(time_since_purchase.total_seconds()), 3600)
     minutes, seconds = divmod(remainder, 60)
     time_str = f"{hours}h {minutes}m {seconds}s"
     
@@ -895,8 +885,8 @@ def start_price_tracking(token_address, buy_price):
         'sold_percentage': 0  # Track partial sells for multi-TP
     }
     
-    # Initialize sell lock
-    Config.auto_sell_locks[token_address] = False
+    # Clear any stale sell lock
+    Config.end_sell(token_address)
     
     console.print(f"[bold cyan]→[/] Starting price tracking for {token_address}")
     console.print(f"[bold cyan]→[/] Initial price: {buy_price:.10f} SOL per token")
@@ -943,7 +933,7 @@ def check_sell_conditions(token_address, tracking_data):
     if token_address not in Config.price_tracking:
         return False, "Token not tracked", 0
     
-    if token_address in Config.auto_sell_locks and Config.auto_sell_locks[token_address]:
+    if token_address in Config.selling:
         return False, "Already selling", 0
     
     current_price = tracking_data['current_price']
@@ -1008,7 +998,7 @@ def check_sell_conditions(token_address, tracking_data):
 def show_active_tracking():
     """Display current price tracking information with enhanced UI and database stats."""
     # Show database statistics first
-    stats = db.get_trade_statistics()
+    stats = get_db().get_trade_statistics()
     
     if stats['closed_trades'] > 0:
         stats_panel = Panel.fit(